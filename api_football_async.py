@@ -0,0 +1,132 @@
+"""
+Eros Bot - Connecteur API-Football asynchrone (aiohttp)
+Même surface que les connecteurs football-data.org pour pouvoir les utiliser
+l'un à la place de l'autre depuis l'ingestion ou l'API.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import aiohttp
+from dotenv import load_dotenv
+
+from backend.connectors.async_http import AsyncHttpClient
+from backend.connectors.rate_limiter import TokenBucket
+
+load_dotenv()
+
+
+def _season_for(date_str):
+    """Saison API-Football (année de début) d'une date: 2025-03-01 → 2024, 2025-08-15 → 2025"""
+    date = datetime.strptime(date_str[:10], '%Y-%m-%d')
+    return date.year if date.month >= 7 else date.year - 1
+
+
+class AsyncAPIFootballConnector(AsyncHttpClient):
+    """
+    Connecteur asynchrone pour API-Football (RapidAPI)
+    Les compétitions sont identifiées par l'id de ligue API-Football (ex: 39 = Premier League).
+    """
+
+    def __init__(self, rate_limiter=None, max_connections=None, timeout=15):
+        self.api_key = os.getenv("API_FOOTBALL_KEY")
+        self.host = "api-football-v1.p.rapidapi.com"
+        self.base_url = "https://api-football-v1.p.rapidapi.com/v3"
+
+        if not self.api_key:
+            print("⚠️  ATTENTION: Clé API API_FOOTBALL_KEY non trouvée dans .env")
+
+        if rate_limiter is None:
+            # Quota par minute annoncé dans X-RateLimit-Remaining (pas d'en-tête de reset)
+            rate_limiter = TokenBucket(
+                capacity=int(os.getenv("API_FOOTBALL_RATE_LIMIT", "10")),
+                period=60.0,
+                available_header='X-RateLimit-Remaining',
+                reset_header=None
+            )
+        self.rate_limiter = rate_limiter
+
+        super().__init__(
+            headers={
+                'x-rapidapi-key': self.api_key or '',
+                'x-rapidapi-host': self.host
+            },
+            max_connections=max_connections or max(1, rate_limiter.capacity),
+            timeout=timeout,
+            rate_limiters={self.host: rate_limiter}
+        )
+
+    async def _get(self, path, params, error_label):
+        """GET JSON → data['response'], liste vide en cas d'erreur (une annulation se propage)"""
+        try:
+            data = await self.get_json(f"{self.base_url}{path}", params=params)
+            if data.get('errors'):
+                print(f"❌ Erreur API Football ({error_label}): {data['errors']}")
+                return []
+            return data.get('response', [])
+        except asyncio.TimeoutError:
+            print(f"❌ Timeout API Football ({error_label})")
+            return []
+        except aiohttp.ClientConnectionError:
+            print(f"❌ Erreur de connexion API Football ({error_label})")
+            return []
+        except Exception as e:
+            print(f"❌ Erreur API Football ({error_label}): {e}")
+            return []
+
+    async def get_matches_by_date(self, date_str, date_to=None, competitions=None):
+        """
+        Récupère les matchs pour une date (ou une plage date_str → date_to, un appel par jour)
+        competitions: ids de ligue optionnels pour filtrer
+        """
+        days = [date_str]
+        if date_to and date_to != date_str:
+            start = datetime.strptime(date_str, '%Y-%m-%d')
+            end = datetime.strptime(date_to, '%Y-%m-%d')
+            days = [(start + timedelta(days=d)).strftime('%Y-%m-%d') for d in range((end - start).days + 1)]
+
+        results = await asyncio.gather(*(self._get("/fixtures", {'date': day}, f"date {day}") for day in days))
+        fixtures = [fixture for day_fixtures in results for fixture in day_fixtures]
+        if competitions:
+            wanted = {str(c) for c in competitions}
+            fixtures = [f for f in fixtures if str(f.get('league', {}).get('id')) in wanted]
+        return fixtures
+
+    async def get_matches_for_competition(self, competition_code, date_from, date_to):
+        """Récupère les matchs d'une ligue sur une plage de dates"""
+        params = {
+            'league': competition_code,
+            'season': _season_for(date_from),
+            'from': date_from,
+            'to': date_to
+        }
+        return await self._get("/fixtures", params, f"ligue {competition_code}")
+
+    async def get_live_matches(self):
+        """Récupère les matchs en cours"""
+        return await self._get("/fixtures", {'live': 'all'}, "Live")
+
+    async def get_leagues(self):
+        """Récupère la liste des championnats"""
+        return await self._get("/leagues", {'season': datetime.now().year}, "Leagues")
+
+    async def get_competition_standings(self, competition_code, season=None):
+        """Récupère le classement d'une ligue (saison courante par défaut)"""
+        params = {
+            'league': competition_code,
+            'season': season or _season_for(datetime.now().strftime('%Y-%m-%d'))
+        }
+        return await self._get("/standings", params, f"classement {competition_code}")
+
+    async def get_team_matches(self, team_id, date_from=None, date_to=None, status=None):
+        """Récupère les matchs d'une équipe (status au format API-Football, ex: 'FT')"""
+        params = {'team': team_id}
+        if date_from:
+            params['from'] = date_from
+            params['season'] = _season_for(date_from)
+        if date_to:
+            params['to'] = date_to
+        if status:
+            params['status'] = status
+        return await self._get("/fixtures", params, f"équipe {team_id}")
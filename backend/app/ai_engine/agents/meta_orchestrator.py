@@ -1,306 +1,346 @@
 #!/usr/bin/env python3
 """⚖️ Eros Bot - Meta Orchestrator (Auto-Training)"""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import asyncio
+import hashlib
+import json
 import logging
-import math
-import sys
-from pathlib import Path
+import os
+import threading
+import time
+from time import perf_counter_ns
 
-sys.path.insert(0, '/sdcard/Eros_bot_app')
+import numpy as np
+
+from backend.app.ai_engine.base_agent import (
+    BasePredictionAgent, BUILTIN_AGENTS, _round_array, get_agent_class
+)
+from backend.app.ai_engine.team_features import TeamFeatureStore
+from backend.app.services import metrics
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+AGGREGATION = metrics.stage('aggregation')
 
-class BasePredictionAgent:
-    """Classe de base."""
-    
-    def __init__(self, name: str, weight: float = 1.0):
-        self.name = name
-        self._weight = weight
-        self.total_predictions = 0
-        
-    @property
-    def weight(self) -> float:
-        return self._weight
-    
-    @weight.setter
-    def weight(self, value: float):
-        self._weight = max(0.5, min(2.0, value))
-        
-    def predict(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
-        """✅ LIGNE 33 CORRIGÉE : match_data: Dict[str, Any]"""
-        try:
-            result = self._analyze(match_data)
-            self.total_predictions += 1
-            return result
-        except Exception as e:
-            return {'prediction': 'ERROR', 'confidence': 0.0, 'reasoning': f"Erreur: {str(e)}"}
-    
-    def _analyze(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
-        """✅ LIGNE 41 CORRIGÉE : match_data: Dict[str, Any]"""
-        raise NotImplementedError
+# IA qui votent par défaut (ou EROS_AGENTS="statistician,form_detector"), dans l'ordre du vote
+DEFAULT_AGENTS = tuple(BUILTIN_AGENTS)
 
 
-class StatisticianAgent(BasePredictionAgent):
-    """IA #1 - Statisticien"""
+class AgentPlan:
+    """
+    Plan d'exécution pour un ensemble de marchés
+    agents: {nom de l'IA: marchés qu'elle doit produire}, dans l'ordre du vote; seules les
+    IA qui produisent au moins un marché demandé y figurent
+    features: caractéristiques lues par ces IA pour ces marchés (colonnes du lot à construire)
+    """
     
-    def __init__(self, weight: float = 1.2):
-        super().__init__(name="statistician", weight=weight)
-        self.home_advantage = 1.15
-        self.league_avg_goals = 1.4
-        
-    def _analyze(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
-        home = match_data.get('home_team', 'Unknown')
-        away = match_data.get('away_team', 'Unknown')
-        
-        home_hash = sum(ord(c) for c in home.lower())
-        away_hash = sum(ord(c) for c in away.lower())
-        
-        home_xg = self.league_avg_goals * (0.9 + (home_hash % 40) / 100) * self.home_advantage
-        away_xg = self.league_avg_goals * (0.9 + (away_hash % 40) / 100)
-        
-        total_xg = home_xg + away_xg
-        
-        if total_xg > 0:
-            p_home = (home_xg / total_xg) * 0.75
-            p_away = (away_xg / total_xg) * 0.75
-        else:
-            p_home = p_away = 0.25
-        p_draw = 0.25
-        
-        total = p_home + p_away + p_draw
-        probs = {'HOME_WIN': p_home/total, 'DRAW': p_draw/total, 'AWAY_WIN': p_away/total}
-        
-        prediction = max(probs, key=probs.get)
-        confidence = min(0.90, max(0.25, probs[prediction]))
-        
-        exact_home = self._poisson_goals(home_xg)
-        exact_away = self._poisson_goals(away_xg)
-        
-        return {
-            'prediction': prediction,
-            'confidence': round(confidence, 4),
-            'reasoning': f"Stats: {home_xg:.2f} xG vs {away_xg:.2f} xG",
-            'markets': {
-                '1N2': {'prediction': prediction, 'confidence': round(confidence, 4)},
-                'OVER_UNDER_2.5': {'prediction': 'OVER_2.5' if total_xg > 2.5 else 'UNDER_2.5', 'confidence': round(min(0.85, total_xg/3.5), 4)},
-                'BTTS': {'prediction': 'BTTS_YES' if total_xg > 2.0 else 'BTTS_NO', 'confidence': round(min(0.80, total_xg/3.0), 4)},
-                'EXACT_GOALS_HOME': exact_home,
-                'EXACT_GOALS_AWAY': exact_away,
-                'OVER_UNDER_HT': {'prediction': 'OVER_0.5_HT' if total_xg*0.45 > 0.6 else 'UNDER_0.5_HT', 'confidence': 0.55},
-                'HT_FT': {'prediction': f"{prediction.split('_')[0]}_{prediction.split('_')[0]}", 'confidence': round(confidence * 0.8, 4)},
-                'DOUBLE_CHANCE': {'prediction': '1N' if prediction != 'AWAY_WIN' else 'N2', 'confidence': round(min(0.90, confidence + 0.15), 4)}
-            }
-        }
-    
-    def _poisson_goals(self, xg: float) -> Dict[str, Any]:
-        probs = {}
-        for k in range(5):
-            if xg == 0:
-                probs[k] = 1.0 if k == 0 else 0.0
-            else:
-                probs[k] = (xg ** k * math.exp(-xg)) / math.factorial(k)
-        probs['3+'] = 1.0 - sum(probs.values())
-        
-        best = max(probs, key=probs.get)
-        return {
-            'prediction': f'EXACT_{best}_GOALS' if best != '3+' else 'EXACT_3+_GOALS',
-            'confidence': round(min(0.70, max(0.25, probs[best])), 4),
-            'distribution': {k: round(v, 3) for k, v in probs.items()}
-        }
-
-
-class FormDetectorAgent(BasePredictionAgent):
-    """IA #2 - Form Detector"""
+    __slots__ = ('markets', 'agents', 'features')
     
-    def __init__(self, weight: float = 1.0):
-        super().__init__(name="form_detector", weight=weight)
-        
-    def _analyze(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
-        home = match_data.get('home_team', 'Unknown')
-        away = match_data.get('away_team', 'Unknown')
-        
-        home_hash = sum(ord(c) for c in home.lower())
-        away_hash = sum(ord(c) for c in away.lower())
-        
-        home_score = 0.5 + ((home_hash % 30) - 15) / 100
-        away_score = 0.5 + ((away_hash % 30) - 15) / 100
-        
-        diff = home_score - away_score
-        if diff > 0.1:
-            prediction = 'HOME_WIN'
-            confidence = 0.50 + diff * 0.5
-        elif diff < -0.1:
-            prediction = 'AWAY_WIN'
-            confidence = 0.50 + abs(diff) * 0.5
-        else:
-            prediction = 'DRAW'
-            confidence = 0.40
-        
-        conf = round(min(0.85, max(0.30, confidence)), 4)
-        
-        return {
-            'prediction': prediction,
-            'confidence': conf,
-            'reasoning': f"Forme: {home_score:.2f} vs {away_score:.2f}",
-            'markets': {
-                '1N2': {'prediction': prediction, 'confidence': conf},
-                'DOUBLE_CHANCE': {'prediction': '1N' if diff >= 0 else 'N2', 'confidence': round(min(0.90, conf + 0.15), 4)},
-                'OVER_UNDER_2.5': {'prediction': 'OVER_2.5', 'confidence': 0.55},
-                'BTTS': {'prediction': 'BTTS_YES', 'confidence': 0.52}
-            }
-        }
-
-
-class TimeSeriesAgent(BasePredictionAgent):
-    """IA #3 - Time Series"""
+    def __init__(self, markets: Optional[frozenset], agents: Dict[str, Tuple[str, ...]], features: Tuple[str, ...]):
+        self.markets = markets
+        self.agents = agents
+        self.features = features
     
-    def __init__(self, weight: float = 0.9):
-        super().__init__(name="time_series", weight=weight)
-        
-    def _analyze(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
-        home = match_data.get('home_team', 'Unknown')
-        away = match_data.get('away_team', 'Unknown')
-        
-        home_hash = sum(ord(c) for c in home.lower())
-        away_hash = sum(ord(c) for c in away.lower())
-        
-        home_trend = 0.5 + ((home_hash % 40) - 20) / 100
-        away_trend = 0.5 + ((away_hash % 40) - 20) / 100
-        
-        diff = home_trend - away_trend
-        if diff > 0.2:
-            prediction = 'HOME_WIN'
-            confidence = 0.50 + diff * 0.4
-        elif diff < -0.2:
-            prediction = 'AWAY_WIN'
-            confidence = 0.50 + abs(diff) * 0.4
-        else:
-            prediction = 'DRAW'
-            confidence = 0.45
-        
-        conf = round(min(0.85, max(0.35, confidence)), 4)
-        
-        return {
-            'prediction': prediction,
-            'confidence': conf,
-            'reasoning': f"Tendance: {home_trend:.2f} vs {away_trend:.2f}",
-            'markets': {
-                '1N2': {'prediction': prediction, 'confidence': conf},
-                'OVER_UNDER_2.5': {'prediction': 'OVER_2.5', 'confidence': 0.55},
-                'BTTS': {'prediction': 'BTTS_YES', 'confidence': 0.52},
-                'OVER_UNDER_HT': {'prediction': 'OVER_0.5_HT', 'confidence': 0.58}
-            }
-        }
-
-
-class ContextAnalystAgent(BasePredictionAgent):
-    """IA #4 - Context Analyst"""
+    def markets_for(self, agent_name: str) -> Optional[Tuple[str, ...]]:
+        """Marchés à demander à une IA (None = tous les siens, sans filtrage)"""
+        return None if self.markets is None else self.agents[agent_name]
     
-    def __init__(self, weight: float = 0.8):
-        super().__init__(name="context_analyst", weight=weight)
-        
-    def _analyze(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
-        home = match_data.get('home_team', 'Unknown')
-        away = match_data.get('away_team', 'Unknown')
-        league = match_data.get('league', 'Unknown')
-        
-        home_hash = sum(ord(c) for c in home.lower())
-        away_hash = sum(ord(c) for c in away.lower())
-        
-        h2h = 0.5 + ((home_hash - away_hash) % 30 - 15) / 100
-        context_score = (h2h + 0.5 + 0.5) / 3
-        
-        if context_score > 0.55:
-            prediction = 'HOME_WIN'
-            confidence = 0.50 + (context_score - 0.55) * 0.5
-        elif context_score < 0.45:
-            prediction = 'AWAY_WIN'
-            confidence = 0.50 + (0.45 - context_score) * 0.5
-        else:
-            prediction = 'DRAW'
-            confidence = 0.40
-        
-        conf = round(min(0.80, max(0.35, confidence)), 4)
-        
-        return {
-            'prediction': prediction,
-            'confidence': conf,
-            'reasoning': f"Contexte: H2H={h2h*100:.0f}%",
-            'markets': {
-                '1N2': {'prediction': prediction, 'confidence': conf},
-                'H2H_ADVANTAGE': {'prediction': 'HOME' if h2h > 0.5 else 'AWAY', 'confidence': round(max(h2h, 1-h2h), 4)},
-                'CORNERS': {'prediction': 'OVER_9.5' if (home_hash+away_hash)%100 > 50 else 'UNDER_9.5', 'confidence': 0.55},
-                'CARDS': {'prediction': 'OVER_4.5' if any(l in league for l in ['Serie A', 'La Liga']) else 'UNDER_4.5', 'confidence': 0.52}
-            }
-        }
+    def __repr__(self) -> str:
+        return f"AgentPlan(agents={list(self.agents)}, features={list(self.features)})"
 
 
 class MetaOrchestratorAgent(BasePredictionAgent):
-    """IA #5 - Meta Orchestrator avec Auto-Training"""
+    """
+    IA #5 - Meta Orchestrator avec Auto-Training
+    
+    Modes d'exécution des 4 IA (`executor`, ou variable EROS_AGENT_EXECUTOR):
+    - 'inline': l'une après l'autre dans le thread appelant (défaut sans timeout configuré)
+    - 'thread': en parallèle dans un pool de threads partagé (défaut dès qu'un timeout est
+      configuré: `agent_timeout`, `agent_timeouts` ou EROS_AGENT_TIMEOUT)
+    - 'asyncio': en parallèle sur une boucle d'événements; depuis une boucle déjà en cours
+      (FastAPI), appeler predict_async(): predict() y retombe sur le mode 'thread'
+    Chaque IA a son timeout (`agent_timeouts`, défaut `agent_timeout`): en modes 'thread' et
+    'asyncio', une IA trop lente est retirée du vote au lieu de bloquer le match. En mode
+    'inline' il n'y a pas de timeout réel: l'IA lente bloque le match jusqu'à sa réponse,
+    qui est seulement écartée du vote si elle arrive hors délai.
+    Les 4 IA lisent les caractéristiques d'équipe dans le même TeamFeatureStore
+    (`feature_store`, store partagé du processus par défaut).
+    
+    Les IA sont découvertes par nom dans le registre (`agents`, défaut DEFAULT_AGENTS).
+    predict(match, markets=['1N2']) suit le plan de ces marchés (plan()): seules les IA
+    qui les produisent tournent, et chacune ne calcule que ceux-là.
+    """
+    
+    EXECUTOR_MODES = ('inline', 'thread', 'asyncio')
+    # Prédiction complète d'un match (chaque IA a son étape 'agent.<nom>')
+    STAGE = 'orchestrator'
     
     def __init__(self, weight: float = 1.5, risk_threshold: float = 0.60, 
-                 auto_train: bool = True):
-        super().__init__(name="meta_orchestrator", weight=weight)
+                 auto_train: bool = True, executor: Optional[str] = None,
+                 agent_timeout: Optional[float] = None,
+                 agent_timeouts: Optional[Dict[str, float]] = None,
+                 feature_store: Optional[TeamFeatureStore] = None,
+                 agents: Optional[Iterable[str]] = None):
+        super().__init__(name="meta_orchestrator", weight=weight, feature_store=feature_store)
         self.risk_threshold = risk_threshold
         self.auto_train = auto_train
         
-        self._init_agents_with_weights()
+        timeouts_configured = (agent_timeout is not None or bool(agent_timeouts)
+                               or os.getenv("EROS_AGENT_TIMEOUT") is not None)
+        executor = executor or os.getenv("EROS_AGENT_EXECUTOR") or ("thread" if timeouts_configured else "inline")
+        if executor not in self.EXECUTOR_MODES:
+            raise ValueError(f"Mode d'exécution inconnu: {executor} (attendu: {', '.join(self.EXECUTOR_MODES)})")
+        self.executor = executor
+        self.agent_timeout = agent_timeout if agent_timeout is not None else float(os.getenv("EROS_AGENT_TIMEOUT", "2.0"))
+        self.agent_timeouts = dict(agent_timeouts or {})
+        self._pool = None
+        self._loop_warned = False
+        
+        if agents is None:
+            agents = [a.strip() for a in os.getenv("EROS_AGENTS", "").split(',') if a.strip()] or DEFAULT_AGENTS
+        self._init_agents_with_weights(agents)
         
         self.tracker = None
-        if auto_train:
+        self._unsubscribe_weights = None
+        # Poids sauvegardés chargés à la première prédiction: construire l'orchestrateur
+        # ne crée aucun client et ne fait aucun appel réseau
+        self._weights_pending = auto_train
+        self._weights_lock = threading.Lock()
+    
+    def _ensure_weights(self):
+        """Applique les poids du tracker partagé du processus (une fois, au premier besoin)"""
+        if not self._weights_pending:
+            return
+        with self._weights_lock:
+            if not self._weights_pending:
+                return
             try:
-                from backend.app.ai_engine.performance_tracker import PerformanceTracker
-                self.tracker = PerformanceTracker()
-                saved_weights = self.tracker.load_weights()
+                from backend.app.ai_engine.performance_tracker import get_performance_tracker
+                self.tracker = get_performance_tracker()
+                saved_weights = self.tracker.current_weights()
                 self._update_agent_weights(saved_weights)
-                print(f"✅ Poids chargés depuis Supabase: {saved_weights}")
+                logger.info(f"✅ Poids chargés depuis Supabase: {saved_weights}")
+                # Les poids sauvegardés par train_step() s'appliquent sans redémarrage
+                self._unsubscribe_weights = self.tracker.on_weights_saved(self._update_agent_weights)
             except ImportError:
-                print("⚠️ PerformanceTracker non disponible - poids par défaut")
-    
-    def _init_agents_with_weights(self):
-        """Initialise les agents avec leurs poids."""
-        weights = {
-            'statistician': 1.2,
-            'form_detector': 1.0,
-            'time_series': 0.9,
-            'context_analyst': 0.8
+                logger.warning("⚠️ PerformanceTracker non disponible - poids par défaut")
+            finally:
+                self._weights_pending = False
+    
+    def refresh_weights(self) -> bool:
+        """Applique les poids ré-entraînés par un autre processus (cron); True si changés"""
+        self._ensure_weights()
+        return self.tracker.refresh_weights() if self.tracker is not None else False
+    
+    @property
+    def weights_version(self) -> str:
+        """Empreinte des poids en vigueur (clé de version du cache de prédictions)"""
+        self._ensure_weights()
+        return self._weights_version
+    
+    def _init_agents_with_weights(self, agent_names: Iterable[str]):
+        """Instancie les IA du registre avec leur poids par défaut, sur le feature store de l'orchestrateur"""
+        agent_classes = {name: get_agent_class(name) for name in agent_names}
+        weights = {name: agent_class.DEFAULT_WEIGHT for name, agent_class in agent_classes.items()}
+        self.agents = {
+            name: agent_class(weight=weights[name], feature_store=self.feature_store)
+            for name, agent_class in agent_classes.items()
         }
-        self.statistician = StatisticianAgent(weight=weights['statistician'])
-        self.form_detector = FormDetectorAgent(weight=weights['form_detector'])
-        self.time_series = TimeSeriesAgent(weight=weights['time_series'])
-        self.context_analyst = ContextAnalystAgent(weight=weights['context_analyst'])
-        self._current_weights = weights
+        self._agent_names = tuple(self.agents)
+        self._plans = {}
+        self._update_agent_weights(weights)
+    
+    @property
+    def markets(self) -> Tuple[str, ...]:
+        """Marchés que les IA de l'orchestrateur savent produire"""
+        return tuple(dict.fromkeys(m for agent in self.agents.values() for m in agent.MARKETS))
+    
+    def plan(self, markets: Optional[Iterable[str]] = None) -> AgentPlan:
+        """
+        Plan d'exécution (mis en cache) pour les marchés demandés (None ou vide = tous)
+        Lève ValueError pour un marché qu'aucune IA ne produit.
+        """
+        key = frozenset(markets) if markets else None
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._plans[key] = self._build_plan(key)
+        return plan
+    
+    def _build_plan(self, markets: Optional[frozenset]) -> AgentPlan:
+        agents = {}
+        for agent_name, agent in self.agents.items():
+            produced = agent.wanted(markets)
+            if produced:
+                agents[agent_name] = produced
+        if markets is not None:
+            unknown = markets.difference(*agents.values())
+            if unknown:
+                raise ValueError(f"Marchés inconnus: {', '.join(sorted(unknown))} "
+                                 f"(disponibles: {', '.join(self.markets)})")
+        features = tuple(dict.fromkeys(
+            f for agent_name, produced in agents.items() for f in self.agents[agent_name].features_for(
+                None if markets is None else produced)
+        ))
+        return AgentPlan(markets, agents, features)
     
     def _update_agent_weights(self, new_weights: Dict[str, float]):
         """Met à jour les poids des agents."""
         for agent_name, weight in new_weights.items():
-            if hasattr(self, agent_name):
-                agent = getattr(self, agent_name)
+            agent = self.agents.get(agent_name)
+            if agent is not None:
                 agent.weight = weight
         self._current_weights = new_weights
+        self._weights_version = hashlib.md5(
+            json.dumps(new_weights, sort_keys=True).encode('utf-8')).hexdigest()[:12]
     
-    def _analyze(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Agrège les 4 IA avec poids dynamiques."""
-        
-        stat_pred = self.statistician.predict(match_data)
-        form_pred = self.form_detector.predict(match_data)
-        time_pred = self.time_series.predict(match_data)
-        ctx_pred = self.context_analyst.predict(match_data)
-        
-        all_predictions = {
-            'statistician': stat_pred,
-            'form_detector': form_pred,
-            'time_series': time_pred,
-            'context_analyst': ctx_pred
-        }
+    # ---------- Exécution des IA ----------
+    
+    def _timeout_for(self, agent_name: str) -> float:
+        return self.agent_timeouts.get(agent_name, self.agent_timeout)
+    
+    def _get_pool(self) -> ThreadPoolExecutor:
+        # Pool partagé entre les matchs: 4 workers par IA pour absorber les appels concurrents
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=4 * len(self._agent_names),
+                                            thread_name_prefix="eros-agent")
+        return self._pool
+    
+    def close(self):
+        """Libère le pool de threads (modes 'thread' et 'asyncio') et l'abonnement aux poids"""
+        if self._unsubscribe_weights is not None:
+            self._unsubscribe_weights()
+            self._unsubscribe_weights = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+    
+    def _timed_predict(self, agent_name: str, match_data: Dict[str, Any],
+                       markets: Optional[Tuple[str, ...]] = None) -> Tuple[Dict[str, Any], float]:
+        start = time.perf_counter()
+        pred = self.agents[agent_name].predict(match_data, markets)
+        return pred, round((time.perf_counter() - start) * 1000, 2)
+    
+    def _run_inline(self, match_data: Dict[str, Any], plan: AgentPlan) -> Tuple[Dict, Dict, List]:
+        """Une IA après l'autre; une réponse arrivée après son timeout est écartée du vote"""
+        predictions, latencies, dropped = {}, {}, []
+        for agent_name in plan.agents:
+            pred, latencies[agent_name] = self._timed_predict(agent_name, match_data, plan.markets_for(agent_name))
+            if latencies[agent_name] > self._timeout_for(agent_name) * 1000:
+                dropped.append(agent_name)
+            else:
+                predictions[agent_name] = pred
+        return predictions, latencies, dropped
+    
+    def _run_threaded(self, match_data: Dict[str, Any], plan: AgentPlan) -> Tuple[Dict, Dict, List]:
+        """Les IA du plan en parallèle dans le pool; chacune attendue au plus son timeout"""
+        pool = self._get_pool()
+        start = time.perf_counter()
+        futures = {name: pool.submit(self._timed_predict, name, match_data, plan.markets_for(name))
+                   for name in plan.agents}
+        
+        predictions, latencies, dropped = {}, {}, []
+        for agent_name, future in futures.items():
+            # Les timeouts courent tous depuis le lancement, pas les uns après les autres
+            remaining = self._timeout_for(agent_name) - (time.perf_counter() - start)
+            try:
+                predictions[agent_name], latencies[agent_name] = future.result(timeout=max(0.0, remaining))
+            except FutureTimeoutError:
+                future.cancel()
+                dropped.append(agent_name)
+                latencies[agent_name] = round((time.perf_counter() - start) * 1000, 2)
+        return predictions, latencies, dropped
+    
+    async def _run_agent_async(self, agent_name: str, match_data: Dict[str, Any],
+                               markets: Optional[Tuple[str, ...]] = None):
+        agent = self.agents[agent_name]
+        start = time.perf_counter()
+        # Une IA qui fait de l'I/O peut exposer predict_async(); sinon predict() dans le pool.
+        # Pas asyncio.to_thread: asyncio.run() attendrait le thread d'une IA écartée à la fermeture
+        if hasattr(agent, 'predict_async'):
+            call = agent.predict_async(match_data, markets)
+        else:
+            call = asyncio.get_running_loop().run_in_executor(self._get_pool(), agent.predict, match_data, markets)
+        try:
+            pred = await asyncio.wait_for(call, timeout=self._timeout_for(agent_name))
+        except asyncio.TimeoutError:
+            pred = None
+        return agent_name, pred, round((time.perf_counter() - start) * 1000, 2)
+    
+    async def _run_async(self, match_data: Dict[str, Any], plan: AgentPlan) -> Tuple[Dict, Dict, List]:
+        """Les IA du plan en parallèle sur la boucle d'événements"""
+        results = await asyncio.gather(*(
+            self._run_agent_async(agent_name, match_data, plan.markets_for(agent_name)) for agent_name in plan.agents
+        ))
+        predictions, latencies, dropped = {}, {}, []
+        for agent_name, pred, latency_ms in results:
+            latencies[agent_name] = latency_ms
+            if pred is None:
+                dropped.append(agent_name)
+            else:
+                predictions[agent_name] = pred
+        return predictions, latencies, dropped
+    
+    def _run_agents(self, match_data: Dict[str, Any], plan: AgentPlan) -> Tuple[Dict, Dict, List]:
+        if self.executor == 'thread':
+            return self._run_threaded(match_data, plan)
+        if self.executor == 'asyncio':
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self._run_async(match_data, plan))
+            # asyncio.run() est interdit dans une boucle en cours: predict_async() est fait pour ça
+            if not self._loop_warned:
+                self._loop_warned = True
+                print("⚠️ predict() appelé depuis une boucle asyncio: mode 'thread' utilisé, "
+                      "préférer await predict_async()")
+            return self._run_threaded(match_data, plan)
+        return self._run_inline(match_data, plan)
+    
+    def _analyze(self, match_data: Dict[str, Any], markets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Agrège les IA du plan avec poids dynamiques."""
+        self._ensure_weights()
+        return self._aggregate(*self._run_agents(match_data, self.plan(markets)))
+    
+    async def predict_async(self, match_data: Dict[str, Any],
+                            markets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Équivalent asynchrone de predict() pour un appelant déjà dans une boucle
+        (FastAPI, ingestion async): les IA tournent en parallèle quel que soit le mode.
+        """
+        try:
+            self._ensure_weights()
+            result = self._aggregate(*(await self._run_async(match_data, self.plan(markets))))
+            self.total_predictions += 1
+            self.successful_predictions += 1
+            return result
+        except Exception as e:
+            return self._error_response(str(e))
+    
+    # ---------- Vote ----------
+    
+    def _aggregate(self, all_predictions: Dict[str, Dict[str, Any]],
+                   latencies: Dict[str, float], dropped: List[str]) -> Dict[str, Any]:
+        """Vote pondéré par marché sur les IA qui ont répondu à temps"""
+        start = AGGREGATION.start()
+        try:
+            return self._vote(all_predictions, latencies, dropped)
+        except Exception:
+            AGGREGATION.error()
+            raise
+        finally:
+            AGGREGATION.stop(start)
+    
+    def _vote(self, all_predictions: Dict[str, Dict[str, Any]],
+              latencies: Dict[str, float], dropped: List[str]) -> Dict[str, Any]:
+        if dropped:
+            logger.warning(f"⏱️ IA écartées du vote (timeout): {', '.join(dropped)}")
         
         all_markets = {}
         
         for agent_name, pred in all_predictions.items():
-            agent_weight = getattr(self, agent_name).weight
+            agent_weight = self.agents[agent_name].weight
             
             if 'markets' in pred:
                 for market_name, market_data in pred['markets'].items():
@@ -332,21 +372,36 @@ class MetaOrchestratorAgent(BasePredictionAgent):
                 'total_agents': len(market_preds)
             }
         
+        if not best_markets:
+            raise RuntimeError("Aucune IA n'a répondu à temps")
+        
         best_market_name = max(best_markets, key=lambda x: best_markets[x]['confidence'])
+        agent_votes = {
+            agent_name: {
+                market_name: {'prediction': market_data['prediction'], 'confidence': market_data['confidence']}
+                for market_name, market_data in pred.get('markets', {}).items()
+            }
+            for agent_name, pred in all_predictions.items()
+        }
+        return self._build_result(best_markets, best_market_name, list(all_predictions.keys()), dropped,
+                                  latencies, agent_votes)
+    
+    def assess_risk(self, confidence: float) -> Tuple[str, str]:
+        """(niveau de risque, recommandation) du meilleur marché selon sa confiance"""
+        if confidence >= 0.75:
+            return 'low', "✅ FORTE CONFIANCE - MEILLEUR MARCHÉ"
+        if confidence >= self.risk_threshold:
+            return 'medium', "⚠️ OPPORTUNITÉ MODÉRÉE"
+        return 'high', "❌ À ÉVITER - Risque trop élevé"
+    
+    def _build_result(self, best_markets: Dict[str, Dict[str, Any]], best_market_name: str,
+                      agents_used: List[str], dropped: List[str], latencies: Dict[str, float],
+                      agent_votes: Dict[str, Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
         best_market_data = best_markets[best_market_name]
-        
-        if best_market_data['confidence'] >= 0.75:
-            risk_level = 'low'
-            recommendation = "✅ FORTE CONFIANCE - MEILLEUR MARCHÉ"
-        elif best_market_data['confidence'] >= self.risk_threshold:
-            risk_level = 'medium'
-            recommendation = "⚠️ OPPORTUNITÉ MODÉRÉE"
-        else:
-            risk_level = 'high'
-            recommendation = "❌ À ÉVITER - Risque trop élevé"
+        risk_level, recommendation = self.assess_risk(best_market_data['confidence'])
         
         reasoning = f"Meilleur marché: {best_market_name}. {best_market_data['prediction']} ({best_market_data['confidence']*100:.1f}%). "
-        reasoning += f"{len(best_markets)} marchés analysés par 4 IA."
+        reasoning += f"{len(best_markets)} marchés analysés par {len(agents_used)} IA."
         
         return {
             'prediction': best_market_data['prediction'],
@@ -356,28 +411,185 @@ class MetaOrchestratorAgent(BasePredictionAgent):
             'recommendation': recommendation,
             'reasoning': reasoning,
             'all_markets': best_markets,
+            # Vote de chaque IA sur chaque marché (persisté pour le suivi des performances)
+            'agent_votes': agent_votes,
             'agent_weights': {k: round(v, 3) for k, v in self._current_weights.items()},
             'details': {
-                'agents_used': list(all_predictions.keys()),
+                'agents_used': agents_used,
+                'agents_dropped': dropped,
+                'agent_latencies_ms': latencies,
                 'markets_analyzed': len(best_markets),
                 'best_market': best_market_name,
+                'weights_version': self.weights_version,
                 'model': 'Multi-Agent Multi-Market + Auto-Training'
             }
         }
     
+    # ---------- Prédiction par lots ----------
+    
+    @staticmethod
+    def _is_batchable(match_data: Dict[str, Any]) -> bool:
+        # Les lignes incomplètes (équipe ou ligue non textuelle) gardent le chemin unitaire et ses erreurs
+        return all(isinstance(match_data.get(field, 'Unknown'), str)
+                   for field in ('home_team', 'away_team', 'league'))
+    
+    def _build_batch(self, matches: List[Dict[str, Any]], features: Iterable[str] = ('league', 'name_hash')) -> Dict[str, np.ndarray]:
+        """Colonnes du lot, avec les ids d'équipe du feature store (league et hashes seulement si lus)"""
+        home = [m.get('home_team', 'Unknown') for m in matches]
+        away = [m.get('away_team', 'Unknown') for m in matches]
+        home_id = self.feature_store.team_ids(home)
+        away_id = self.feature_store.team_ids(away)
+        batch = {
+            'home_team': np.array(home, dtype=object),
+            'away_team': np.array(away, dtype=object),
+            'home_id': home_id,
+            'away_id': away_id
+        }
+        if 'league' in features:
+            batch['league'] = np.array([m.get('league', 'Unknown') for m in matches], dtype=object)
+        if 'name_hash' in features:
+            batch['home_hash'] = self.feature_store.name_hash[home_id]
+            batch['away_hash'] = self.feature_store.name_hash[away_id]
+        return batch
+    
+    def predict_many(self, matches, markets: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Prédit un lot de matchs (liste de dicts ou DataFrame) avec les versions vectorisées des IA
+        Résultats identiques à predict() match par match (hors latences, amorties sur le lot).
+        Les timeouts par IA ne s'appliquent pas: le lot est calculé dans le thread appelant.
+        markets: marchés à calculer (None = tous), comme pour predict()
+        """
+        plan = self.plan(markets)
+        self._ensure_weights()
+        if hasattr(matches, 'to_dict'):
+            matches = matches.to_dict('records')
+        matches = list(matches)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(matches)
+        
+        batch_rows = []
+        for i, match_data in enumerate(matches):
+            if self._is_batchable(match_data):
+                batch_rows.append(i)
+            else:
+                results[i] = self.predict(match_data, markets)
+        if not batch_rows:
+            return results
+        
+        start = self.stage.start()
+        try:
+            batch_results = self._analyze_many(self._build_batch([matches[i] for i in batch_rows], plan.features), plan)
+        except Exception as e:
+            logger.error(f"❌ Prédiction par lots impossible, repli match par match: {e}")
+            self.stage.error()
+            batch_results = [self.predict(matches[i], markets) for i in batch_rows]
+        else:
+            self.stage.stop(start, len(batch_rows))
+            self.total_predictions += len(batch_rows)
+            self.successful_predictions += len(batch_rows)
+        
+        for i, result in zip(batch_rows, batch_results):
+            results[i] = result
+        return results
+    
+    def _analyze_many(self, batch: Dict[str, np.ndarray], plan: AgentPlan) -> List[Dict[str, Any]]:
+        n = len(batch['home_id'])
+        
+        agent_markets, latencies = {}, {}
+        for agent_name in plan.agents:
+            agent = self.agents[agent_name]
+            start = perf_counter_ns()
+            agent_markets[agent_name] = agent._analyze_batch(batch, plan.markets_for(agent_name))
+            elapsed = perf_counter_ns() - start
+            agent.stage.record(elapsed, n)
+            agent.total_predictions += n
+            agent.successful_predictions += n
+            latencies[agent_name] = round(elapsed / 1e6 / n, 2)
+        
+        start = AGGREGATION.start()
+        # Votes par marché, dans l'ordre des IA (même ordre d'insertion que _aggregate)
+        votes = {}
+        for agent_name, markets in agent_markets.items():
+            agent_weight = self.agents[agent_name].weight
+            for market_name, market_data in markets.items():
+                votes.setdefault(market_name, []).append(
+                    (market_data['prediction'], market_data['confidence'] * agent_weight)
+                )
+        
+        rows = np.arange(n)
+        columns = {}
+        for market_name, market_votes in votes.items():
+            weighted_sum = 0.0
+            for _, weighted in market_votes:
+                weighted_sum = weighted_sum + weighted
+            avg_confidence = weighted_sum / len(market_votes)
+            
+            # Prédiction majoritaire; à égalité, la première rencontrée (comme max() sur un dict)
+            preds = np.stack([pred for pred, _ in market_votes])
+            counts = (preds[:, None, :] == preds[None, :, :]).sum(axis=1)
+            first = counts.argmax(axis=0)
+            columns[market_name] = (
+                preds[first, rows].tolist(),
+                _round_array(np.minimum(0.95, avg_confidence), 4),
+                counts[first, rows].tolist(),
+                len(market_votes)
+            )
+        
+        market_names = list(columns)
+        # Meilleur marché: premier à confiance maximale, dans l'ordre d'insertion
+        best = np.stack([columns[name][1] for name in market_names], axis=1).argmax(axis=1).tolist()
+        confidences = {name: columns[name][1].tolist() for name in market_names}
+        
+        # Votes de chaque IA en listes Python (mêmes valeurs que le chemin unitaire)
+        vote_columns = {
+            agent_name: {
+                market_name: (np.asarray(market_data['prediction']).tolist(),
+                              np.asarray(market_data['confidence']).tolist())
+                for market_name, market_data in markets.items()
+            }
+            for agent_name, markets in agent_markets.items()
+        }
+        
+        agents_used = list(plan.agents)
+        results = []
+        for i in range(n):
+            best_markets = {
+                name: {
+                    'prediction': columns[name][0][i],
+                    'confidence': confidences[name][i],
+                    'agents_agreed': columns[name][2][i],
+                    'total_agents': columns[name][3]
+                }
+                for name in market_names
+            }
+            agent_votes = {
+                agent_name: {
+                    market_name: {'prediction': market_predictions[i], 'confidence': market_confidences[i]}
+                    for market_name, (market_predictions, market_confidences) in markets.items()
+                }
+                for agent_name, markets in vote_columns.items()
+            }
+            results.append(self._build_result(best_markets, market_names[best[i]],
+                                              list(agents_used), [], dict(latencies), agent_votes))
+        AGGREGATION.stop(start, n)
+        return results
+    
     def trigger_auto_training(self) -> Dict[str, Any]:
         """Déclenche manuellement l'auto-training."""
+        self._ensure_weights()
         if self.tracker:
             return self.tracker.train_step()
         return {'error': 'Tracker non disponible'}
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     print("=" * 70)
     print("⚖️ EROS BOT - TEST META ORCHESTRATOR (AUTO-TRAINING)")
     print("=" * 70)
     
     agent = MetaOrchestratorAgent(weight=1.5, auto_train=True)
+    agent._ensure_weights()
     print(f"✅ Meta-Orchestrator initialisé avec auto-training")
     print(f"📊 Poids actuels: {agent._current_weights}")
     print()
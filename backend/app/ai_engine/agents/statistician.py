@@ -1,138 +1,148 @@
 #!/usr/bin/env python3
-"""🧮 Eros Bot - Statistician Agent (IA #1) - VERSION AUTONOME"""
-
-from typing import Dict, Any, Tuple
-import math
-import logging
-
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-
-class BasePredictionAgent:
-    """Classe de base simplifiée pour les agents IA."""
-    
-    def __init__(self, name: str, weight: float = 1.0):
-        self.name = name
-        self.weight = max(0.0, min(1.0, weight))
-        self.total_predictions = 0
-        
-    def predict(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Méthode publique qui appelle _analyze."""
-        try:
-            result = self._analyze(match_data)
-            self.total_predictions += 1
-            return result
-        except Exception as e:
-            return {
-                'prediction': 'ERROR',
-                'confidence': 0.0,
-                'reasoning': f"Erreur: {str(e)}"
-            }
-    
-    def _analyze(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
-        """À implémenter par les classes filles."""
-        raise NotImplementedError
+"""🧮 Eros Bot - Statistician Agent (IA #1)"""
+
+from typing import Dict, Any, Iterable, Optional
+
+import numpy as np
+
+from backend.app.ai_engine.base_agent import (
+    BasePredictionAgent, OUTCOMES_1N2, _round_array, register_agent
+)
+from backend.app.ai_engine.score_matrix import ScoreMatrix, OUTCOMES as SCORE_OUTCOMES
 
 
+@register_agent
 class StatisticianAgent(BasePredictionAgent):
-    """Agent IA basé sur l'analyse statistique."""
-    
-    def __init__(self, weight: float = 1.2):
-        super().__init__(name="statistician", weight=weight)
+    """IA #1 - Statisticien (marchés de buts dérivés de la matrice de scores Poisson)"""
+
+    NAME = 'statistician'
+    MARKETS = ('1N2', 'OVER_UNDER_1.5', 'OVER_UNDER_2.5', 'OVER_UNDER_3.5', 'BTTS',
+               'EXACT_GOALS_HOME', 'EXACT_GOALS_AWAY', 'OVER_UNDER_HT', 'HT_FT',
+               'DOUBLE_CHANCE', 'CORRECT_SCORE')
+    FEATURES = ('attack',)
+    DEFAULT_WEIGHT = 1.2
+
+    OVER_UNDER_LINES = (1.5, 2.5, 3.5)
+    EXACT_GOALS_LABELS = np.array(['EXACT_0_GOALS', 'EXACT_1_GOALS', 'EXACT_2_GOALS', 'EXACT_3+_GOALS'])
+    HT_FT_LABELS = np.array([f"{ht}_{ft}" for ht in SCORE_OUTCOMES for ft in SCORE_OUTCOMES])
+    DOUBLE_CHANCE_LABELS = np.array(['1N', '12', 'N2'])
+
+    def __init__(self, weight: Optional[float] = None, feature_store=None):
+        super().__init__(weight=weight, feature_store=feature_store)
         self.home_advantage = 1.15
         self.league_avg_goals = 1.4
-        
-    def _analyze(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyse statistique du match."""
+
+    def _analyze(self, match_data: Dict[str, Any], markets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         home = match_data.get('home_team', 'Unknown')
         away = match_data.get('away_team', 'Unknown')
-        
-        # Calcul simplifié des forces
-        home_hash = sum(ord(c) for c in home.lower())
-        away_hash = sum(ord(c) for c in away.lower())
-        
-        home_attack = 0.9 + (home_hash % 40) / 100
-        away_attack = 0.9 + (away_hash % 40) / 100
-        home_defense = 0.9 + ((home_hash // 2) % 40) / 100
-        away_defense = 0.9 + ((away_hash // 2) % 40) / 100
-        
-        # Expected Goals
-        home_xg = self.league_avg_goals * home_attack * away_defense * self.home_advantage
-        away_xg = self.league_avg_goals * away_attack * home_defense
-        
-        home_xg = max(0.3, min(3.0, home_xg))
-        away_xg = max(0.3, min(3.0, away_xg))
-        
-        # Probabilités
-        total_xg = home_xg + away_xg
-        if total_xg > 0:
-            base_home = home_xg / total_xg
-            base_away = away_xg / total_xg
-        else:
-            base_home = base_away = 0.33
-        
-        p_draw = 0.25
-        p_home = base_home * (1 - p_draw)
-        p_away = base_away * (1 - p_draw)
-        
-        total = p_home + p_draw + p_away
-        probs = {
-            'HOME_WIN': round(p_home / total, 4),
-            'DRAW': round(p_draw / total, 4),
-            'AWAY_WIN': round(p_away / total, 4)
+
+        home_xg = self.league_avg_goals * self.feature_store.lookup(home).attack * self.home_advantage
+        away_xg = self.league_avg_goals * self.feature_store.lookup(away).attack
+
+        # Même calcul que le lot (matrice de 1 match): résultats identiques à predict_many
+        score_matrix = ScoreMatrix(home_xg, away_xg)
+        priced = {
+            name: {key: values.tolist()[0] for key, values in market.items()}
+            for name, market in self._price(score_matrix, markets).items()
         }
-        
-        prediction = max(probs, key=probs.get)
-        confidence = min(0.95, max(0.20, probs[prediction]))
-        
-        # Ajustement confiance
-        sorted_p = sorted(probs.values(), reverse=True)
-        if len(sorted_p) >= 2 and sorted_p[0] - sorted_p[1] < 0.10:
-            confidence *= 0.85
-        
-        # Raisonnement
-        diff = abs(home_xg - away_xg)
-        if diff < 0.3:
-            balance = "équilibré"
-        elif diff < 0.7:
-            balance = "légèrement favorable"
-        else:
-            balance = "favorable"
-        
-        stronger = home if home_xg > away_xg else away
-        pred_fr = {'HOME_WIN': f'victoire {home}', 'DRAW': 'match nul', 'AWAY_WIN': f'victoire {away}'}.get(prediction, prediction)
-        
-        reasoning = f"xG: {home_xg:.2f} vs {away_xg:.2f} → Match {balance} → {pred_fr} ({confidence*100:.0f}%)"
-        
+        for side, name in (('home', 'EXACT_GOALS_HOME'), ('away', 'EXACT_GOALS_AWAY')):
+            if name in priced:
+                buckets = self._goal_buckets(score_matrix.exact_goals(side))[0].tolist()
+                priced[name]['distribution'] = {k: round(v, 3) for k, v in zip((0, 1, 2, '3+'), buckets)}
+
+        headline = self._headline(priced)
         return {
-            'prediction': prediction,
-            'confidence': round(confidence, 4),
-            'reasoning': reasoning,
-            'details': {
-                'expected_goals': {'home': round(home_xg, 2), 'away': round(away_xg, 2)},
-                'probabilities': probs,
-                'model': 'Simplified Stats'
-            }
+            'prediction': headline['prediction'],
+            'confidence': headline['confidence'],
+            'reasoning': f"Stats: {home_xg:.2f} xG vs {away_xg:.2f} xG",
+            'markets': priced
+        }
+
+    def _analyze_batch(self, batch: Dict[str, np.ndarray],
+                       markets: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        attack = self.feature_store.column('attack')
+        home_xg = self.league_avg_goals * attack[batch['home_id']] * self.home_advantage
+        away_xg = self.league_avg_goals * attack[batch['away_id']]
+        return self._price(ScoreMatrix(home_xg, away_xg), markets)
+
+    @staticmethod
+    def _binary(p_yes: np.ndarray, yes: str, no: str, cap: float) -> Dict[str, np.ndarray]:
+        return {
+            'prediction': np.where(p_yes > 0.5, yes, no),
+            'confidence': _round_array(np.minimum(cap, np.maximum(p_yes, 1 - p_yes)), 4)
         }
 
+    @staticmethod
+    def _goal_buckets(pmf: np.ndarray) -> np.ndarray:
+        """(n, 4): P(0), P(1), P(2), P(3 buts ou plus)"""
+        return np.concatenate([pmf[:, :3], 1.0 - np.cumsum(pmf[:, :3], axis=1)[:, -1:]], axis=1)
+
+    def _price(self, score_matrix: ScoreMatrix,
+               markets: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        """Marchés demandés du statisticien (tous par défaut) à partir de la matrice de scores"""
+        wanted = self.wanted(markets)
+        rows = np.arange(len(score_matrix))
+        priced = {}
+
+        if '1N2' in wanted:
+            outcome_probs = score_matrix.outcome_probs()
+            outcome = outcome_probs.argmax(axis=1)
+            confidence = np.minimum(0.90, np.maximum(0.25, outcome_probs[rows, outcome]))
+            priced['1N2'] = {'prediction': OUTCOMES_1N2[outcome], 'confidence': _round_array(confidence, 4)}
+
+        lines = [line for line in self.OVER_UNDER_LINES if f'OVER_UNDER_{line}' in wanted]
+        if lines:
+            over = score_matrix.over_under(lines)
+            for k, line in enumerate(lines):
+                priced[f'OVER_UNDER_{line}'] = self._binary(over[:, k], f'OVER_{line}', f'UNDER_{line}', cap=0.85)
+        if 'BTTS' in wanted:
+            priced['BTTS'] = self._binary(score_matrix.btts(), 'BTTS_YES', 'BTTS_NO', cap=0.80)
+
+        for side, name in (('home', 'EXACT_GOALS_HOME'), ('away', 'EXACT_GOALS_AWAY')):
+            if name in wanted:
+                buckets = self._goal_buckets(score_matrix.exact_goals(side))
+                best = buckets.argmax(axis=1)
+                priced[name] = {
+                    'prediction': self.EXACT_GOALS_LABELS[best],
+                    'confidence': _round_array(np.minimum(0.70, np.maximum(0.25, buckets[rows, best])), 4)
+                }
+
+        if 'OVER_UNDER_HT' in wanted:
+            half_time_over = score_matrix.half_time().over_under([0.5])[:, 0]
+            priced['OVER_UNDER_HT'] = self._binary(half_time_over, 'OVER_0.5_HT', 'UNDER_0.5_HT', cap=0.85)
+
+        if 'HT_FT' in wanted:
+            ht_ft = score_matrix.ht_ft().reshape(len(score_matrix), -1)
+            best = ht_ft.argmax(axis=1)
+            priced['HT_FT'] = {'prediction': self.HT_FT_LABELS[best],
+                               'confidence': _round_array(np.minimum(0.85, ht_ft[rows, best]), 4)}
+
+        if 'DOUBLE_CHANCE' in wanted:
+            double_chance = score_matrix.double_chance()
+            best = double_chance.argmax(axis=1)
+            priced['DOUBLE_CHANCE'] = {'prediction': self.DOUBLE_CHANCE_LABELS[best],
+                                       'confidence': _round_array(np.minimum(0.90, double_chance[rows, best]), 4)}
+
+        if 'CORRECT_SCORE' in wanted:
+            home_goals, away_goals, p_score = score_matrix.correct_score()
+            priced['CORRECT_SCORE'] = {
+                'prediction': np.array([f"CS_{h}_{a}" for h, a in zip(home_goals.tolist(), away_goals.tolist())]),
+                'confidence': _round_array(p_score, 4)
+            }
+        return priced
+
 
 if __name__ == "__main__":
     print("=" * 60)
-    print("🧮 EROS BOT - TEST STATISTICIEN")
+    print("🧮 EROS BOT - TEST STATISTICIAN")
     print("=" * 60)
-    
-    agent = StatisticianAgent(weight=1.2)
-    print(f"✅ Agent: {agent.name}")
-    
-    test = {
-        'home_team': 'PSG',
-        'away_team': 'Lyon',
-        'league': 'Ligue 1'
-    }
-    
-    result = agent.predict(test)
+
+    agent = StatisticianAgent()
+    result = agent.predict({'home_team': 'PSG', 'away_team': 'Marseille', 'league': 'Ligue 1'})
     print(f"🏆 {result['prediction']} | 🎯 {result['confidence']*100:.1f}%")
     print(f"💭 {result['reasoning']}")
+    for market_name, market in result.get('markets', {}).items():
+        print(f"   • {market_name}: {market['prediction']} ({market['confidence']*100:.1f}%)")
+
     print("✅ SUCCÈS !" if result['prediction'] != 'ERROR' else "❌ ÉCHEC")
     print("=" * 60)
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+📼 Eros Bot - Backtest
+Rejoue des saisons passées (table `matches` ou archive JSON football-data.org) dans le
+Meta-Orchestrator, dans l'ordre chronologique, et note chaque vote des IA comme le ferait
+PerformanceTracker — sans attendre des semaines de prediction_logs.
+
+- Coupure stricte dans le temps: un match est prédit avec un feature store qui ne contient
+  que les matchs terminés avant son coup d'envoi; son résultat n'est intégré qu'ensuite.
+- Une saison d'une ligue = une tâche indépendante (store neuf), réparties sur plusieurs processus.
+- Par (IA, marché): précision, score de Brier et log-loss (probabilité = confiance de la
+  sélection), ROI à mise fixe quand la cote est connue.
+
+Usage:
+    engine = BacktestEngine(processes=4)
+    report = engine.run(load_archive(['archive/PL_2023.json', 'archive/FL1_2023.json']))
+    print_report(report)
+
+    python -m backend.app.ai_engine.backtest --archive archive/ --processes 4 --json backtest.json
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import groupby
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from backend.app.ai_engine.market_outcomes import evaluate_prediction
+from backend.app.ai_engine.team_features import TeamFeatureStore
+from backend.app.services.prediction_writer import CONSENSUS_AGENT
+
+# Une saison européenne commence en juillet (2023 = saison 2023/2024)
+SEASON_START_MONTH = 7
+# Bornes de probabilité pour la log-loss (une confiance de 0 ou 1 donnerait l'infini)
+PROBABILITY_EPSILON = 1e-6
+
+# Cotes 1N2 à plat: football-data.org (homeWin...) ou colonnes de l'archive (home_win...)
+ODDS_KEYS_1N2 = {
+    'HOME_WIN': ('homeWin', 'home_win'),
+    'DRAW': ('draw',),
+    'AWAY_WIN': ('awayWin', 'away_win')
+}
+DOUBLE_CHANCE_OUTCOMES = {'1N': ('HOME_WIN', 'DRAW'), '12': ('HOME_WIN', 'AWAY_WIN'), 'N2': ('DRAW', 'AWAY_WIN')}
+
+
+# ---------- Chargement des matchs ----------
+
+def season_of(match: Dict[str, Any]) -> Optional[int]:
+    """Année de début de saison du match"""
+    season = match.get('season')
+    if isinstance(season, dict):
+        season = (season.get('startDate') or '')[:4]
+    if season not in (None, ''):
+        try:
+            return int(season)
+        except (TypeError, ValueError):
+            pass
+    match_date = match.get('match_date')
+    if not match_date:
+        return None
+    date = datetime.fromisoformat(match_date[:10])
+    return date.year if date.month >= SEASON_START_MONTH else date.year - 1
+
+
+def normalize_fixture(match: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Ligne de backtest (format de la table `matches`) à partir d'une ligne `matches`
+    ou d'un match brut football-data.org; None si le match n'est pas terminé
+    """
+    if 'utcDate' in match:
+        score = match.get('score') or {}
+        full_time = score.get('fullTime') or {}
+        half_time = score.get('halfTime') or {}
+        if match.get('status') not in ('FINISHED', 'PENS'):
+            return None
+        row = {
+            'match_id_api': str(match.get('id')),
+            'home_team': (match.get('homeTeam') or {}).get('name'),
+            'away_team': (match.get('awayTeam') or {}).get('name'),
+            'match_date': match.get('utcDate'),
+            'league': (match.get('competition') or {}).get('name', 'Unknown'),
+            'home_score': full_time.get('home'),
+            'away_score': full_time.get('away'),
+            'ht_home_score': half_time.get('home'),
+            'ht_away_score': half_time.get('away'),
+            'season': match.get('season'),
+            'odds': match.get('odds')
+        }
+    else:
+        if match.get('status', 'finished') != 'finished':
+            return None
+        row = dict(match)
+        # Colonnes mi-temps de FootballDataOrgConnector.extract_match_data
+        row.setdefault('ht_home_score', match.get('home_score_ht'))
+        row.setdefault('ht_away_score', match.get('away_score_ht'))
+    if (row.get('home_score') is None or row.get('away_score') is None or not row.get('match_date')
+            or not isinstance(row.get('home_team'), str) or not isinstance(row.get('away_team'), str)):
+        return None
+    row.setdefault('league', 'Unknown')
+    row['season'] = season_of(row)
+    return row
+
+
+def load_archive(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Matchs terminés d'une archive: fichiers JSON (réponse /competitions/{code}/matches de
+    football-data.org, ou liste de lignes `matches`) ou dossiers de fichiers JSON
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.json'))
+        else:
+            files.append(path)
+
+    fixtures = []
+    for path in files:
+        try:
+            with open(path, encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Archive illisible ({path}): {e}")
+            continue
+        matches = payload.get('matches', []) if isinstance(payload, dict) else payload
+        competition = payload.get('competition') if isinstance(payload, dict) else None
+        for match in matches:
+            if competition and 'utcDate' in match and not match.get('competition'):
+                match = dict(match, competition=competition)
+            row = normalize_fixture(match)
+            if row is not None:
+                fixtures.append(row)
+    return fixtures
+
+
+def load_fixtures_from_storage(client, since: Optional[str] = None, until: Optional[str] = None,
+                               page_size: int = 1000) -> List[Dict[str, Any]]:
+    """Matchs terminés de la table `matches` (Supabase ou stockage local), paginés"""
+    fixtures = []
+    offset = 0
+    while True:
+        query = client.table('matches').select('*').eq('status', 'finished')
+        if since:
+            query = query.gte('match_date', since)
+        if until:
+            query = query.lte('match_date', until)
+        rows = query.order('match_date').range(offset, offset + page_size - 1).execute().data or []
+        fixtures.extend(row for row in map(normalize_fixture, rows) if row is not None)
+        if len(rows) < page_size:
+            break
+        offset += page_size
+    return fixtures
+
+
+def group_fixtures(fixtures: Iterable[Dict[str, Any]]) -> Dict[Tuple[str, int], List[Dict[str, Any]]]:
+    """{(ligue, saison): matchs triés par date}"""
+    groups = {}
+    for row in fixtures:
+        groups.setdefault((row['league'], row['season']), []).append(row)
+    for rows in groups.values():
+        rows.sort(key=lambda r: r['match_date'])
+    return groups
+
+
+# ---------- Notation ----------
+
+def _odds_for(row: Dict[str, Any], market_type: str, predicted: str) -> Optional[float]:
+    """Cote décimale de la sélection si l'archive la fournit"""
+    odds = row.get('odds')
+    if not isinstance(odds, dict):
+        return None
+    if isinstance(odds.get(market_type), dict):
+        value = odds[market_type].get(predicted)
+        return float(value) if value else None
+
+    def price_1n2(outcome):
+        for key in ODDS_KEYS_1N2[outcome]:
+            if odds.get(key):
+                return float(odds[key])
+        return None
+
+    if market_type == '1N2' and predicted in ODDS_KEYS_1N2:
+        return price_1n2(predicted)
+    if market_type == 'DOUBLE_CHANCE' and predicted in DOUBLE_CHANCE_OUTCOMES:
+        prices = [price_1n2(outcome) for outcome in DOUBLE_CHANCE_OUTCOMES[predicted]]
+        if all(prices):
+            # Cote d'un pari couvrant deux issues (sans marge du bookmaker)
+            return 1 / sum(1 / p for p in prices)
+    return None
+
+
+def _grade(stats: Dict[Tuple[str, str], List[float]], agent_name: str, market_type: str,
+           vote: Dict[str, Any], row: Dict[str, Any]):
+    """Ajoute un vote noté aux compteurs [notés, corrects, Brier, log-loss, paris, gain]"""
+    is_correct = evaluate_prediction(market_type, vote.get('prediction'), row)
+    if is_correct is None:
+        return
+    p = min(1 - PROBABILITY_EPSILON, max(PROBABILITY_EPSILON, float(vote.get('confidence') or 0.0)))
+    y = 1.0 if is_correct else 0.0
+    bucket = stats.setdefault((agent_name, market_type), [0, 0, 0.0, 0.0, 0, 0.0])
+    bucket[0] += 1
+    bucket[1] += int(is_correct)
+    bucket[2] += (p - y) ** 2
+    bucket[3] -= math.log(p) if is_correct else math.log(1 - p)
+    odds = _odds_for(row, market_type, vote.get('prediction'))
+    if odds:
+        bucket[4] += 1
+        bucket[5] += odds - 1 if is_correct else -1.0
+
+
+def _run_group(task) -> Tuple[Tuple[str, int], Dict[Tuple[str, str], List[float]], int]:
+    """
+    Rejoue une saison d'une ligue (exécuté dans un processus de travail)
+    Les matchs d'un même coup d'envoi sont prédits ensemble, avant que leurs résultats
+    n'entrent dans le feature store.
+    """
+    from backend.app.ai_engine.agents.meta_orchestrator import MetaOrchestratorAgent
+
+    key, fixtures, weights = task
+    store = TeamFeatureStore()
+    orchestrator = MetaOrchestratorAgent(auto_train=False, executor='inline', feature_store=store)
+    if weights:
+        orchestrator._update_agent_weights(weights)
+
+    stats = {}
+    predicted = 0
+    for _, block in groupby(fixtures, key=lambda r: r['match_date']):
+        block = list(block)
+        for row, result in zip(block, orchestrator.predict_many(block)):
+            if result.get('prediction') == 'ERROR':
+                continue
+            predicted += 1
+            for market_type, vote in result.get('all_markets', {}).items():
+                _grade(stats, CONSENSUS_AGENT, market_type, vote, row)
+            for agent_name, markets in result.get('agent_votes', {}).items():
+                for market_type, vote in markets.items():
+                    _grade(stats, agent_name, market_type, vote, row)
+        store.update_from_matches(block)
+    orchestrator.close()
+    return key, stats, predicted
+
+
+# ---------- Moteur ----------
+
+class BacktestEngine:
+    """
+    Backtest multi-processus des IA sur des matchs historiques
+
+    weights: poids des IA à évaluer (poids par défaut du Meta-Orchestrator sinon)
+    processes: nombre de processus (EROS_BACKTEST_PROCESSES, nombre de CPU par défaut);
+               1 = tout dans le processus courant
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, processes: Optional[int] = None):
+        self.weights = dict(weights) if weights else None
+        if processes is None:
+            processes = int(os.getenv("EROS_BACKTEST_PROCESSES", "0")) or os.cpu_count() or 1
+        self.processes = max(1, processes)
+
+    def run(self, fixtures: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Rejoue les matchs, retourne le rapport (table {(IA, marché): métriques} + résumé)"""
+        start = time.perf_counter()
+        groups = group_fixtures(fixtures)
+        # Plus grosses saisons d'abord: meilleure répartition entre les processus
+        tasks = sorted(((key, rows, self.weights) for key, rows in groups.items()),
+                       key=lambda task: -len(task[1]))
+
+        processes = min(self.processes, len(tasks))
+        if processes <= 1:
+            outputs = [_run_group(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                outputs = list(pool.map(_run_group, tasks))
+
+        totals, predicted, by_group = {}, 0, {}
+        for key, stats, count in outputs:
+            predicted += count
+            by_group[key] = count
+            for stat_key, bucket in stats.items():
+                total = totals.setdefault(stat_key, [0, 0, 0.0, 0.0, 0, 0.0])
+                for i, value in enumerate(bucket):
+                    total[i] += value
+
+        return {
+            'fixtures': sum(len(rows) for rows in groups.values()),
+            'predictions': predicted,
+            'groups': by_group,
+            'processes': max(processes, 1),
+            'elapsed_seconds': round(time.perf_counter() - start, 3),
+            'table': {key: self._metrics(bucket) for key, bucket in sorted(totals.items())}
+        }
+
+    @staticmethod
+    def _metrics(bucket: List[float]) -> Dict[str, Any]:
+        count, correct, brier, log_loss, bets, profit = bucket
+        return {
+            'count': count,
+            'correct': correct,
+            'accuracy': round(correct / count, 4),
+            'brier': round(brier / count, 4),
+            'log_loss': round(log_loss / count, 4),
+            'bets': bets,
+            'roi': round(profit / bets, 4) if bets else None
+        }
+
+
+def report_rows(report: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Table du rapport en lignes (export JSON / DataFrame)"""
+    return [dict(agent=agent, market=market, **metrics) for (agent, market), metrics in report['table'].items()]
+
+
+def print_report(report: Dict[str, Any], min_count: int = 1):
+    print("=" * 86)
+    print(f"📼 BACKTEST - {report['fixtures']} matchs, {len(report['groups'])} saisons/ligues, "
+          f"{report['processes']} processus, {report['elapsed_seconds']}s")
+    print("=" * 86)
+    print(f"   {'IA':<18} {'Marché':<18} {'Notés':>7} {'Précision':>10} {'Brier':>7} {'LogLoss':>8} {'ROI':>8}")
+    for row in report_rows(report):
+        if row['count'] < min_count:
+            continue
+        roi = f"{row['roi'] * 100:+.1f}%" if row['roi'] is not None else '-'
+        print(f"   {row['agent']:<18} {row['market']:<18} {row['count']:>7} {row['accuracy'] * 100:>9.1f}% "
+              f"{row['brier']:>7.3f} {row['log_loss']:>8.3f} {roi:>8}")
+    print("=" * 86)
+
+
+def _storage_client():
+    """Client du stockage configuré (EROS_STORAGE), None si indisponible"""
+    from backend.app.services.supabase_client import get_supabase_client
+
+    return get_supabase_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest des IA Eros Bot sur des saisons passées")
+    parser.add_argument('--archive', nargs='*', help="fichiers/dossiers JSON football-data.org (sinon table matches)")
+    parser.add_argument('--since', help="date de début (table matches)")
+    parser.add_argument('--until', help="date de fin (table matches)")
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--min-count', type=int, default=1, help="masque les lignes avec moins de votes notés")
+    parser.add_argument('--json', help="écrit le rapport dans ce fichier")
+    args = parser.parse_args()
+
+    if args.archive:
+        fixtures = load_archive(args.archive)
+    else:
+        client = _storage_client()
+        if client is None:
+            print("❌ Aucun stockage disponible (SUPABASE_URL/SUPABASE_KEY ou EROS_STORAGE=sqlite)")
+            return 1
+        fixtures = load_fixtures_from_storage(client, args.since, args.until)
+    if not fixtures:
+        print("⚠️ Aucun match terminé à rejouer")
+        return 1
+
+    report = BacktestEngine(processes=args.processes).run(fixtures)
+    print_report(report, min_count=args.min_count)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(dict(report, table=report_rows(report),
+                           groups=[{'league': league, 'season': season, 'predictions': count}
+                                   for (league, season), count in report['groups'].items()]),
+                      f, ensure_ascii=False, indent=2)
+        print(f"✅ Rapport écrit dans {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,86 +1,169 @@
 #!/usr/bin/env python3
 """
 🧠 Eros Bot - Base Agent Class
-Classe de base que toutes les IA de prédiction vont hériter.
+Classe de base que toutes les IA de prédiction héritent, et registre des IA.
+
+Une IA est déclarée une fois, avec @register_agent, et annonce:
+- NAME: nom sous lequel l'orchestrateur la découvre (get_agent_class('statistician'))
+- MARKETS: marchés qu'elle produit, dans l'ordre de production
+- FEATURES: caractéristiques d'équipe (colonnes du TeamFeatureStore, 'name_hash') et
+  champs du match ('league') qu'elle lit; MARKET_FEATURES les restreint par marché
+- DEFAULT_WEIGHT: poids de vote de départ
+
+_analyze() / _analyze_batch() reçoivent `markets` (None = tous): une IA ne calcule que
+les marchés demandés.
 """
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Type
+import importlib
 import logging
+from time import perf_counter_ns
+
+import numpy as np
+
+from backend.app.ai_engine.team_features import TeamFeatureStore, get_team_feature_store
+from backend.app.services import metrics
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+OUTCOMES_1N2 = np.array(['HOME_WIN', 'DRAW', 'AWAY_WIN'])
+
+# IA livrées avec Eros: nom → module qui l'enregistre (importé à la première demande)
+BUILTIN_AGENTS = {
+    'statistician': 'backend.app.ai_engine.agents.statistician',
+    'form_detector': 'backend.app.ai_engine.agents.form_detector',
+    'time_series': 'backend.app.ai_engine.agents.time_series',
+    'context_analyst': 'backend.app.ai_engine.agents.context_analyst',
+}
+
+AGENT_REGISTRY: Dict[str, Type['BasePredictionAgent']] = {}
+
+
+def _round_array(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """round() de Python sur un tableau: np.round diffère sur les cas à mi-chemin (ex: 0.12345)"""
+    rounded = np.round(values, ndigits)
+    scaled = values * 10.0 ** ndigits
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6):
+        rounded[i] = round(float(values[i]), ndigits)
+    return rounded
+
+
+def _pick_1n2(home: np.ndarray, away: np.ndarray) -> np.ndarray:
+    """Code 1N2 par match: 0 = HOME_WIN, 1 = DRAW, 2 = AWAY_WIN"""
+    return np.where(home, 0, np.where(away, 2, 1))
+
 
 class BasePredictionAgent(ABC):
     """Classe abstraite de base pour tous les agents de prédiction."""
-    
-    def __init__(self, name: str, weight: float = 1.0):
-        self.name = name
-        self._weight = max(0.0, min(1.0, weight))
+
+    NAME = ''
+    MARKETS: Tuple[str, ...] = ()
+    FEATURES: Tuple[str, ...] = ()
+    # Prérequis d'un marché quand il n'a pas besoin de tout FEATURES: {marché: caractéristiques}
+    MARKET_FEATURES: Dict[str, Tuple[str, ...]] = {}
+    DEFAULT_WEIGHT = 1.0
+    # Champs obligatoires du match; vide par défaut: les IA remplacent une équipe absente par 'Unknown'
+    REQUIRED_FIELDS: Tuple[str, ...] = ()
+    # Étape de /metrics où sont mesurés predict() et _analyze_batch() (défaut 'agent.<nom>')
+    STAGE: Optional[str] = None
+
+    def __init__(self, name: Optional[str] = None, weight: Optional[float] = None,
+                 feature_store: Optional[TeamFeatureStore] = None):
+        self.name = name or self.NAME
         self.version = "1.0.0"
+        self.weight = self.DEFAULT_WEIGHT if weight is None else weight
+        self.feature_store = feature_store if feature_store is not None else get_team_feature_store()
         self.last_run: Optional[datetime] = None
         self.total_predictions = 0
         self.successful_predictions = 0
-        logger.info(f"🤖 Agent '{name}' initialisé (poids: {self._weight})")
-    
+        self.total_time_ms = 0.0
+        # Histogramme partagé par les instances de même nom
+        self.stage = metrics.stage(self.STAGE or f'agent.{self.name}')
+        logger.debug(f"🤖 Agent '{self.name}' initialisé (poids: {self._weight})")
+
     @property
     def weight(self) -> float:
         return self._weight
-    
+
     @weight.setter
     def weight(self, value: float):
         self._weight = max(0.5, min(2.0, value))
-        logger.info(f"📊 {self.name}: Poids mis à jour à {self._weight}")
-    
+        logger.debug(f"📊 {self.name}: Poids mis à jour à {self._weight}")
+
+    @classmethod
+    def wanted(cls, markets: Optional[Iterable[str]]) -> Tuple[str, ...]:
+        """Marchés de l'IA à produire, dans son ordre (tous si markets est None)"""
+        if markets is None:
+            return cls.MARKETS
+        return tuple(m for m in cls.MARKETS if m in markets)
+
+    @classmethod
+    def features_for(cls, markets: Optional[Iterable[str]]) -> Tuple[str, ...]:
+        """Caractéristiques lues pour produire ces marchés (toutes si markets est None)"""
+        if markets is None:
+            return cls.FEATURES
+        needed = {f for m in cls.wanted(markets) for f in cls.MARKET_FEATURES.get(m, cls.FEATURES)}
+        return tuple(f for f in cls.FEATURES if f in needed)
+
+    @staticmethod
+    def _headline(markets: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Marché repris dans prediction / confidence: 1N2, sinon le premier calculé"""
+        if '1N2' in markets:
+            return markets['1N2']
+        if not markets:
+            raise ValueError("Aucun marché demandé à cette IA")
+        return next(iter(markets.values()))
+
     @abstractmethod
-    def _analyze(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze(self, match_data: Dict[str, Any], markets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """Méthode abstraite à implémenter par chaque IA."""
         pass
-    
-    def predict(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Méthode publique pour générer une prédiction."""
-        start_time = datetime.now()
-        
+
+    def _analyze_batch(self, batch: Dict[str, np.ndarray],
+                       markets: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Version vectorisée de _analyze() sur un lot de matchs
+        batch: colonnes alignées (home_team, away_team, home_id, away_id, plus league et
+        home_hash / away_hash si l'IA les annonce dans FEATURES)
+        Retourne {marché: {'prediction': tableau, 'confidence': tableau}}, mêmes valeurs
+        que _analyze() match par match.
+        """
+        raise NotImplementedError
+
+    def predict(self, match_data: Dict[str, Any], markets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Méthode publique pour générer une prédiction (résultat de _analyze())
+        markets: marchés à calculer (None = tous ceux de l'IA)
+        """
+        start = perf_counter_ns()
+
         try:
             if not self._validate_input(match_data):
                 return self._error_response("Données de match invalides")
-            
-            result = self._analyze(match_data)
-            
+
+            result = self._analyze(match_data, markets)
+
             if not self._validate_output(result):
                 return self._error_response("Résultat de prédiction invalide")
-            
-            execution_time = (datetime.now() - start_time).total_seconds()
-            
-            prediction = {
-                'agent_name': self.name,
-                'agent_version': self.version,
-                'prediction': result['prediction'],
-                'confidence': result['confidence'],
-                'weighted_confidence': result['confidence'] * self._weight,
-                'reasoning': result.get('reasoning', ''),
-                'execution_time_ms': round(execution_time * 1000, 2),
-                'timestamp': datetime.now().isoformat(),
-                'match_id': match_data.get('match_id_api', 'unknown')
-            }
-            
-            self.total_predictions += 1
-            self.last_run = datetime.now()
-            
-            logger.debug(f"✅ {self.name}: Prédiction générée en {prediction['execution_time_ms']}ms")
-            return prediction
-            
+
         except Exception as e:
             logger.error(f"❌ {self.name}: Erreur lors de la prédiction: {e}")
             return self._error_response(str(e))
-    
+
+        elapsed = perf_counter_ns() - start
+        self.stage.record(elapsed)
+        self.total_time_ms += elapsed / 1e6
+        self.total_predictions += 1
+        self.successful_predictions += 1
+        self.last_run = datetime.now()
+        return result
+
     def _validate_input(self, match_data: Dict[str, Any]) -> bool:
         """Valide que les données d'entrée sont suffisantes."""
-        required_fields = ['home_team', 'away_team', 'match_date']
-        return all(field in match_data for field in required_fields)
-    
+        return isinstance(match_data, dict) and all(field in match_data for field in self.REQUIRED_FIELDS)
+
     def _validate_output(self, result: Dict[str, Any]) -> bool:
         """Valide que le résultat de l'IA est bien formaté."""
         required = ['prediction', 'confidence']
@@ -89,40 +172,85 @@ class BasePredictionAgent(ABC):
         if not isinstance(result['confidence'], (int, float)) or not 0 <= result['confidence'] <= 1:
             return False
         return True
-    
+
     def _error_response(self, error_msg: str) -> Dict[str, Any]:
         """Génère une réponse d'erreur standardisée."""
+        self.total_predictions += 1
+        self.stage.error()
         return {
             'agent_name': self.name,
             'prediction': 'ERROR',
             'confidence': 0.0,
             'weighted_confidence': 0.0,
             'reasoning': f"Erreur: {error_msg}",
-            'error': True,
-            'timestamp': datetime.now().isoformat()
+            'error': True
         }
-    
+
     def get_stats(self) -> Dict[str, Any]:
         """Retourne les statistiques de l'agent."""
         success_rate = (
             self.successful_predictions / self.total_predictions * 100
             if self.total_predictions > 0 else 0
         )
+        avg_time = self.total_time_ms / self.successful_predictions if self.successful_predictions else 0
         return {
             'name': self.name,
             'version': self.version,
             'weight': self._weight,
+            'markets': list(self.MARKETS),
+            'features': list(self.FEATURES),
             'total_predictions': self.total_predictions,
             'success_rate_percent': round(success_rate, 2),
+            'avg_time_ms': round(avg_time, 3),
             'last_run': self.last_run.isoformat() if self.last_run else None
         }
 
 
+# ---------- Registre ----------
+
+def register_agent(cls: Type[BasePredictionAgent]) -> Type[BasePredictionAgent]:
+    """Décorateur: rend une IA disponible sous cls.NAME"""
+    if not cls.NAME or not cls.MARKETS:
+        raise ValueError(f"{cls.__name__}: NAME et MARKETS sont obligatoires")
+    registered = AGENT_REGISTRY.get(cls.NAME)
+    if registered is not None and registered.__qualname__ != cls.__qualname__:
+        raise ValueError(f"IA déjà enregistrée sous '{cls.NAME}': {registered.__name__}")
+    AGENT_REGISTRY[cls.NAME] = cls
+    return cls
+
+
+def get_agent_class(name: str) -> Type[BasePredictionAgent]:
+    """Classe de l'IA `name` (les IA livrées sont importées à la demande)"""
+    if name not in AGENT_REGISTRY and name in BUILTIN_AGENTS:
+        importlib.import_module(BUILTIN_AGENTS[name])
+    try:
+        return AGENT_REGISTRY[name]
+    except KeyError:
+        known = list(dict.fromkeys(list(BUILTIN_AGENTS) + list(AGENT_REGISTRY)))
+        raise ValueError(f"IA inconnue: {name} (disponibles: {', '.join(known)})") from None
+
+
+def available_agents() -> List[str]:
+    """Noms des IA disponibles: celles livrées, puis celles enregistrées ailleurs"""
+    for name in BUILTIN_AGENTS:
+        get_agent_class(name)
+    return list(AGENT_REGISTRY)
+
+
+def create_agent(name: str, **kwargs) -> BasePredictionAgent:
+    """Instancie l'IA `name` (weight, feature_store en option)"""
+    return get_agent_class(name)(**kwargs)
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("🧪 TEST BASE AGENT - EROS BOT")
     print("=" * 60)
     print("✅ BasePredictionAgent chargé avec succès")
-    print("📊 Version: 1.0.0")
+    # Registre du module importé (celui où les IA s'enregistrent), pas celui de __main__
+    from backend.app.ai_engine.base_agent import available_agents, get_agent_class
+    for agent_name in available_agents():
+        agent_class = get_agent_class(agent_name)
+        print(f"   • {agent_name} (poids {agent_class.DEFAULT_WEIGHT}): {', '.join(agent_class.MARKETS)}")
     print("\n✅ TEST RÉUSSI !")
-    print("=" * 60)
\ No newline at end of file
+    print("=" * 60)
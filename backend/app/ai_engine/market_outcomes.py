@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+✅ Eros Bot - Market Outcomes
+Correction d'une prédiction, pour chaque marché produit par les IA, à partir du score final
+(et du score à la mi-temps quand il est connu).
+
+Usage:
+    result = {'home_score': 2, 'away_score': 1, 'ht_home_score': 0, 'ht_away_score': 1}
+    evaluate_prediction('OVER_UNDER_2.5', 'OVER_2.5', result)   # True
+    evaluate_prediction('CORNERS', 'OVER_9.5', result)           # None (non évaluable)
+"""
+
+from typing import Dict, Any, Optional
+
+
+def outcome_1n2(home_score: int, away_score: int) -> str:
+    if home_score > away_score:
+        return 'HOME_WIN'
+    if home_score < away_score:
+        return 'AWAY_WIN'
+    return 'DRAW'
+
+
+def _side(home_score: int, away_score: int) -> str:
+    """HOME / DRAW / AWAY (libellés de HT_FT)"""
+    return outcome_1n2(home_score, away_score).split('_')[0]
+
+
+def _over_under(predicted: str, goals: int) -> Optional[bool]:
+    """OVER_2.5 / UNDER_2.5 (suffixe _HT ignoré: le total passé est déjà le bon)"""
+    parts = predicted.split('_')
+    try:
+        line = float(parts[1])
+    except (IndexError, ValueError):
+        return None
+    if parts[0] == 'OVER':
+        return goals > line
+    if parts[0] == 'UNDER':
+        return goals < line
+    return None
+
+
+def _exact_goals(predicted: str, goals: int) -> Optional[bool]:
+    """EXACT_2_GOALS, EXACT_3+_GOALS"""
+    value = predicted[len('EXACT_'):-len('_GOALS')] if predicted.startswith('EXACT_') else ''
+    if value.endswith('+') and value[:-1].isdigit():
+        return goals >= int(value[:-1])
+    if value.isdigit():
+        return goals == int(value)
+    return None
+
+
+def actual_outcome(market_type: str, result: Dict[str, Any]) -> Optional[str]:
+    """Libellé du résultat réel d'un marché (comparable à predicted_outcome), None si inconnu"""
+    home, away = result.get('home_score'), result.get('away_score')
+    if home is None or away is None:
+        return None
+    ht_home, ht_away = result.get('ht_home_score'), result.get('ht_away_score')
+    has_ht = ht_home is not None and ht_away is not None
+
+    if market_type == '1N2':
+        return outcome_1n2(home, away)
+    if market_type == 'CORRECT_SCORE':
+        return f"CS_{home}_{away}"
+    if market_type == 'BTTS':
+        return 'BTTS_YES' if home > 0 and away > 0 else 'BTTS_NO'
+    if market_type == 'HT_FT':
+        return f"{_side(ht_home, ht_away)}_{_side(home, away)}" if has_ht else None
+    if market_type in ('EXACT_GOALS_HOME', 'EXACT_GOALS_AWAY'):
+        goals = home if market_type.endswith('HOME') else away
+        return f"EXACT_{goals if goals < 3 else '3+'}_GOALS"
+    if market_type.startswith('OVER_UNDER'):
+        if market_type.endswith('_HT'):
+            return f"{ht_home + ht_away}_GOALS_HT" if has_ht else None
+        return f"{home + away}_GOALS"
+    if market_type == 'DOUBLE_CHANCE':
+        return outcome_1n2(home, away)
+    if market_type == 'H2H_ADVANTAGE':
+        return _side(home, away)
+    return None
+
+
+def evaluate_prediction(market_type: str, predicted: str, result: Dict[str, Any]) -> Optional[bool]:
+    """
+    True / False si la prédiction est gagnante / perdante, None si elle n'est pas évaluable
+    avec le résultat fourni (CORNERS, CARDS, marchés mi-temps sans score à la mi-temps...)
+    """
+    home, away = result.get('home_score'), result.get('away_score')
+    if home is None or away is None or not predicted:
+        return None
+    ht_home, ht_away = result.get('ht_home_score'), result.get('ht_away_score')
+    has_ht = ht_home is not None and ht_away is not None
+
+    if market_type == '1N2':
+        return predicted == outcome_1n2(home, away)
+    if market_type == 'DOUBLE_CHANCE':
+        covered = {'1N': ('HOME_WIN', 'DRAW'), '12': ('HOME_WIN', 'AWAY_WIN'), 'N2': ('DRAW', 'AWAY_WIN')}
+        return outcome_1n2(home, away) in covered[predicted] if predicted in covered else None
+    if market_type == 'BTTS':
+        return predicted == ('BTTS_YES' if home > 0 and away > 0 else 'BTTS_NO')
+    if market_type == 'OVER_UNDER_HT':
+        return _over_under(predicted, ht_home + ht_away) if has_ht else None
+    if market_type.startswith('OVER_UNDER_'):
+        return _over_under(predicted, home + away)
+    if market_type == 'EXACT_GOALS_HOME':
+        return _exact_goals(predicted, home)
+    if market_type == 'EXACT_GOALS_AWAY':
+        return _exact_goals(predicted, away)
+    if market_type == 'CORRECT_SCORE':
+        return predicted == f"CS_{home}_{away}"
+    if market_type == 'HT_FT':
+        return predicted == f"{_side(ht_home, ht_away)}_{_side(home, away)}" if has_ht else None
+    if market_type == 'H2H_ADVANTAGE':
+        return predicted == _side(home, away)
+    # CORNERS, CARDS...: aucune donnée de résultat
+    return None
@@ -3,28 +3,31 @@
 
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-from pathlib import Path
-import sys
-import os
+import hashlib
+import inspect
+import threading
 import json
+import time
+import weakref
 
-# Fix import Acode
-sys.path.insert(0, '/sdcard/Eros_bot_app')
+from backend.app.ai_engine.market_outcomes import outcome_1n2, actual_outcome, evaluate_prediction
+from backend.app.services.supabase_client import get_supabase_client
 
-try:
-    from dotenv import load_dotenv
-    for env_path in [Path('/sdcard/Eros_bot_app/backend/.env'), Path('/sdcard/Eros_bot_app/.env')]:
-        if env_path.exists():
-            load_dotenv(dotenv_path=env_path)
-            break
-except ImportError:
-    pass
+# Client pas encore demandé (None = demandé mais indisponible)
+_UNSET = object()
 
-try:
-    from supabase import create_client
-    SUPABASE_AVAILABLE = True
-except ImportError:
-    SUPABASE_AVAILABLE = False
+_shared_tracker = None
+_shared_lock = threading.Lock()
+
+
+def get_performance_tracker() -> 'PerformanceTracker':
+    """Tracker partagé du processus (un seul chargement des poids pour tous les orchestrateurs)"""
+    global _shared_tracker
+    if _shared_tracker is None:
+        with _shared_lock:
+            if _shared_tracker is None:
+                _shared_tracker = PerformanceTracker()
+    return _shared_tracker
 
 
 class PerformanceTracker:
@@ -34,20 +37,22 @@ class PerformanceTracker:
     Usage:
         tracker = PerformanceTracker()
         tracker.log_prediction(match_id, agent_name, prediction, confidence)
-        tracker.log_result(match_id, actual_outcome)
+        tracker.log_result(match_id, home_score=2, away_score=1)
+        tracker.resolve_matches([{'match_id': ..., 'home_score': 2, 'away_score': 1}, ...])
         weights = tracker.get_optimal_weights()
+        stats = tracker.get_accuracy_table(days=7)   # {(agent, marché): précision}
     """
     
-    def __init__(self):
-        self.supabase = None
-        if SUPABASE_AVAILABLE:
-            try:
-                supa_url = os.getenv("SUPABASE_URL")
-                supa_key = os.getenv("SUPABASE_KEY")
-                if supa_url and supa_key:
-                    self.supabase = create_client(supa_url, supa_key)
-            except:
-                pass
+    # Lignes par upsert / par page lors de la résolution en lot
+    RESOLVE_CHUNK_SIZE = 500
+    # Matchs par filtre match_id IN (...) (longueur d'URL PostgREST)
+    RESOLVE_IDS_PER_QUERY = 100
+    # Agrégats (agent_name, market_type, day) → correct, total, sum_confidence
+    ACCURACY_TABLE = 'agent_accuracy_daily'
+    
+    def __init__(self, client=None):
+        """client: client de stockage (par défaut le client partagé, créé au premier accès)"""
+        self._supabase = _UNSET if client is None else client
         
         # Poids par défaut des IA
         self.default_weights = {
@@ -57,12 +62,28 @@ class PerformanceTracker:
             'context_analyst': 0.8
         }
         
+        # Appelés avec les nouveaux poids à chaque changement (références faibles pour les méthodes)
+        self._weights_listeners = []
+        # Poids en vigueur (current_weights): lus une fois, tenus à jour par save_weights()
+        self._weights = None
+        self._weights_lock = threading.Lock()
+        
         # Paramètres d'apprentissage
         self.learning_rate = 0.05  # Vitesse d'ajustement des poids
         self.min_weight = 0.5
         self.max_weight = 2.0
         self.min_predictions = 10  # Nombre min de prédictions pour ajuster
     
+    @property
+    def supabase(self):
+        if self._supabase is _UNSET:
+            self._supabase = get_supabase_client()
+        return self._supabase
+    
+    @supabase.setter
+    def supabase(self, client):
+        self._supabase = client
+    
     def log_prediction(self, match_id: str, agent_name: str, 
                       predicted_outcome: str, confidence: float,
                       market_type: str = '1N2') -> bool:
@@ -86,99 +107,310 @@ class PerformanceTracker:
             print(f"⚠️ Erreur log_prediction: {e}")
             return False
     
-    def log_result(self, match_id: str, actual_outcome: str,
-                  home_score: int, away_score: int) -> bool:
-        """Enregistre le résultat réel d'un match."""
+    def log_result(self, match_id: str, home_score: int, away_score: int,
+                  ht_home_score: Optional[int] = None, ht_away_score: Optional[int] = None) -> bool:
+        """
+        Enregistre le résultat réel d'un match (et résout ses prédictions sur tous les marchés)
+        Les issues sont déduites des scores; sans score de mi-temps, HT_FT et OVER_UNDER_HT passent en 'void'.
+        """
         if not self.supabase:
             return False
         
-        try:
-            # Déterminer le résultat 1N2
-            if home_score > away_score:
-                result_1n2 = 'HOME_WIN'
-            elif home_score < away_score:
-                result_1n2 = 'AWAY_WIN'
-            else:
-                result_1n2 = 'DRAW'
-            
-            data = {
+        summary = self.resolve_matches([{'match_id': match_id, 'home_score': home_score, 'away_score': away_score,
+                                         'ht_home_score': ht_home_score, 'ht_away_score': ht_away_score}])
+        return summary['errors'] == 0
+    
+    def resolve_matches(self, results: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Résout en lot les prédictions en attente d'un ensemble de matchs terminés
+        results: [{'match_id', 'home_score', 'away_score'[, 'ht_home_score', 'ht_away_score']}]
+        - match_results: 1 upsert par lot de matchs
+        - prediction_logs en attente: lus par lots de matchs (match_id IN ...), corrigés
+          marché par marché, puis réécrits par upsert groupé (on_conflict='id')
+        - les prédictions non évaluables (CORNERS, mi-temps inconnue...) passent en 'void'
+        Retourne un résumé (matchs, prédictions résolues / correctes / void, requêtes, temps)
+        """
+        start = time.perf_counter()
+        chunk_size = chunk_size or self.RESOLVE_CHUNK_SIZE
+        summary = {'matches': 0, 'resolved': 0, 'correct': 0, 'void': 0, 'requests': 0, 'errors': 0}
+        
+        if not self.supabase:
+            summary['errors'] = 1
+            return summary
+        
+        by_match = {}
+        for result in results:
+            if result.get('match_id') is None or result.get('home_score') is None or result.get('away_score') is None:
+                continue
+            by_match[str(result['match_id'])] = result
+        summary['matches'] = len(by_match)
+        now = datetime.now().isoformat()
+        
+        match_rows = [
+            {
                 'match_id': match_id,
-                'actual_outcome_1n2': result_1n2,
-                'home_score': home_score,
-                'away_score': away_score,
-                'total_goals': home_score + away_score,
-                'resolved_at': datetime.now().isoformat()
+                'actual_outcome_1n2': outcome_1n2(r['home_score'], r['away_score']),
+                'home_score': r['home_score'],
+                'away_score': r['away_score'],
+                'total_goals': r['home_score'] + r['away_score'],
+                'resolved_at': now
             }
+            for match_id, r in by_match.items()
+        ]
+        for i in range(0, len(match_rows), chunk_size):
+            try:
+                self.supabase.table('match_results').upsert(match_rows[i:i + chunk_size], on_conflict='match_id').execute()
+                summary['requests'] += 1
+            except Exception as e:
+                print(f"⚠️ Erreur resolve_matches (match_results): {e}")
+                summary['errors'] += 1
+        
+        match_ids = list(by_match)
+        touched = set()
+        for i in range(0, len(match_ids), self.RESOLVE_IDS_PER_QUERY):
+            ids = match_ids[i:i + self.RESOLVE_IDS_PER_QUERY]
+            try:
+                pending = self._fetch_pending_predictions(ids, chunk_size, summary)
+            except Exception as e:
+                print(f"⚠️ Erreur resolve_matches (lecture prediction_logs): {e}")
+                summary['errors'] += 1
+                continue
             
-            # Mettre à jour ou insérer
-            self.supabase.table('match_results').upsert(data, on_conflict='match_id').execute()
-            
-            # Mettre à jour le statut des prédictions
-            self._update_prediction_statuses(match_id, result_1n2)
+            updates = []
+            for row in pending:
+                result = by_match[str(row['match_id'])]
+                market_type = row.get('market_type') or '1N2'
+                is_correct = evaluate_prediction(market_type, row.get('predicted_outcome'), result)
+                updates.append(dict(
+                    row,
+                    status='resolved' if is_correct is not None else 'void',
+                    is_correct=is_correct,
+                    actual_outcome=actual_outcome(market_type, result),
+                    resolved_at=now
+                ))
             
-            return True
-        except Exception as e:
-            print(f"⚠️ Erreur log_result: {e}")
-            return False
+            # Lignes complètes: l'upsert ne viole aucune contrainte NOT NULL à l'insertion
+            for j in range(0, len(updates), chunk_size):
+                chunk = updates[j:j + chunk_size]
+                try:
+                    self.supabase.table('prediction_logs').upsert(chunk, on_conflict='id').execute()
+                    summary['requests'] += 1
+                except Exception as e:
+                    print(f"⚠️ Erreur resolve_matches (prediction_logs): {e}")
+                    summary['errors'] += 1
+                    continue
+                for row in chunk:
+                    if row['status'] == 'void':
+                        summary['void'] += 1
+                    else:
+                        summary['resolved'] += 1
+                        summary['correct'] += int(row['is_correct'])
+                        touched.add(self._bucket_key(row))
+        
+        if touched:
+            summary['requests'] += self._update_accuracy_buckets(touched, chunk_size)
+        
+        summary['elapsed_seconds'] = round(time.perf_counter() - start, 3)
+        print(f"✅ {summary['resolved']} prédictions résolues ({summary['correct']} correctes, {summary['void']} void) "
+              f"pour {summary['matches']} matchs ({summary['requests']} requêtes, {summary['elapsed_seconds']}s)")
+        return summary
+    
+    def _fetch_pending_predictions(self, match_ids: List[str], page_size: int,
+                                   summary: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Prédictions en attente d'un lot de matchs (paginées)"""
+        rows = []
+        offset = 0
+        while True:
+            page = self.supabase.table('prediction_logs').select('*').in_('match_id', match_ids).eq(
+                'status', 'pending').order('id').range(offset, offset + page_size - 1).execute().data or []
+            summary['requests'] += 1
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            offset += page_size
     
-    def _update_prediction_statuses(self, match_id: str, actual_outcome: str):
-        """Met à jour le statut des prédictions pour ce match."""
+    def resolve_finished_matches(self, days: int = 3) -> Dict[str, Any]:
+        """
+        Résout les prédictions des matchs terminés des N derniers jours (table `matches`)
+        prediction_logs.match_id correspond à matches.match_id_api.
+        """
         if not self.supabase:
-            return
+            return {'matches': 0, 'resolved': 0, 'correct': 0, 'void': 0, 'requests': 0, 'errors': 1}
         
+        since = (datetime.now() - timedelta(days=days)).isoformat()
         try:
-            # Récupérer les prédictions en attente
-            preds = self.supabase.table('prediction_logs').select('*').eq('match_id', match_id).eq('status', 'pending').execute()
+            result = self.supabase.table('matches').select(
+                'match_id_api,home_score,away_score,home_score_ht,away_score_ht'
+            ).eq('status', 'finished').gte('match_date', since).execute()
+        except Exception as e:
+            print(f"⚠️ Erreur resolve_finished_matches: {e}")
+            return {'matches': 0, 'resolved': 0, 'correct': 0, 'void': 0, 'requests': 1, 'errors': 1}
+        
+        # Scores de mi-temps nécessaires aux marchés HT_FT / OVER_UNDER_HT (sinon 'void')
+        return self.resolve_matches([
+            {'match_id': row['match_id_api'], 'home_score': row.get('home_score'), 'away_score': row.get('away_score'),
+             'ht_home_score': row.get('home_score_ht'), 'ht_away_score': row.get('away_score_ht')}
+            for row in (result.data or [])
+        ])
+    
+    # ---------- Agrégats de précision (agent, marché, jour) ----------
+    
+    @staticmethod
+    def _bucket_key(row: Dict[str, Any]) -> tuple:
+        """(agent, marché, jour) d'une prédiction (jour = date de la prédiction)"""
+        return row['agent_name'], row.get('market_type') or '1N2', (row.get('predicted_at') or '')[:10]
+    
+    @classmethod
+    def _add_to_buckets(cls, buckets: Dict[tuple, List[float]], row: Dict[str, Any]):
+        """Ajoute une prédiction résolue à son agrégat"""
+        bucket = buckets.setdefault(cls._bucket_key(row), [0, 0, 0.0])
+        bucket[0] += int(bool(row.get('is_correct')))
+        bucket[1] += 1
+        bucket[2] += float(row.get('confidence') or 0.0)
+    
+    def _buckets_from_logs(self, apply_filters, page_size: int) -> Dict[tuple, List[float]]:
+        """Agrégats recalculés à partir des prediction_logs résolues correspondant aux filtres (paginées)"""
+        buckets = {}
+        offset = 0
+        while True:
+            query = self.supabase.table('prediction_logs').select(
+                'agent_name,market_type,predicted_at,is_correct,confidence').eq('status', 'resolved')
+            page = apply_filters(query).order('id').range(offset, offset + page_size - 1).execute().data or []
+            for row in page:
+                self._add_to_buckets(buckets, row)
+            if len(page) < page_size:
+                return buckets
+            offset += page_size
+    
+    def _write_buckets(self, buckets: Dict[tuple, List[float]], chunk_size: int) -> int:
+        """Upsert des agrégats (valeurs absolues). Retourne le nombre de requêtes."""
+        now = datetime.now().isoformat()
+        rows = [{'agent_name': agent, 'market_type': market, 'day': day, 'correct': correct, 'total': total,
+                 'sum_confidence': round(sum_confidence, 6), 'updated_at': now}
+                for (agent, market, day), (correct, total, sum_confidence) in buckets.items()]
+        for i in range(0, len(rows), chunk_size):
+            self.supabase.table(self.ACCURACY_TABLE).upsert(
+                rows[i:i + chunk_size], on_conflict='agent_name,market_type,day').execute()
+        return (len(rows) + chunk_size - 1) // chunk_size
+    
+    def _update_accuracy_buckets(self, touched: set, chunk_size: int) -> int:
+        """
+        Recalcule les agrégats (agent, marché, jour) touchés par une résolution à partir de
+        prediction_logs, puis les écrit en valeurs absolues: idempotent (relancer la résolution
+        ou deux résolutions concurrentes ne comptent jamais une prédiction deux fois).
+        Retourne le nombre de requêtes.
+        """
+        requests = 0
+        agents = sorted({agent for agent, _, _ in touched})
+        markets = sorted({market for _, market, _ in touched})
+        buckets = {}
+        try:
+            for day in sorted({day for _, _, day in touched}):
+                next_day = (datetime.strptime(day, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+                day_buckets = self._buckets_from_logs(
+                    lambda q: q.gte('predicted_at', day).lt('predicted_at', next_day)
+                    .in_('agent_name', agents).in_('market_type', markets), chunk_size)
+                buckets.update((key, day_buckets[key]) for key in touched if key in day_buckets)
+                requests += 1
+            requests += self._write_buckets(buckets, chunk_size)
+        except Exception as e:
+            # Agrégats rattrapés à la prochaine résolution des mêmes jours ou par rebuild_accuracy_aggregates()
+            print(f"⚠️ Agrégats de précision non mis à jour: {e}")
+        return requests
+    
+    def _fetch_all(self, apply_filters, columns: str, page_size: int) -> List[Dict[str, Any]]:
+        """Lignes de agent_accuracy_daily correspondant aux filtres (paginées)"""
+        rows = []
+        offset = 0
+        while True:
+            query = apply_filters(self.supabase.table(self.ACCURACY_TABLE).select(columns))
+            page = query.order('day').range(offset, offset + page_size - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            offset += page_size
+    
+    def rebuild_accuracy_aggregates(self, days: int = 90) -> int:
+        """
+        Reconstruit les agrégats des N derniers jours à partir de prediction_logs.
+        À lancer une fois à la mise en place de la table (historique existant), puis après
+        une correction manuelle des logs:
+            python -m backend.app.ai_engine.performance_tracker --rebuild-aggregates
+        Les agrégats sont écrasés par upsert avant la suppression des seuls agrégats
+        devenus vides: un lecteur ne voit jamais la table vidée en cours de reconstruction.
+        Retourne le nombre d'agrégats écrits.
+        """
+        if not self.supabase:
+            return 0
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+        try:
+            buckets = self._buckets_from_logs(lambda q: q.gte('predicted_at', since), self.RESOLVE_CHUNK_SIZE)
+            self._write_buckets(buckets, self.RESOLVE_CHUNK_SIZE)
             
-            for pred in preds.data:
-                is_correct = pred['predicted_outcome'] == actual_outcome
-                
-                self.supabase.table('prediction_logs').update({
-                    'status': 'resolved',
-                    'is_correct': is_correct,
-                    'actual_outcome': actual_outcome,
-                    'resolved_at': datetime.now().isoformat()
-                }).eq('id', pred['id']).execute()
-        except:
-            pass
+            stale = [row for row in self._fetch_all(lambda q: q.gte('day', since[:10]),
+                                                    'agent_name,market_type,day', self.RESOLVE_CHUNK_SIZE)
+                     if (row['agent_name'], row['market_type'], row['day']) not in buckets]
+            for row in stale:
+                self.supabase.table(self.ACCURACY_TABLE).delete().eq('agent_name', row['agent_name']).eq(
+                    'market_type', row['market_type']).eq('day', row['day']).execute()
+        except Exception as e:
+            print(f"⚠️ Erreur rebuild_accuracy_aggregates: {e}")
+            return 0
+        print(f"✅ {len(buckets)} agrégats de précision reconstruits ({days} jours, {len(stale)} supprimés)")
+        return len(buckets)
+    
+    @staticmethod
+    def _accuracy_stats(correct: int, total: int, sum_confidence: float) -> Dict[str, float]:
+        if not total:
+            return {'accuracy': 0.5, 'count': 0, 'avg_confidence': 0.5}
+        return {
+            'accuracy': correct / total,
+            'count': total,
+            'avg_confidence': sum_confidence / total,
+            'correct': correct,
+            'total': total
+        }
+    
+    def get_accuracy_table(self, days: int = 30, market_type: Optional[str] = None) -> Dict[tuple, Dict[str, float]]:
+        """
+        Précision de chaque (agent, marché) sur les N derniers jours, en une requête
+        sur les agrégats journaliers (≤ N lignes par couple, aucun parcours des logs bruts)
+        """
+        if not self.supabase:
+            return {}
+        since_day = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        
+        def filters(query):
+            query = query.gte('day', since_day)
+            return query.eq('market_type', market_type) if market_type else query
+        
+        totals = {}
+        for row in self._fetch_all(filters, 'agent_name,market_type,correct,total,sum_confidence',
+                                   self.RESOLVE_CHUNK_SIZE):
+            bucket = totals.setdefault((row['agent_name'], row['market_type']), [0, 0, 0.0])
+            bucket[0] += row.get('correct') or 0
+            bucket[1] += row.get('total') or 0
+            bucket[2] += row.get('sum_confidence') or 0.0
+        return {key: self._accuracy_stats(*bucket) for key, bucket in totals.items()}
     
     def get_agent_accuracy(self, agent_name: str, days: int = 30, 
                           market_type: str = '1N2') -> Dict[str, float]:
-        """Calcule la précision d'une IA sur les N derniers jours."""
+        """Calcule la précision d'une IA sur les N derniers jours (somme des agrégats journaliers)."""
         if not self.supabase:
             return {'accuracy': 0.5, 'count': 0, 'avg_confidence': 0.5}
         
         try:
-            since = (datetime.now() - timedelta(days=days)).isoformat()
-            
-            result = self.supabase.table('prediction_logs').select('*').eq('agent_name', agent_name).eq('market_type', market_type).eq('status', 'resolved').gte('predicted_at', since).execute()
-            
-            logs = result.data if hasattr(result, 'data') else []
-            
-            if not logs:
-                return {'accuracy': 0.5, 'count': 0, 'avg_confidence': 0.5}
-            
-            correct = sum(1 for l in logs if l.get('is_correct', False))
-            total = len(logs)
-            avg_conf = sum(l.get('confidence', 0.5) for l in logs) / total
-            
-            return {
-                'accuracy': correct / total if total > 0 else 0.5,
-                'count': total,
-                'avg_confidence': avg_conf,
-                'correct': correct,
-                'total': total
-            }
+            table = self.get_accuracy_table(days, market_type)
+            return table.get((agent_name, market_type), self._accuracy_stats(0, 0, 0.0))
         except Exception as e:
             print(f"⚠️ Erreur get_agent_accuracy: {e}")
             return {'accuracy': 0.5, 'count': 0, 'avg_confidence': 0.5}
     
-    def get_optimal_weights(self) -> Dict[str, float]:
-        """Calcule les poids optimaux basés sur les performances récentes."""
+    def _weights_from_stats(self, stats_by_agent: Dict[str, Dict[str, float]]) -> Dict[str, float]:
         weights = {}
         
         for agent_name in self.default_weights.keys():
-            stats = self.get_agent_accuracy(agent_name)
+            stats = stats_by_agent.get(agent_name) or self._accuracy_stats(0, 0, 0.0)
             
             if stats['count'] >= self.min_predictions:
                 # Ajustement basé sur la précision vs confiance moyenne
@@ -201,6 +433,31 @@ class PerformanceTracker:
         
         return weights
     
+    def get_optimal_weights(self, days: int = 30, market_type: str = '1N2') -> Dict[str, float]:
+        """
+        Calcule les poids optimaux basés sur les performances récentes (agrégats agent_accuracy_daily).
+        Seules les prédictions résolues depuis la mise en place des agrégats sont comptées:
+        l'historique antérieur est ignoré tant que rebuild_accuracy_aggregates() n'a pas été lancé.
+        """
+        try:
+            table = self.get_accuracy_table(days, market_type)
+        except Exception as e:
+            print(f"⚠️ Erreur get_optimal_weights: {e}")
+            table = {}
+        return self._weights_from_stats({agent: stats for (agent, _), stats in table.items()})
+    
+    def get_market_weights(self, days: int = 30) -> Dict[str, Dict[str, float]]:
+        """Poids optimaux des IA pour chaque marché observé: {marché: {agent: poids}}"""
+        try:
+            table = self.get_accuracy_table(days)
+        except Exception as e:
+            print(f"⚠️ Erreur get_market_weights: {e}")
+            return {}
+        by_market = {}
+        for (agent, market), stats in table.items():
+            by_market.setdefault(market, {})[agent] = stats
+        return {market: self._weights_from_stats(stats) for market, stats in by_market.items()}
+    
     def save_weights(self, weights: Dict[str, float]) -> bool:
         """Sauvegarde les poids dans Supabase."""
         if not self.supabase:
@@ -210,26 +467,88 @@ class PerformanceTracker:
             data = {
                 'weights': json.dumps(weights),
                 'updated_at': datetime.now().isoformat(),
-                'version': '1.0'
+                # Même empreinte que MetaOrchestratorAgent.weights_version
+                'version': hashlib.md5(json.dumps(weights, sort_keys=True).encode('utf-8')).hexdigest()[:12]
             }
-            self.supabase.table('ai_weights').upsert(data, on_conflict='id').execute()
-            return True
+            # Historique: une ligne par sauvegarde, la plus récente (id le plus grand) fait foi
+            self.supabase.table('ai_weights').insert(data).execute()
         except:
             return False
+        
+        self._apply_weights(weights)
+        return True
+    
+    def _apply_weights(self, weights: Dict[str, float]):
+        """Nouveaux poids en vigueur, notifiés aux abonnés encore vivants"""
+        with self._weights_lock:
+            self._weights = dict(weights)
+            callbacks = [(ref, ref()) for ref in self._weights_listeners]
+            self._weights_listeners = [ref for ref, callback in callbacks if callback is not None]
+        for _, callback in callbacks:
+            if callback is None:
+                continue
+            try:
+                callback(dict(weights))
+            except Exception as e:
+                print(f"⚠️ Notification des nouveaux poids échouée: {e}")
+    
+    def on_weights_saved(self, callback):
+        """
+        Enregistre une fonction appelée avec les poids à chaque changement (ex: vider un cache)
+        Une méthode liée est gardée par référence faible: l'abonnement ne retient pas son objet
+        (orchestrateurs des backtests, benchmarks...). Retourne la fonction de désabonnement.
+        """
+        ref = weakref.WeakMethod(callback) if inspect.ismethod(callback) else (lambda: callback)
+        with self._weights_lock:
+            self._weights_listeners = [r for r in self._weights_listeners if r() is not None] + [ref]
+        
+        def unsubscribe():
+            with self._weights_lock:
+                if ref in self._weights_listeners:
+                    self._weights_listeners.remove(ref)
+        return unsubscribe
+    
+    def refresh_weights(self) -> bool:
+        """
+        Relit les poids sauvegardés: ceux d'un autre processus (train_step du job quotidien)
+        remplacent les poids en vigueur et sont notifiés. True si les poids ont changé.
+        Sans effet tant que les poids n'ont pas été chargés, ou si la lecture échoue.
+        """
+        if self._weights is None:
+            return False
+        weights = self._read_weights()
+        if weights is None or weights == self._weights:
+            return False
+        print(f"🔄 Nouveaux poids sauvegardés par un autre processus: {weights}")
+        self._apply_weights(weights)
+        return True
+    
+    def current_weights(self) -> Dict[str, float]:
+        """Poids en vigueur, chargés une fois par processus (load_weights relit toujours la base)"""
+        with self._weights_lock:
+            if self._weights is None:
+                self._weights = self.load_weights()
+            return dict(self._weights)
     
     def load_weights(self) -> Dict[str, float]:
         """Charge les poids depuis Supabase."""
+        weights = self._read_weights()
+        return weights if weights is not None else self.default_weights.copy()
+    
+    def _read_weights(self) -> Optional[Dict[str, float]]:
+        """Derniers poids sauvegardés, None si aucun, si la base est indisponible ou en erreur"""
         if not self.supabase:
-            return self.default_weights.copy()
+            return None
         
         try:
-            result = self.supabase.table('ai_weights').select('*').limit(1).execute()
+            # id croissant (identity), jamais NULL contrairement à updated_at des lignes anciennes
+            result = self.supabase.table('ai_weights').select('*').order('id', desc=True).limit(1).execute()
             if result.data and len(result.data) > 0:
                 return json.loads(result.data[0].get('weights', '{}'))
         except:
             pass
         
-        return self.default_weights.copy()
+        return None
     
     def train_step(self) -> Dict[str, Any]:
         """Exécute une étape d'entraînement et retourne les résultats."""
@@ -274,6 +593,13 @@ class PerformanceTracker:
 # 🧪 TEST
 # ============================================
 if __name__ == "__main__":
+    import sys
+    
+    if '--rebuild-aggregates' in sys.argv:
+        # Mise en place de agent_accuracy_daily: reprise de l'historique de prediction_logs
+        get_performance_tracker().rebuild_accuracy_aggregates()
+        sys.exit(0)
+    
     print("=" * 60)
     print("📊 EROS BOT - TEST PERFORMANCE TRACKER")
     print("=" * 60)
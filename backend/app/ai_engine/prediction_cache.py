@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+🗃️ Eros Bot - Prediction Cache
+Cache LRU + TTL des prédictions du Meta-Orchestrator.
+Clé = empreinte des champs du match lus par les IA + caractéristiques des deux équipes
+(feature store) ; chaque entrée est liée à la version des poids des IA: un nouveau jeu
+de poids (train_step) vide le cache.
+
+Usage:
+    cache = PredictionCache(path='.cache/predictions.json')
+    key = cache.fingerprint(match_data, feature_store)
+    result = cache.get(key, weights_version)
+    if result is None:
+        result = meta_agent.predict(match_data)
+        cache.put(key, weights_version, result)
+"""
+
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+
+from backend.app.services import metrics
+
+# Champs de match_data qui influencent la prédiction
+FINGERPRINT_FIELDS = ('home_team', 'away_team', 'league', 'match_date')
+
+CACHE_HITS = metrics.counter('eros_cache_hits_total', cache='predictions')
+CACHE_MISSES = metrics.counter('eros_cache_misses_total', cache='predictions')
+
+
+class PredictionCache:
+    """
+    Cache LRU borné avec expiration, optionnellement persisté en JSON
+
+    Les résultats sont conservés sérialisés en JSON: chaque lecture rend une copie
+    indépendante (bien moins coûteux que deepcopy) et la persistance n'a rien à convertir.
+    """
+
+    FORMAT_VERSION = 2
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 6 * 3600, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.weights_version: Optional[str] = None
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        if path:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---------- Clés ----------
+
+    @staticmethod
+    def is_cacheable(match_data: Dict[str, Any]) -> bool:
+        return all(isinstance(match_data.get(field, 'Unknown'), str)
+                   for field in ('home_team', 'away_team', 'league'))
+
+    @staticmethod
+    def fingerprint(match_data: Dict[str, Any], feature_store=None, markets=None) -> str:
+        """
+        Empreinte du match (+ caractéristiques des équipes: un refresh du store change la clé)
+        markets: marchés demandés (None = tous); une sélection de marchés a sa propre entrée
+        """
+        raw = tuple(match_data.get(field) for field in FINGERPRINT_FIELDS)
+        if feature_store is not None:
+            # Sans team_id: les ids dépendent de l'ordre d'arrivée des équipes dans le processus
+            raw += (feature_store.lookup(match_data.get('home_team', 'Unknown'))[1:],
+                    feature_store.lookup(match_data.get('away_team', 'Unknown'))[1:])
+        if markets:
+            raw += (tuple(sorted(markets)),)
+        # repr() de str/float/int/tuple est stable d'un processus à l'autre (contrairement à hash())
+        return hashlib.sha1(repr(raw).encode('utf-8')).hexdigest()
+
+    # ---------- Lecture / écriture ----------
+
+    def _check_version(self, weights_version: str):
+        """Nouveau jeu de poids → toutes les prédictions en cache sont obsolètes (sous verrou)"""
+        if weights_version != self.weights_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.weights_version = weights_version
+
+    def get(self, key: str, weights_version: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._check_version(weights_version)
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry[0] >= self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                CACHE_MISSES.inc()
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            CACHE_HITS.inc()
+            payload = entry[1]
+        return json.loads(payload)
+
+    def put(self, key: str, weights_version: str, result: Dict[str, Any]):
+        payload = json.dumps(result)
+        with self._lock:
+            self._check_version(weights_version)
+            self._entries[key] = (time.time(), payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self):
+        """Vide le cache (ex: poids sauvegardés par l'auto-training)"""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    # ---------- Persistance ----------
+
+    def save(self) -> bool:
+        """Écrit les entrées non expirées dans `path` (écriture atomique)"""
+        if not self.path:
+            return False
+        now = time.time()
+        with self._lock:
+            payload = {
+                'format': self.FORMAT_VERSION,
+                'weights_version': self.weights_version,
+                'entries': [[key, stored_at, result] for key, (stored_at, result) in self._entries.items()
+                            if now - stored_at < self.ttl]
+            }
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp, self.path)
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ Cache de prédictions non sauvegardé ({self.path}): {e}")
+            return False
+
+    def load(self) -> int:
+        """Recharge les entrées non expirées depuis `path`, retourne leur nombre"""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Cache de prédictions illisible ({self.path}): {e}")
+            return 0
+        if payload.get('format') != self.FORMAT_VERSION:
+            return 0
+
+        now = time.time()
+        with self._lock:
+            self.weights_version = payload.get('weights_version')
+            for key, stored_at, result in payload.get('entries', [])[-self.max_entries:]:
+                if now - stored_at < self.ttl:
+                    self._entries[key] = (stored_at, result)
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'invalidations': self.invalidations,
+            'weights_version': self.weights_version
+        }
@@ -0,0 +1,188 @@
+"""
+Eros Bot - Rendu des prédictions d'un cycle
+Les prédictions sont formatées une seule fois, à la fin du cycle, à partir des résultats
+structurés de ErosPredictor, puis écrites en un bloc sur le flux de sortie (seul l'en-tête
+part au début du cycle).
+
+Modes (`mode`, ou variable EROS_RENDER):
+- 'full'    : en-tête, détail de chaque match (top 5 des marchés, buts exacts, HT/FT...) et résumé
+- 'summary' : en-tête et résumé (fiabilité, top 3, stockage), aucun détail par match
+- 'jsonl'   : une prédiction JSON par ligne (ordonnanceurs, collecte de logs)
+- 'none'    : rien (exécution headless: aucun formatage par match)
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, List
+
+from backend.app.services.supabase_client import storage_stats
+
+RENDER_MODES = ('none', 'summary', 'full', 'jsonl')
+
+RISK_ICONS = {"low": "✅", "medium": "⚠️", "high": "❌"}
+
+# (marché, libellé, transformation de la prédiction) de la section mi-temps / fin de match
+GOAL_LINES = (
+    ('HT_FT', "   🔄 HT/FT", lambda p: p.replace('_', '/')),
+    ('OVER_UNDER_HT', "   ⏱️ Buts 1ère MT", None),
+    ('OVER_UNDER_1.5', "   📊 Over/Under 1.5", None),
+    ('OVER_UNDER_2.5', "   📊 Over/Under 2.5", None),
+    ('OVER_UNDER_3.5', "   📊 Over/Under 3.5", None),
+    ('BTTS', "   ✅ Les 2 équipes marquent", lambda p: p.replace('BTTS_', '')),
+    ('DOUBLE_CHANCE', "   🛡️ Double Chance", None),
+    ('CORNERS', "   🚩 Corners", None),
+    ('CARDS', "   🟨 Cartons", None),
+)
+
+
+def default_mode() -> str:
+    return os.getenv("EROS_RENDER", "full").strip().lower()
+
+
+def _confidence_icon(confidence: float) -> str:
+    if confidence >= 0.75:
+        return "🏆"
+    if confidence >= 0.65:
+        return "✅"
+    if confidence >= 0.55:
+        return "⚠️"
+    return "⚪"
+
+
+class PredictionRenderer:
+    """Formate les prédictions d'un cycle et les écrit en une fois sur `stream` (stdout par défaut)"""
+
+    def __init__(self, mode: str = None, stream=None):
+        mode = mode or default_mode()
+        if mode not in RENDER_MODES:
+            raise ValueError(f"Mode d'affichage inconnu: {mode} (attendu: {', '.join(RENDER_MODES)})")
+        self.mode = mode
+        self.stream = stream
+
+    @property
+    def verbose(self) -> bool:
+        """Messages de progression affichés (modes lisibles seulement: 'jsonl' garde une sortie parsable)"""
+        return self.mode in ('summary', 'full')
+
+    def begin(self):
+        """En-tête du cycle, écrit avant le calcul (modes lisibles)"""
+        if self.verbose:
+            self._write(self.header_lines())
+
+    def render(self, predictions: List[Dict[str, Any]], demo: bool = False):
+        """Écrit le rapport du cycle; demo: prédictions sur les matchs fictifs"""
+        if self.mode == 'none':
+            return
+        if self.mode == 'jsonl':
+            lines = [json.dumps(pred, ensure_ascii=False, default=str) for pred in predictions]
+        else:
+            lines = []
+            if demo:
+                lines.append("\n⚠️ MODE DÉMO (aucun match en base)\n")
+            if self.mode == 'full':
+                for i, pred in enumerate(predictions, 1):
+                    lines.extend(self.prediction_lines(pred, i, len(predictions)))
+            lines.extend(self.summary_lines(predictions))
+        self._write(lines)
+
+    def _write(self, lines: List[str]):
+        if lines:
+            stream = self.stream or sys.stdout
+            stream.write('\n'.join(lines) + '\n')
+            stream.flush()
+
+    @staticmethod
+    def header_lines() -> List[str]:
+        return [
+            "\n" + "=" * 70,
+            "🎯 EROS BOT - PRÉDICTIONS DU JOUR (MULTI-MARCHÉS)",
+            "=" * 70,
+            f"📅 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            "🤖 IA Actives: 4 (Statisticien, Forme, TimeSeries, Context)",
+            "📊 Marchés Analysés: 10+ (1N2, Buts, HT/FT, Corners, etc.)",
+            "=" * 70,
+        ]
+
+    @staticmethod
+    def prediction_lines(pred: Dict[str, Any], index: int, total: int) -> List[str]:
+        """Détail d'une prédiction (mode 'full')"""
+        lines = [
+            f"\n{'=' * 70}",
+            f"[{index}/{total}] 🔍 Analyse: {pred['match']}",
+            f"{'=' * 70}",
+            "\n🏆 " + "=" * 60,
+            f"   🎯 MEILLEUR MARCHÉ: {pred['best_market']}",
+            f"   📊 PRÉDICTION: {pred['final_prediction']}",
+            f"   🎯 CONFIANCE: {pred['final_confidence'] * 100:.1f}%",
+            f"   {RISK_ICONS.get(pred['risk_level'], '⚪')} RISQUE: {pred['risk_level'].upper()}",
+            f"   💡 {pred['recommendation']}",
+            "🏆 " + "=" * 60,
+            "\n📊 TOP 5 DES MARCHÉS LES PLUS FIABLES:",
+            "-" * 60,
+        ]
+
+        all_markets = pred.get('all_markets', {})
+        top = sorted(all_markets.items(), key=lambda x: x[1]['confidence'], reverse=True)[:5]
+        for i, (market, data) in enumerate(top, 1):
+            lines.append(f"   {i}. {_confidence_icon(data['confidence'])} {market:<25} → "
+                         f"{data['prediction']:<20} ({data['confidence'] * 100:.1f}%)")
+
+        lines.extend(["\n⚽ PRÉDICTIONS DE BUTS EXACTS:", "-" * 60])
+        teams = pred['match'].split(' vs ')
+        for market, icon, team in (('EXACT_GOALS_HOME', "🏠", teams[0]), ('EXACT_GOALS_AWAY', "✈️", teams[-1])):
+            goals = all_markets.get(market)
+            if goals is None:
+                continue
+            lines.append(f"   {icon} {team}:")
+            lines.append(f"      → {goals['prediction']} ({goals['confidence'] * 100:.0f}%)")
+            if 'distribution' in goals:
+                dist = " | ".join(f"{k}b:{v * 100:.0f}%" for k, v in goals['distribution'].items() if v > 0.1)
+                lines.append(f"      📈 Distribution: {dist}")
+
+        lines.extend(["\n⏱️ PRÉDICTIONS MI-TEMPS / FIN DE MATCH:", "-" * 60])
+        for market, label, display in GOAL_LINES:
+            data = all_markets.get(market)
+            if data is not None:
+                prediction = display(data['prediction']) if display else data['prediction']
+                lines.append(f"{label}: {prediction} ({data['confidence'] * 100:.0f}%)")
+
+        lines.append(f"\n💭 {pred['reasoning']}")
+        lines.append(f"⏱️ Temps d'analyse: {pred['execution_time_ms']}ms")
+        return lines
+
+    @staticmethod
+    def summary_lines(predictions: List[Dict[str, Any]]) -> List[str]:
+        """Résumé du cycle (modes 'summary' et 'full')"""
+        risks = {'low': 0, 'medium': 0, 'high': 0}
+        for pred in predictions:
+            if pred['risk_level'] in risks:
+                risks[pred['risk_level']] += 1
+
+        lines = [
+            "\n" + "=" * 70,
+            "📊 RÉSUMÉ GÉNÉRAL DES PRÉDICTIONS",
+            "=" * 70,
+            f"✅ Fortes confiances (Risque faible): {risks['low']}",
+            f"⚠️ Confiances modérées (Risque moyen): {risks['medium']}",
+            f"❌ À éviter (Risque élevé): {risks['high']}",
+        ]
+
+        if predictions:
+            lines.extend(["\n🏆 TOP 3 MEILLEURES OPPORTUNITÉS DU JOUR", "-" * 70])
+            for i, pred in enumerate(sorted(predictions, key=lambda x: x['final_confidence'], reverse=True)[:3], 1):
+                lines.extend([
+                    f"\n   {i}. {pred['match']}",
+                    f"      🎯 Marché: {pred['best_market']}",
+                    f"      📊 Prédiction: {pred['final_prediction']}",
+                    f"      🎯 Confiance: {pred['final_confidence'] * 100:.1f}%",
+                    f"      💡 {pred['recommendation']}",
+                ])
+
+        storage = storage_stats()
+        lines.append(f"\n🔌 Stockage ({storage['backend']}): {storage['clients_created']} client(s), "
+                     f"{storage['connections_opened']} connexion(s) ouvertes pour {storage['requests']} requêtes "
+                     f"({storage['retries']} relances, {storage['errors']} erreurs)")
+        lines.append("\n" + "=" * 70)
+        return lines
@@ -1,74 +1,203 @@
 #!/usr/bin/env python3
 """🎯 Eros Bot - Predictor Interface (Multi-Marchés Complets)"""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
-from pathlib import Path
-import sys
+from time import perf_counter_ns
 import os
 
-# ============================================
-# 🚨 FIX IMPORT - ACODE ANDROID
-# ============================================
-sys.path.insert(0, '/sdcard/Eros_bot_app')
-
-# Charger les variables d'environnement
-try:
-    from dotenv import load_dotenv
-    for env_path in [
-        Path('/sdcard/Eros_bot_app/backend/.env'),
-        Path('/sdcard/Eros_bot_app/.env'),
-    ]:
-        if env_path.exists():
-            load_dotenv(dotenv_path=env_path)
-            print(f"✅ .env chargé: {env_path}")
-            break
-except ImportError:
-    print("⚠️ python-dotenv non installé (optionnel)")
-# ============================================
-
 # Import du Meta Orchestrator
 from backend.app.ai_engine.agents.meta_orchestrator import MetaOrchestratorAgent
+from backend.app.ai_engine.prediction_cache import PredictionCache
+from backend.app.ai_engine.prediction_report import PredictionRenderer
+from backend.app.services import metrics
+from backend.app.services.prediction_writer import PredictionWriter
+from backend.app.services.supabase_client import get_supabase_client, load_environment
 
-# Import Supabase (optionnel)
-try:
-    from supabase import create_client
-    SUPABASE_AVAILABLE = True
-except ImportError:
-    SUPABASE_AVAILABLE = False
-    print("⚠️ Supabase non disponible (pip install supabase)")
+# Client pas encore demandé (None = demandé mais indisponible)
+_UNSET = object()
+
+PREDICT = metrics.stage('predict')
+FETCH = metrics.stage('fetch')
+
+
+# Matchs fictifs utilisés quand Supabase n'a rien à proposer
+DEMO_MATCHES = [
+    {'home_team': 'PSG', 'away_team': 'Marseille', 'league': 'Ligue 1'},
+    {'home_team': 'Real Madrid', 'away_team': 'Barcelona', 'league': 'La Liga'},
+    {'home_team': 'Bayern Munich', 'away_team': 'Dortmund', 'league': 'Bundesliga'},
+    {'home_team': 'Manchester City', 'away_team': 'Liverpool', 'league': 'Premier League'},
+    {'home_team': 'Juventus', 'away_team': 'AC Milan', 'league': 'Serie A'},
+]
 
 
 class ErosPredictor:
     """Interface principale pour générer des prédictions multi-marchés."""
     
-    def __init__(self):
-        """Initialise le Meta-Orchestrator et Supabase"""
-        print("🧠 Initialisation de ErosPredictor...")
+    def __init__(self, cache: PredictionCache = None, render: Optional[str] = None, stream=None):
+        """
+        Initialise le Meta-Orchestrator (Supabase et poids des IA chargés à la première utilisation)
+        cache: cache de prédictions (par défaut en mémoire, persisté si EROS_PREDICTION_CACHE
+        donne un chemin de fichier; EROS_PREDICTION_CACHE_TTL=0 le désactive)
+        render: affichage de predict_today_matches(), 'full' (défaut, ou EROS_RENDER), 'summary',
+        'jsonl' ou 'none'; stream: flux du rapport (stdout par défaut)
+        """
+        self.renderer = PredictionRenderer(render, stream)
+        if self.renderer.verbose:
+            print("🧠 Initialisation de ErosPredictor...")
+        load_environment()
         
         self.meta_agent = MetaOrchestratorAgent(weight=1.5)
-        print("✅ Meta-Orchestrator prêt")
-        
-        self.supabase = None
-        if SUPABASE_AVAILABLE:
-            try:
-                supa_url = os.getenv("SUPABASE_URL")
-                supa_key = os.getenv("SUPABASE_KEY")
-                if supa_url and supa_key:
-                    self.supabase = create_client(supa_url, supa_key)
-                    print("✅ Supabase connecté")
-            except Exception as e:
-                print(f"⚠️ Supabase non connecté: {e}")
+        self.feature_store = self.meta_agent.feature_store
+        if self.renderer.verbose:
+            print("✅ Meta-Orchestrator prêt")
+        
+        if cache is None:
+            ttl = float(os.getenv("EROS_PREDICTION_CACHE_TTL", str(6 * 3600)))
+            if ttl > 0:
+                cache = PredictionCache(
+                    max_entries=int(os.getenv("EROS_PREDICTION_CACHE_SIZE", "4096")),
+                    ttl=ttl,
+                    path=os.getenv("EROS_PREDICTION_CACHE") or None
+                )
+        self.cache = cache
+        
+        self.writer = None
+        self._supabase = _UNSET
     
-    def predict_match(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
-        """✅ LIGNE 65 CORRIGÉE : match_data: Dict[str, Any]"""
-        start_time = datetime.now()
-        
-        result = self.meta_agent.predict(match_data)
-        
-        execution_time = (datetime.now() - start_time).total_seconds()
-        
-        prediction = {
+    @property
+    def supabase(self):
+        """Client de stockage partagé du processus, créé au premier accès"""
+        if self._supabase is _UNSET:
+            self._supabase = get_supabase_client()
+        return self._supabase
+    
+    @supabase.setter
+    def supabase(self, client):
+        self._supabase = client
+    
+    def refresh_weights(self) -> bool:
+        """Applique les poids ré-entraînés par un autre processus (voir MetaOrchestratorAgent.refresh_weights)"""
+        return self.meta_agent.refresh_weights()
+    
+    def predict_match(self, match_data: Dict[str, Any], markets: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Prédit un match
+        markets: marchés à évaluer (ex: ['1N2', 'DOUBLE_CHANCE']); seules les IA et les
+        caractéristiques nécessaires à ces marchés sont calculées. None = tous les marchés.
+        Lève ValueError pour un marché inconnu.
+        """
+        start = perf_counter_ns()
+        
+        result = self._cached_predict([match_data], markets)[0]
+        
+        elapsed = perf_counter_ns() - start
+        PREDICT.record(elapsed)
+        if result.get('error'):
+            PREDICT.error()
+        
+        return self._format_prediction(match_data, result, elapsed / 1e9)
+    
+    def predict_many(self, matches, markets: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Prédit un lot de matchs (liste de dicts ou DataFrame) en une passe vectorisée
+        Mêmes prédictions que predict_match() sur chaque match; execution_time_ms est
+        le temps du lot réparti sur ses matchs. markets: comme predict_match().
+        """
+        if hasattr(matches, 'to_dict'):
+            matches = matches.to_dict('records')
+        matches = list(matches)
+        if not matches:
+            return []
+        
+        start = perf_counter_ns()
+        results = self._cached_predict(matches, markets)
+        elapsed = perf_counter_ns() - start
+        PREDICT.record(elapsed, len(matches))
+        errors = sum(1 for result in results if result.get('error'))
+        if errors:
+            PREDICT.error(errors)
+        execution_time = elapsed / 1e9 / len(matches)
+        
+        return [self._format_prediction(match_data, result, execution_time)
+                for match_data, result in zip(matches, results)]
+    
+    def select_markets(self, predictions: List[Dict[str, Any]], markets: List[str]) -> List[Dict[str, Any]]:
+        """
+        Restreint des prédictions déjà calculées sur tous les marchés à `markets`, sans relancer
+        les IA: le consensus d'un marché ne dépend que des IA qui le produisent, seul le meilleur
+        marché (et son risque) est choisi à nouveau parmi la sélection.
+        Mêmes prédictions que predict_many(matches, markets). Lève ValueError pour un marché inconnu.
+        """
+        plan = self.meta_agent.plan(markets)
+        selected = []
+        for pred in predictions:
+            all_markets = {name: data for name, data in pred.get('all_markets', {}).items() if name in plan.markets}
+            if not all_markets:
+                # Aucune IA de la sélection n'avait répondu: même réponse que le calcul restreint
+                selected.append(dict(pred, best_market='Unknown', final_prediction='ERROR', final_confidence=0.0,
+                                     risk_level='unknown', recommendation='', all_markets={},
+                                     reasoning="Erreur: Aucune IA n'a répondu à temps"))
+                continue
+            best = max(all_markets, key=lambda name: all_markets[name]['confidence'])
+            best_data = all_markets[best]
+            risk_level, recommendation = self.meta_agent.assess_risk(best_data['confidence'])
+            details = pred.get('details', {})
+            agents_used = [name for name in details.get('agents_used', []) if name in plan.agents]
+            selected.append(dict(
+                pred,
+                best_market=best,
+                final_prediction=best_data['prediction'],
+                final_confidence=best_data['confidence'],
+                risk_level=risk_level,
+                recommendation=recommendation,
+                reasoning=f"Meilleur marché: {best}. {best_data['prediction']} ({best_data['confidence'] * 100:.1f}%). "
+                          f"{len(all_markets)} marchés analysés par {len(agents_used)} IA.",
+                all_markets=all_markets,
+                agent_votes={agent: {name: vote for name, vote in votes.items() if name in plan.markets}
+                             for agent, votes in pred.get('agent_votes', {}).items() if agent in plan.agents},
+                details=dict(details, agents_used=agents_used, markets_analyzed=len(all_markets), best_market=best,
+                             agent_latencies_ms={name: ms for name, ms in details.get('agent_latencies_ms', {}).items()
+                                                 if name in plan.agents})
+            ))
+        return selected
+    
+    def _cached_predict(self, matches: List[Dict[str, Any]],
+                        markets: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Résultats du Meta-Orchestrator, servis depuis le cache quand le match et les poids n'ont pas changé"""
+        # Plan validé ici: un marché inconnu lève ValueError au lieu d'une prédiction ERROR
+        markets = self.meta_agent.plan(markets).markets
+        if self.cache is None:
+            if len(matches) == 1:
+                return [self.meta_agent.predict(matches[0], markets)]
+            return self.meta_agent.predict_many(matches, markets)
+        
+        version = self.meta_agent.weights_version
+        results = [None] * len(matches)
+        keys = [None] * len(matches)
+        missing = []
+        for i, match_data in enumerate(matches):
+            if self.cache.is_cacheable(match_data):
+                keys[i] = self.cache.fingerprint(match_data, self.feature_store, markets)
+                results[i] = self.cache.get(keys[i], version)
+            if results[i] is None:
+                missing.append(i)
+        
+        if missing:
+            if len(missing) == 1:
+                computed = [self.meta_agent.predict(matches[missing[0]], markets)]
+            else:
+                computed = self.meta_agent.predict_many([matches[i] for i in missing], markets)
+            for i, result in zip(missing, computed):
+                results[i] = result
+                if keys[i] is not None:
+                    self.cache.put(keys[i], version, result)
+        return results
+    
+    def _format_prediction(self, match_data: Dict[str, Any], result: Dict[str, Any],
+                           execution_time: float) -> Dict[str, Any]:
+        return {
+            'match_id': match_data.get('match_id_api'),
             'match': f"{match_data.get('home_team', '?')} vs {match_data.get('away_team', '?')}",
             'league': match_data.get('league', 'Unknown'),
             'match_date': match_data.get('match_date', 'Unknown'),
@@ -79,241 +208,121 @@ class ErosPredictor:
             'recommendation': result.get('recommendation', ''),
             'reasoning': result['reasoning'],
             'all_markets': result.get('all_markets', {}),
+            'agent_votes': result.get('agent_votes', {}),
             'details': result.get('details', {}),
             'execution_time_ms': round(execution_time * 1000, 2),
             'timestamp': datetime.now().isoformat()
         }
-        
-        return prediction
     
-    def predict_today_matches(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Génère des prédictions pour les matchs d'aujourd'hui."""
-        print("\n" + "=" * 70)
-        print("🎯 EROS BOT - PRÉDICTIONS DU JOUR (MULTI-MARCHÉS)")
-        print("=" * 70)
-        print(f"📅 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"🤖 IA Actives: 4 (Statisticien, Forme, TimeSeries, Context)")
-        print(f"📊 Marchés Analysés: 10+ (1N2, Buts, HT/FT, Corners, etc.)")
-        print("=" * 70)
-        
+    def get_today_matches(self, limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """
+        Matchs du jour depuis Supabase, avec mise à jour incrémentale du feature store
+        Retourne None si Supabase est indisponible ou en erreur.
+        """
         if not self.supabase:
-            print("⚠️ Supabase non connecté → Mode démo avec matchs fictifs")
-            return self._demo_predictions(limit)
+            return None
         
         today = datetime.now().strftime('%Y-%m-%d')
+        start = FETCH.start()
         try:
             result = self.supabase.table('matches').select('*').gte('match_date', today).lte('match_date', today + 'T23:59:59').limit(limit).execute()
+            FETCH.stop(start)
             
             matches = result.data if hasattr(result, 'data') else []
-            
             if not matches:
-                print(f"ℹ️ Aucun match trouvé pour {today}")
-                return self._demo_predictions(limit)
+                return []
             
-            print(f"📊 {len(matches)} matchs trouvés en base\n")
+            if self.renderer.verbose:
+                print(f"📊 {len(matches)} matchs trouvés en base\n")
             
+            # Une mise à jour incrémentale du feature store par cycle (nouveaux résultats seulement)
+            added = self.feature_store.refresh(self.supabase)
+            if self.renderer.verbose:
+                print(f"📇 Feature store: {added} nouveaux résultats, {len(self.feature_store)} équipes\n")
+            return matches
+        
         except Exception as e:
+            FETCH.error()
             print(f"⚠️ Erreur Supabase: {e}")
-            matches = []
-        
-        predictions = []
-        for i, match in enumerate(matches, 1):
-            print(f"\n{'='*70}")
-            print(f"[{i}/{len(matches)}] 🔍 Analyse: {match.get('home_team')} vs {match.get('away_team')}")
-            print(f"{'='*70}")
-            
-            pred = self.predict_match(match)
-            predictions.append(pred)
-            
-            self._display_prediction(pred)
-        
-        if self.supabase and predictions:
-            self._save_predictions(predictions)
-        
-        self._display_summary(predictions)
-        
-        return predictions
+            return None
     
-    def _display_prediction(self, pred: Dict[str, Any]):
-        """Affiche une prédiction de manière détaillée et lisible."""
-        
-        print("\n🏆 " + "=" * 60)
-        print(f"   🎯 MEILLEUR MARCHÉ: {pred['best_market']}")
-        print(f"   📊 PRÉDICTION: {pred['final_prediction']}")
-        print(f"   🎯 CONFIANCE: {pred['final_confidence']*100:.1f}%")
-        
-        risk_icon = {"low": "✅", "medium": "⚠️", "high": "❌"}.get(pred['risk_level'], "⚪")
-        print(f"   {risk_icon} RISQUE: {pred['risk_level'].upper()}")
-        print(f"   💡 {pred['recommendation']}")
-        print("🏆 " + "=" * 60)
+    def predict_today_matches(self, limit: int = 10, render: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Génère des prédictions pour les matchs d'aujourd'hui
+        Le rapport est formaté une fois, après le calcul (voir prediction_report);
+        render: mode d'affichage de cet appel à la place de celui du prédicteur.
+        """
+        renderer = self.renderer if render is None else PredictionRenderer(render, self.renderer.stream)
+        renderer.begin()
         
-        print("\n📊 TOP 5 DES MARCHÉS LES PLUS FIABLES:")
-        print("-" * 60)
-        
-        all_markets = pred.get('all_markets', {})
-        if all_markets:
-            sorted_markets = sorted(all_markets.items(), key=lambda x: x[1]['confidence'], reverse=True)
-            
-            for i, (market, data) in enumerate(sorted_markets[:5], 1):
-                if data['confidence'] >= 0.75:
-                    icon = "🏆"
-                elif data['confidence'] >= 0.65:
-                    icon = "✅"
-                elif data['confidence'] >= 0.55:
-                    icon = "⚠️"
-                else:
-                    icon = "⚪"
-                
-                print(f"   {i}. {icon} {market:<25} → {data['prediction']:<20} ({data['confidence']*100:.1f}%)")
-        
-        print("\n⚽ PRÉDICTIONS DE BUTS EXACTS:")
-        print("-" * 60)
-        
-        if 'EXACT_GOALS_HOME' in all_markets:
-            home_goals = all_markets['EXACT_GOALS_HOME']
-            print(f"   🏠 {pred['match'].split(' vs ')[0]}:")
-            print(f"      → {home_goals['prediction']} ({home_goals['confidence']*100:.0f}%)")
-            if 'distribution' in home_goals:
-                dist = home_goals['distribution']
-                dist_str = " | ".join([f"{k}b:{v*100:.0f}%" for k, v in dist.items() if v > 0.1])
-                print(f"      📈 Distribution: {dist_str}")
-        
-        if 'EXACT_GOALS_AWAY' in all_markets:
-            away_goals = all_markets['EXACT_GOALS_AWAY']
-            print(f"   ✈️ {pred['match'].split(' vs ')[1]}:")
-            print(f"      → {away_goals['prediction']} ({away_goals['confidence']*100:.0f}%)")
-            if 'distribution' in away_goals:
-                dist = away_goals['distribution']
-                dist_str = " | ".join([f"{k}b:{v*100:.0f}%" for k, v in dist.items() if v > 0.1])
-                print(f"      📈 Distribution: {dist_str}")
-        
-        print("\n⏱️ PRÉDICTIONS MI-TEMPS / FIN DE MATCH:")
-        print("-" * 60)
-        
-        if 'HT_FT' in all_markets:
-            ht_ft = all_markets['HT_FT']
-            ht_ft_display = ht_ft['prediction'].replace('_', '/')
-            print(f"   🔄 HT/FT: {ht_ft_display} ({ht_ft['confidence']*100:.0f}%)")
-        
-        if 'OVER_UNDER_HT' in all_markets:
-            ht_goals = all_markets['OVER_UNDER_HT']
-            print(f"   ⏱️ Buts 1ère MT: {ht_goals['prediction']} ({ht_goals['confidence']*100:.0f}%)")
-        
-        if 'OVER_UNDER_1.5' in all_markets:
-            over_15 = all_markets['OVER_UNDER_1.5']
-            print(f"   📊 Over/Under 1.5: {over_15['prediction']} ({over_15['confidence']*100:.0f}%)")
-        
-        if 'OVER_UNDER_2.5' in all_markets:
-            over_25 = all_markets['OVER_UNDER_2.5']
-            print(f"   📊 Over/Under 2.5: {over_25['prediction']} ({over_25['confidence']*100:.0f}%)")
-        
-        if 'OVER_UNDER_3.5' in all_markets:
-            over_35 = all_markets['OVER_UNDER_3.5']
-            print(f"   📊 Over/Under 3.5: {over_35['prediction']} ({over_35['confidence']*100:.0f}%)")
+        if not self.supabase:
+            if renderer.verbose:
+                print("⚠️ Supabase non connecté → Mode démo avec matchs fictifs")
+            return self._demo_predictions(limit, renderer)
         
-        if 'BTTS' in all_markets:
-            btts = all_markets['BTTS']
-            btts_display = btts['prediction'].replace('BTTS_', '')
-            print(f"   ✅ Les 2 équipes marquent: {btts_display} ({btts['confidence']*100:.0f}%)")
+        matches = self.get_today_matches(limit)
+        if matches is None:
+            matches = []
+        elif not matches:
+            if renderer.verbose:
+                print(f"ℹ️ Aucun match trouvé pour {datetime.now().strftime('%Y-%m-%d')}")
+            return self._demo_predictions(limit, renderer)
         
-        if 'DOUBLE_CHANCE' in all_markets:
-            dc = all_markets['DOUBLE_CHANCE']
-            print(f"   🛡️ Double Chance: {dc['prediction']} ({dc['confidence']*100:.0f}%)")
+        predictions = self.predict_many(matches)
         
-        if 'CORNERS' in all_markets:
-            corners = all_markets['CORNERS']
-            print(f"   🚩 Corners: {corners['prediction']} ({corners['confidence']*100:.0f}%)")
+        if self.supabase and predictions:
+            # Écriture en tâche de fond: l'affichage n'attend pas la base (le processus
+            # attend la fin du thread d'écriture avant de se terminer)
+            self._save_predictions(predictions, wait=False, verbose=renderer.verbose)
+        if self.cache is not None:
+            self.cache.save()
         
-        if 'CARDS' in all_markets:
-            cards = all_markets['CARDS']
-            print(f"   🟨 Cartons: {cards['prediction']} ({cards['confidence']*100:.0f}%)")
+        renderer.render(predictions)
         
-        print(f"\n💭 {pred['reasoning']}")
-        print(f"⏱️ Temps d'analyse: {pred['execution_time_ms']}ms")
+        return predictions
     
-    def _demo_predictions(self, limit: int = 5) -> List[Dict[str, Any]]:
+    def _demo_predictions(self, limit: int = 5, renderer: Optional[PredictionRenderer] = None) -> List[Dict[str, Any]]:
         """Génère des prédictions démo si pas de matchs en base."""
-        print("\n⚠️ MODE DÉMO (aucun match en base)\n")
-        
-        demo_matches = [
-            {'home_team': 'PSG', 'away_team': 'Marseille', 'league': 'Ligue 1'},
-            {'home_team': 'Real Madrid', 'away_team': 'Barcelona', 'league': 'La Liga'},
-            {'home_team': 'Bayern Munich', 'away_team': 'Dortmund', 'league': 'Bundesliga'},
-            {'home_team': 'Manchester City', 'away_team': 'Liverpool', 'league': 'Premier League'},
-            {'home_team': 'Juventus', 'away_team': 'AC Milan', 'league': 'Serie A'},
-        ]
-        
-        predictions = []
-        for match in demo_matches[:limit]:
-            pred = self.predict_match(match)
-            predictions.append(pred)
-            
-            self._display_prediction(pred)
-            print("\n" + "=" * 70)
-        
+        predictions = self.predict_many(DEMO_MATCHES[:limit])
+        (renderer or self.renderer).render(predictions, demo=True)
         return predictions
     
-    def _save_predictions(self, predictions: List[Dict[str, Any]]):
-        """Sauvegarde les prédictions dans Supabase."""
-        try:
-            for pred in predictions:
-                data = {
-                    'match_id': pred.get('match'),
-                    'league': pred.get('league'),
-                    'best_market': pred.get('best_market'),
-                    'prediction_type': pred['final_prediction'],
-                    'confidence_score': pred['final_confidence'],
-                    'risk_level': pred.get('risk_level'),
-                    'status': 'pending',
-                    'created_at': datetime.now().isoformat()
-                }
-                self.supabase.table('predictions').insert(data).execute()
-            print(f"\n✅ {len(predictions)} prédictions sauvegardées dans Supabase")
-        except Exception as e:
-            print(f"\n⚠️ Erreur sauvegarde: {e}")
-    
-    def _display_summary(self, predictions: List[Dict[str, Any]]):
-        """Affiche le résumé final des prédictions."""
-        print("\n" + "=" * 70)
-        print("📊 RÉSUMÉ GÉNÉRAL DES PRÉDICTIONS")
-        print("=" * 70)
-        
-        strong_bets = [p for p in predictions if p['risk_level'] == 'low']
-        medium_bets = [p for p in predictions if p['risk_level'] == 'medium']
-        risky_bets = [p for p in predictions if p['risk_level'] == 'high']
-        
-        print(f"✅ Fortes confiances (Risque faible): {len(strong_bets)}")
-        print(f"⚠️ Confiances modérées (Risque moyen): {len(medium_bets)}")
-        print(f"❌ À éviter (Risque élevé): {len(risky_bets)}")
-        
-        if predictions:
-            print("\n🏆 TOP 3 MEILLEURES OPPORTUNITÉS DU JOUR")
-            print("-" * 70)
-            
-            sorted_preds = sorted(predictions, key=lambda x: x['final_confidence'], reverse=True)
-            for i, pred in enumerate(sorted_preds[:3], 1):
-                print(f"\n   {i}. {pred['match']}")
-                print(f"      🎯 Marché: {pred['best_market']}")
-                print(f"      📊 Prédiction: {pred['final_prediction']}")
-                print(f"      🎯 Confiance: {pred['final_confidence']*100:.1f}%")
-                print(f"      💡 {pred['recommendation']}")
-        
-        print("\n" + "=" * 70)
+    def _save_predictions(self, predictions: List[Dict[str, Any]], wait: bool = True, verbose: bool = True):
+        """
+        Sauvegarde les prédictions dans Supabase (meilleur marché, consensus par marché et
+        votes de chaque IA) en upserts par lots. wait=False: écriture en tâche de fond;
+        verbose=False: pas de résumé de l'écriture sur stdout.
+        """
+        if self.writer is None:
+            self.writer = PredictionWriter(self.supabase)
+        if wait:
+            return self.writer.save(predictions, verbose)
+        return self.writer.save_async(predictions, verbose)
 
 
 # ============================================
 # 🧪 TEST PRINCIPAL
 # ============================================
 if __name__ == "__main__":
-    print("=" * 70)
-    print("🎯 EROS BOT - PREDICTOR INTERFACE (MULTI-MARCHÉS)")
-    print("=" * 70)
-    print(f"📅 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print()
+    import logging
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    
+    # --render=summary|full|jsonl|none (sinon EROS_RENDER, 'full' par défaut)
+    render = next((arg.split('=', 1)[1] for arg in sys.argv[1:] if arg.startswith('--render=')), None)
+    predictor = ErosPredictor(render=render)
+    verbose = predictor.renderer.verbose
+    
+    if verbose:
+        print("=" * 70)
+        print("🎯 EROS BOT - PREDICTOR INTERFACE (MULTI-MARCHÉS)")
+        print("=" * 70)
+        print(f"📅 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print()
     
-    predictor = ErosPredictor()
     predictions = predictor.predict_today_matches(limit=5)
     
-    print("\n" + "=" * 70)
-    print("✅ EROS BOT - TEST TERMINÉ")
-    print("=" * 70)
+    if verbose:
+        print("\n" + "=" * 70)
+        print("✅ EROS BOT - TEST TERMINÉ")
+        print("=" * 70)
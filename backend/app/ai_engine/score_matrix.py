@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+🎲 Eros Bot - Score Matrix Engine
+Distribution jointe des buts domicile × extérieur (Poisson indépendants), calculée
+une fois par match et en lot sur plusieurs matchs (produit extérieur NumPy).
+Tous les marchés de buts en découlent exactement: 1N2, double chance, over/under,
+BTTS, buts exacts, score exact et mi-temps / fin de match.
+
+Usage:
+    sm = ScoreMatrix(home_xg=[1.6, 0.9], away_xg=[1.1, 1.4])
+    sm.outcome_probs()          # (n, 3) victoire domicile / nul / victoire extérieur
+    sm.over_under([1.5, 2.5])   # (n, 2) probabilité du over
+"""
+
+from typing import Iterable, Tuple
+import math
+
+import numpy as np
+
+DEFAULT_MAX_GOALS = 10
+# Part des buts marqués en 1ère mi-temps (même hypothèse que l'ancien OVER_UNDER_HT)
+HALF_TIME_SHARE = 0.45
+OVER_UNDER_LINES = (0.5, 1.5, 2.5, 3.5, 4.5)
+OUTCOMES = ('HOME', 'DRAW', 'AWAY')
+_UNIQUE_THRESHOLD = 64
+
+
+def _exp_neg(values: np.ndarray) -> np.ndarray:
+    """
+    exp(-x) via math.exp: np.exp peut différer d'un ulp selon la taille du tableau
+    (boucles SIMD), or un match doit donner le même résultat seul ou dans un lot.
+    Sur les gros lots, un seul appel par valeur distincte.
+    """
+    if len(values) <= _UNIQUE_THRESHOLD:
+        return np.fromiter((math.exp(-v) for v in values.tolist()), dtype=float, count=len(values))
+    unique, inverse = np.unique(values, return_inverse=True)
+    return np.array([math.exp(-v) for v in unique.tolist()])[inverse].reshape(values.shape)
+
+
+def _shift_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    (n, G + 1, G + 1) → (n, G + 1, 2G + 1): la ligne i est décalée de i colonnes
+    (somme sur l'axe 1 = somme des diagonales, sans boucle Python)
+    """
+    n, rows, cols = matrix.shape
+    padded = np.zeros((n, rows, cols + rows))
+    padded[:, :, :cols] = matrix
+    return padded.reshape(n, -1)[:, :rows * (cols + rows - 1)].reshape(n, rows, cols + rows - 1)
+
+
+def poisson_pmf(lam, max_goals: int = DEFAULT_MAX_GOALS) -> np.ndarray:
+    """
+    Loi de Poisson tronquée, shape (n, max_goals + 1)
+    La dernière case porte toute la queue P(X >= max_goals): chaque ligne somme à 1.
+    """
+    lam = np.atleast_1d(np.asarray(lam, dtype=float))
+    ratios = np.ones((len(lam), max_goals + 1))
+    ratios[:, 1:] = lam[:, None] / np.arange(1, max_goals + 1)
+    # p(k) = e^-λ × λ/1 × λ/2 × ... × λ/k
+    pmf = _exp_neg(lam)[:, None] * np.cumprod(ratios, axis=1)
+    pmf[:, max_goals] = np.maximum(0.0, 1.0 - np.cumsum(pmf[:, :max_goals], axis=1)[:, -1])
+    return pmf
+
+
+class ScoreMatrix:
+    """Matrices de scores de n matchs: matrix[m, i, j] = P(domicile i buts, extérieur j buts)"""
+
+    def __init__(self, home_xg, away_xg, max_goals: int = DEFAULT_MAX_GOALS):
+        self.home_xg = np.atleast_1d(np.asarray(home_xg, dtype=float))
+        self.away_xg = np.atleast_1d(np.asarray(away_xg, dtype=float))
+        self.max_goals = max_goals
+        self.home_pmf = poisson_pmf(self.home_xg, max_goals)
+        self.away_pmf = poisson_pmf(self.away_xg, max_goals)
+        self.matrix = self.home_pmf[:, :, None] * self.away_pmf[:, None, :]
+        self._difference = None
+        self._totals = None
+        self._halves = {}
+
+    def __len__(self) -> int:
+        return len(self.home_xg)
+
+    # ---------- Distributions dérivées ----------
+
+    def goal_difference(self) -> np.ndarray:
+        """P(domicile - extérieur = d), shape (n, 2G + 1), indice d + G"""
+        if self._difference is None:
+            # Colonnes inversées: la case (i, j) tombe à l'indice i + (G - j)
+            self._difference = _shift_rows(self.matrix[:, :, ::-1]).sum(axis=1)
+        return self._difference
+
+    def total_goals(self) -> np.ndarray:
+        """P(total = t), shape (n, 2G + 1)"""
+        if self._totals is None:
+            self._totals = _shift_rows(self.matrix).sum(axis=1)
+        return self._totals
+
+    # ---------- Marchés ----------
+
+    def outcome_probs(self) -> np.ndarray:
+        """(n, 3): victoire domicile, nul, victoire extérieur"""
+        g = self.max_goals
+        cdf = np.cumsum(self.goal_difference(), axis=1)
+        away = cdf[:, g - 1]
+        draw = self.goal_difference()[:, g]
+        return np.stack([1.0 - cdf[:, g], draw, away], axis=1)
+
+    def double_chance(self) -> np.ndarray:
+        """(n, 3): 1N, 12, N2"""
+        home, draw, away = self.outcome_probs().T
+        return np.stack([home + draw, home + away, draw + away], axis=1)
+
+    def over_under(self, lines: Iterable[float] = OVER_UNDER_LINES) -> np.ndarray:
+        """(n, len(lines)): probabilité de dépasser chaque ligne (x.5)"""
+        cdf = np.cumsum(self.total_goals(), axis=1)
+        return np.stack([1.0 - cdf[:, int(math.floor(line))] for line in lines], axis=1)
+
+    def btts(self) -> np.ndarray:
+        """(n,): les deux équipes marquent"""
+        return 1.0 - self.home_pmf[:, 0] - self.away_pmf[:, 0] + self.matrix[:, 0, 0]
+
+    def exact_goals(self, side: str = 'home') -> np.ndarray:
+        """(n, G + 1): distribution des buts d'une équipe ('home' ou 'away')"""
+        return self.home_pmf if side == 'home' else self.away_pmf
+
+    def correct_score(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Score exact le plus probable: (buts domicile, buts extérieur, probabilité)"""
+        flat = self.matrix.reshape(len(self), -1)
+        best = flat.argmax(axis=1)
+        home_goals, away_goals = np.divmod(best, self.max_goals + 1)
+        return home_goals, away_goals, flat[np.arange(len(self)), best]
+
+    def half_time(self, share: float = HALF_TIME_SHARE) -> 'ScoreMatrix':
+        """Matrice de la 1ère mi-temps (xG × share)"""
+        return self._half(share)
+
+    def _half(self, share: float) -> 'ScoreMatrix':
+        if share not in self._halves:
+            self._halves[share] = ScoreMatrix(self.home_xg * share, self.away_xg * share, self.max_goals)
+        return self._halves[share]
+
+    def ht_ft(self, share: float = HALF_TIME_SHARE) -> np.ndarray:
+        """
+        (n, 3, 3): P(résultat mi-temps, résultat final), ordre OUTCOMES
+        Écart final = écart 1ère MT + écart 2e MT (deux mi-temps indépendantes).
+        """
+        g = self.max_goals
+        first = self._half(share).goal_difference()
+        second = self._half(1 - share).goal_difference()
+        # Pour un écart d1 à la mi-temps (indice d1 + G), la 2e MT doit faire d2 = -d1
+        # (indice G - d1): colonnes inversées
+        reversed_cdf = np.cumsum(second, axis=1)[:, ::-1]
+        ft_home = 1.0 - reversed_cdf
+        ft_draw = second[:, ::-1]
+        ft_away = np.zeros_like(second)
+        ft_away[:, :-1] = reversed_cdf[:, 1:]
+
+        result = np.empty((len(self), 3, 3))
+        for ht, columns in enumerate((slice(g + 1, None), slice(g, g + 1), slice(None, g))):
+            p1 = first[:, columns]
+            for ft, p2 in enumerate((ft_home, ft_draw, ft_away)):
+                result[:, ht, ft] = (p1 * p2[:, columns]).sum(axis=1)
+        return result
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+📇 Eros Bot - Team Feature Store
+Table compacte des caractéristiques d'équipe, indexée par un id entier (nom interné).
+Chaque équipe est calculée une fois (plus de sum(ord(c)) à chaque appel d'IA),
+puis mise à jour de façon incrémentale à partir des résultats de la table `matches`.
+
+Usage:
+    store = get_team_feature_store()
+    store.refresh(supabase)                  # une fois par cycle d'ingestion
+    features = store.lookup('PSG')           # O(1)
+    attack = store.column('attack')[ids]     # version tableau pour predict_many
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional
+import threading
+
+import numpy as np
+
+from backend.app.services import metrics
+
+FEATURES = ('attack', 'defence', 'form', 'trend', 'home_perf', 'away_perf')
+
+TeamFeatures = namedtuple('TeamFeatures', ('team_id', 'name_hash') + FEATURES + ('played', 'recent'))
+
+RESULT_LABELS = {3: 'W', 1: 'D', 0: 'L'}
+
+FEATURE_LOOKUP = metrics.stage('feature_lookup')
+
+
+def team_name_hash(name: str) -> int:
+    """Empreinte historique d'une équipe (base des caractéristiques a priori)"""
+    return sum(ord(c) for c in name.lower())
+
+
+def prior_features(name_hash: int) -> Dict[str, float]:
+    """
+    Caractéristiques a priori d'une équipe sans historique
+    (mêmes formules que les IA utilisaient jusqu'ici, prédictions inchangées)
+    """
+    perf = 0.5 + (name_hash % 35 - 17) / 100
+    return {
+        'attack': 0.9 + (name_hash % 40) / 100,
+        'defence': 0.9 + ((name_hash // 2) % 40) / 100,
+        'form': 0.5 + ((name_hash % 30) - 15) / 100,
+        'trend': 0.5 + ((name_hash % 40) - 20) / 100,
+        'home_perf': max(0.3, min(0.9, perf + 0.10)),
+        'away_perf': max(0.2, min(0.8, perf - 0.10))
+    }
+
+
+class TeamFeatureStore:
+    """
+    Caractéristiques d'équipe en colonnes numpy, indexées par id d'équipe
+
+    Les colonnes de FEATURES mélangent l'a priori et les résultats observés:
+    valeur = (k × a priori + n × observé) / (k + n), k = `prior_matches`, n = matchs joués.
+    """
+
+    RECENT_WINDOW = 5
+    PAGE_SIZE = 1000
+    # Marge de relecture: un résultat saisi en retard sur un match déjà passé est rattrapé
+    REFRESH_OVERLAP_DAYS = 3
+
+    def __init__(self, prior_matches: float = 5.0, league_avg_goals: float = 1.4, capacity: int = 256):
+        self.prior_matches = prior_matches
+        self.league_avg_goals = league_avg_goals
+
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._rows: List[TeamFeatures] = []
+        self._lock = threading.RLock()
+
+        self.name_hash = np.zeros(capacity, dtype=np.int64)
+        self._prior = np.zeros((capacity, len(FEATURES)))
+        self._features = np.zeros((capacity, len(FEATURES)))
+        # Résultats observés: joués, buts pour/contre, points, domicile, extérieur
+        self._played = np.zeros(capacity, dtype=np.int32)
+        self._goals_for = np.zeros(capacity, dtype=np.int32)
+        self._goals_against = np.zeros(capacity, dtype=np.int32)
+        self._points = np.zeros(capacity, dtype=np.int32)
+        self._home_played = np.zeros(capacity, dtype=np.int32)
+        self._home_points = np.zeros(capacity, dtype=np.int32)
+        self._away_played = np.zeros(capacity, dtype=np.int32)
+        self._away_points = np.zeros(capacity, dtype=np.int32)
+        # Points des derniers matchs (du plus ancien au plus récent), -1 = pas de match
+        self._recent = np.full((capacity, self.RECENT_WINDOW), -1, dtype=np.int8)
+
+        self._seen_matches = set()
+        self._last_match_date: Optional[str] = None
+        self.refreshes = 0
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    # ---------- Ids d'équipe ----------
+
+    def _grow(self):
+        capacity = 2 * len(self.name_hash)
+        for attr in ('name_hash', '_played', '_goals_for', '_goals_against', '_points',
+                     '_home_played', '_home_points', '_away_played', '_away_points'):
+            old = getattr(self, attr)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, attr, new)
+        for attr in ('_prior', '_features'):
+            old = getattr(self, attr)
+            new = np.zeros((capacity, old.shape[1]))
+            new[:len(old)] = old
+            setattr(self, attr, new)
+        recent = np.full((capacity, self.RECENT_WINDOW), -1, dtype=np.int8)
+        recent[:len(self._recent)] = self._recent
+        self._recent = recent
+
+    def team_id(self, name: str) -> int:
+        """Id de l'équipe (créée avec ses caractéristiques a priori si inconnue)"""
+        team_id = self._ids.get(name)
+        if team_id is not None:
+            return team_id
+        with self._lock:
+            team_id = self._ids.get(name)
+            if team_id is not None:
+                return team_id
+            team_id = len(self._names)
+            if team_id >= len(self.name_hash):
+                self._grow()
+            name_hash = team_name_hash(name)
+            prior = prior_features(name_hash)
+            self.name_hash[team_id] = name_hash
+            self._prior[team_id] = [prior[f] for f in FEATURES]
+            self._features[team_id] = self._prior[team_id]
+            self._names.append(name)
+            self._rows.append(self._make_row(team_id))
+            self._ids[name] = team_id
+            return team_id
+
+    def team_ids(self, names: Iterable[str]) -> np.ndarray:
+        """Ids d'une colonne de noms (un seul passage par nom distinct)"""
+        start = FEATURE_LOOKUP.start()
+        ids = self._ids
+        found = np.fromiter((ids[n] if n in ids else self.team_id(n) for n in names), dtype=np.int64)
+        if len(found):
+            FEATURE_LOOKUP.stop(start, len(found))
+        return found
+
+    def _make_row(self, team_id: int) -> TeamFeatures:
+        recent = tuple(RESULT_LABELS[p] for p in self._recent[team_id].tolist() if p >= 0)
+        return TeamFeatures(team_id, int(self.name_hash[team_id]), *self._features[team_id].tolist(),
+                            int(self._played[team_id]), recent)
+
+    # ---------- Lecture ----------
+
+    def lookup(self, name: str) -> TeamFeatures:
+        """Caractéristiques d'une équipe en O(1) (floats Python, identiques aux colonnes)"""
+        start = FEATURE_LOOKUP.start()
+        row = self._rows[self.team_id(name)]
+        FEATURE_LOOKUP.stop(start)
+        return row
+
+    def column(self, feature: str) -> np.ndarray:
+        """Colonne d'une caractéristique, à indexer par un tableau d'ids"""
+        return self._features[:len(self._names), FEATURES.index(feature)]
+
+    # ---------- Mise à jour ----------
+
+    def update_from_matches(self, matches: Iterable[Dict[str, Any]]) -> int:
+        """
+        Intègre des matchs terminés (lignes de la table `matches`)
+        Les matchs déjà vus sont ignorés; seules les équipes touchées sont recalculées.
+        Retourne le nombre de matchs intégrés.
+        """
+        new_rows, batch_ids = [], set()
+        for row in matches:
+            match_id = row.get('match_id_api') or row.get('id')
+            home_score, away_score = row.get('home_score'), row.get('away_score')
+            if (match_id in self._seen_matches or match_id in batch_ids or home_score is None
+                    or away_score is None or not row.get('home_team') or not row.get('away_team')):
+                continue
+            batch_ids.add(match_id)
+            new_rows.append(row)
+        if not new_rows:
+            return 0
+
+        new_rows.sort(key=lambda r: r.get('match_date') or '')
+        touched = set()
+        with self._lock:
+            for row in new_rows:
+                home_id = self.team_id(row['home_team'])
+                away_id = self.team_id(row['away_team'])
+                home_goals, away_goals = int(row['home_score']), int(row['away_score'])
+                home_points = 3 if home_goals > away_goals else (1 if home_goals == away_goals else 0)
+                away_points = 3 if away_goals > home_goals else (1 if home_goals == away_goals else 0)
+
+                for team_id, scored, conceded, points in ((home_id, home_goals, away_goals, home_points),
+                                                          (away_id, away_goals, home_goals, away_points)):
+                    self._played[team_id] += 1
+                    self._goals_for[team_id] += scored
+                    self._goals_against[team_id] += conceded
+                    self._points[team_id] += points
+                    self._recent[team_id, :-1] = self._recent[team_id, 1:]
+                    self._recent[team_id, -1] = points
+                self._home_played[home_id] += 1
+                self._home_points[home_id] += home_points
+                self._away_played[away_id] += 1
+                self._away_points[away_id] += away_points
+
+                touched.update((home_id, away_id))
+                self._seen_matches.add(row.get('match_id_api') or row.get('id'))
+                match_date = row.get('match_date')
+                if match_date and (self._last_match_date is None or match_date > self._last_match_date):
+                    self._last_match_date = match_date
+
+            self._recompute(np.fromiter(touched, dtype=np.int64))
+        return len(new_rows)
+
+    def _recompute(self, ids: np.ndarray):
+        """Recalcule les caractéristiques des équipes `ids` (sous verrou)"""
+        played = self._played[ids].astype(float)
+        safe_played = np.maximum(played, 1)
+        recent = self._recent[ids]
+        has_recent = recent >= 0
+        recent_count = has_recent.sum(axis=1)
+        recent_points = np.where(has_recent, recent, 0)
+
+        # Forme: points récents pondérés (le plus récent pèse le moins, comme FormDetector)
+        weights = 1.0 + 0.15 * np.arange(self.RECENT_WINDOW)[::-1]
+        form_total = (has_recent * 3 * weights).sum(axis=1)
+        form = np.clip((recent_points * weights).sum(axis=1) / np.maximum(form_total, 1e-9), 0.1, 0.9)
+        # Tendance: points par match récents vs saison
+        recent_ppg = recent_points.sum(axis=1) / np.maximum(recent_count, 1)
+        season_ppg = self._points[ids] / safe_played
+        trend = np.clip(0.5 + (recent_ppg - season_ppg) / 3, 0.2, 0.9)
+
+        observed = np.stack([
+            np.clip(self._goals_for[ids] / safe_played / self.league_avg_goals, 0.6, 1.6),
+            np.clip(self._goals_against[ids] / safe_played / self.league_avg_goals, 0.6, 1.6),
+            form,
+            trend,
+            np.clip(self._home_points[ids] / np.maximum(self._home_played[ids], 1) / 3, 0.3, 0.9),
+            np.clip(self._away_points[ids] / np.maximum(self._away_played[ids], 1) / 3, 0.2, 0.8)
+        ], axis=1)
+        samples = np.stack([played, played, recent_count, recent_count,
+                            self._home_played[ids], self._away_played[ids]], axis=1).astype(float)
+
+        share = samples / (samples + self.prior_matches)
+        self._features[ids] = np.where(samples > 0, (1 - share) * self._prior[ids] + share * observed, self._prior[ids])
+        for team_id in ids.tolist():
+            self._rows[team_id] = self._make_row(team_id)
+
+    def refresh(self, client, page_size: Optional[int] = None) -> int:
+        """
+        Charge les matchs terminés depuis la table `matches` (incrémental après le premier appel)
+        Retourne le nombre de nouveaux matchs intégrés.
+        """
+        if client is None:
+            return 0
+        page_size = page_size or self.PAGE_SIZE
+        since = None
+        if self._last_match_date:
+            last = datetime.fromisoformat(self._last_match_date[:19])
+            since = (last - timedelta(days=self.REFRESH_OVERLAP_DAYS)).isoformat()
+
+        added = 0
+        offset = 0
+        try:
+            while True:
+                query = client.table('matches').select(
+                    'match_id_api,home_team,away_team,match_date,home_score,away_score'
+                ).eq('status', 'finished')
+                if since:
+                    query = query.gte('match_date', since)
+                rows = query.order('match_date').range(offset, offset + page_size - 1).execute().data or []
+                added += self.update_from_matches(rows)
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+        except Exception as e:
+            print(f"⚠️ Feature store non rafraîchi: {e}")
+        self.refreshes += 1
+        return added
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'teams': len(self),
+            'matches': len(self._seen_matches),
+            'teams_with_history': int((self._played[:len(self)] > 0).sum()),
+            'last_match_date': self._last_match_date,
+            'refreshes': self.refreshes
+        }
+
+
+_default_store: Optional[TeamFeatureStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_team_feature_store() -> TeamFeatureStore:
+    """Store partagé par toutes les IA du processus"""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = TeamFeatureStore()
+    return _default_store
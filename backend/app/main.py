@@ -1,115 +1,235 @@
-#!/usr/bin/env python3
-"""
-🚀 Eros Bot - API Principale (FastAPI)
-Point d'entrée pour le déploiement sur Render
-"""
-
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
-import os
-
-# Initialiser FastAPI
-app = FastAPI(
-    title="Eros Bot API",
-    description="Prédictions football par Intelligence Artificielle",
-    version="2.0"
-)
-
-# CORS pour autoriser Vercel et autres
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-# ============================================
-# ROUTES ESSENTIELLES
-# ============================================
-
-@app.get("/")
-async def root():
-    """Page d'accueil de l'API"""
-    return {
-        "message": "Eros Bot API - Running!",
-        "version": "2.0",
-        "status": "online",
-        "timestamp": datetime.now().isoformat()
-    }
-
-
-@app.get("/health")
-async def health_check():
-    """Vérification de santé pour Render"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat()
-    }
-
-
-@app.get("/api/predictions")
-async def get_predictions():
-    """
-    Retourne les prédictions du jour.
-    """
-    mock_predictions = [
-        {
-            "match": "PSG vs Marseille",
-            "league": "Ligue 1",
-            "best_market": "DOUBLE_CHANCE",
-            "final_prediction": "1N",
-            "final_confidence": 0.785,
-            "risk_level": "low",
-            "recommendation": "✅ FORTE CONFIANCE - MEILLEUR MARCHÉ",
-            "all_markets": {
-                "DOUBLE_CHANCE": {"prediction": "1N", "confidence": 0.785},
-                "OVER_UNDER_1.5": {"prediction": "OVER_1.5", "confidence": 0.723},
-                "1N2": {"prediction": "HOME_WIN", "confidence": 0.685}
-            }
-        },
-        {
-            "match": "Real Madrid vs Barcelona",
-            "league": "La Liga",
-            "best_market": "BTTS",
-            "final_prediction": "BTTS_YES",
-            "final_confidence": 0.654,
-            "risk_level": "medium",
-            "recommendation": "⚠️ OPPORTUNITÉ MODÉRÉE",
-            "all_markets": {
-                "BTTS": {"prediction": "BTTS_YES", "confidence": 0.654},
-                "1N2": {"prediction": "DRAW", "confidence": 0.582}
-            }
-        }
-    ]
-    
-    return {
-        "success": True,
-        "count": len(mock_predictions),
-        "predictions": mock_predictions,
-        "generated_at": datetime.now().isoformat()
-    }
-
-
-# ============================================
-# POINT D'ENTRÉE POUR UVICORN
-# ============================================
-
-if __name__ == "__main__":
-    import uvicorn
-    
-    port = int(os.getenv("PORT", 8000))
-    print(f"🚀 Démarrage de Eros Bot API sur le port {port}")
-    print(f"📍 URLs disponibles:")
-    print(f"   - http://localhost:{port}/")
-    print(f"   - http://localhost:{port}/health")
-    print(f"   - http://localhost:{port}/api/predictions")
-    
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=port,
-        log_level="info"
-)
+#!/usr/bin/env python3
+"""
+🚀 Eros Bot - API Principale (FastAPI)
+Point d'entrée pour le déploiement sur Render
+"""
+
+from fastapi import FastAPI, Header, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Optional
+import hmac
+import json
+import os
+import threading
+
+from backend.app.services import metrics
+from backend.app.services.prediction_snapshot import PredictionSnapshotService
+from backend.app.services.prediction_stream import PredictionBroadcaster
+from backend.app.services.supabase_client import close_clients, storage_stats
+
+# Initialiser FastAPI
+app = FastAPI(
+    title="Eros Bot API",
+    description="Prédictions football par Intelligence Artificielle",
+    version="2.0"
+)
+
+# CORS pour autoriser Vercel et autres
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Prédictions du jour calculées en tâche de fond, servies telles quelles par /api/predictions
+snapshot_service = PredictionSnapshotService()
+# Deltas poussés aux clients de /api/stream et /ws/predictions (un seul calcul pour tous)
+broadcaster = PredictionBroadcaster()
+snapshot_service.on_snapshot(broadcaster.publish_snapshot)
+live_loop = None
+
+
+# Compteurs de storage_stats() → aide des métriques Prometheus
+STORAGE_METRICS = {
+    'clients_created': "Clients de stockage créés",
+    'connections_opened': "Connexions HTTP ouvertes vers Supabase",
+    'requests': "Requêtes HTTP envoyées à Supabase (relances comprises)",
+    'retries': "Requêtes Supabase relancées",
+    'errors': "Requêtes Supabase en échec après relances",
+}
+
+
+def _service_metrics():
+    """Statistiques déjà tenues par les services, exportées telles quelles dans /metrics"""
+    storage = storage_stats()
+    samples = [
+        (f"eros_storage_{name}_total", "counter", help_text, {"backend": storage['backend']}, storage[name])
+        for name, help_text in STORAGE_METRICS.items()
+    ]
+    snapshot = snapshot_service.stats()
+    samples.append(("eros_snapshot_predictions", "gauge", "Prédictions du snapshot servi", {}, snapshot['count']))
+    samples.append(("eros_snapshot_refreshes_total", "counter", "Recalculs du snapshot", {}, snapshot['refreshes']))
+    samples.append(("eros_stream_clients", "gauge", "Clients SSE/WebSocket connectés", {}, broadcaster.stats()['clients']))
+    return samples
+
+
+metrics.register_collector(_service_metrics)
+
+
+@app.on_event("startup")
+async def start_snapshot_refresh():
+    global live_loop
+    broadcaster.bind()
+    snapshot_service.start()
+    # EROS_LIVE_LOOP=1: suivi des scores en direct dans ce processus (deltas 'score' du flux)
+    if os.getenv("EROS_LIVE_LOOP") == "1":
+        from backend.app.services.live_updates import LiveMatchLoop
+        from backend.app.services.match_service import MatchService
+        live_loop = LiveMatchLoop(match_service=MatchService())
+        live_loop.subscribe(broadcaster.publish_live)
+        threading.Thread(target=live_loop.run, name="live-loop", daemon=True).start()
+
+
+@app.on_event("shutdown")
+async def stop_snapshot_refresh():
+    if live_loop is not None:
+        live_loop.stop()
+    await snapshot_service.stop()
+    await close_clients()
+
+
+# ============================================
+# ROUTES ESSENTIELLES
+# ============================================
+
+@app.get("/")
+async def root():
+    """Page d'accueil de l'API"""
+    return {
+        "message": "Eros Bot API - Running!",
+        "version": "2.0",
+        "status": "online",
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/health")
+async def health_check():
+    """Vérification de santé pour Render"""
+    return {
+        "status": "healthy",
+        "storage": storage_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Latences par étape, erreurs, cache et stockage au format texte Prometheus"""
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/predictions")
+async def get_predictions(markets: Optional[str] = None, if_none_match: Optional[str] = Header(None)):
+    """
+    Retourne les prédictions du jour.
+    Sert le dernier snapshot pré-sérialisé (aucun calcul des IA pendant la requête);
+    If-None-Match sur l'ETag courant → 304 sans corps.
+    ?markets=1N2,DOUBLE_CHANCE: sélection dans les marchés du snapshot (meilleur marché choisi
+    parmi ceux demandés), construite une fois par snapshot et par sélection, sans relancer les IA.
+    """
+    snapshot = snapshot_service.snapshot
+    requested = [m.strip().upper() for m in markets.split(',') if m.strip()] if markets else []
+    if snapshot is not None and requested:
+        try:
+            snapshot = await snapshot_service.market_snapshot(requested)
+        except ValueError as e:
+            return Response(content=json.dumps({"success": False, "error": str(e)}, ensure_ascii=False).encode('utf-8'),
+                            status_code=400, media_type="application/json")
+    if snapshot is None:
+        return Response(
+            content=b'{"success": false, "error": "Predictions en cours de calcul"}',
+            status_code=503,
+            media_type="application/json",
+            headers={"Retry-After": "5"}
+        )
+    
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if snapshot.matches_etag(if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+@app.post("/api/predictions/refresh")
+async def refresh_predictions(x_refresh_token: Optional[str] = Header(None)):
+    """
+    Recalcule le snapshot (appelé par l'ingestion une fois les matchs écrits)
+    Exige l'en-tête X-Refresh-Token égal à EROS_REFRESH_TOKEN; route désactivée si la
+    variable n'est pas définie (sinon n'importe qui pourrait déclencher un recalcul).
+    """
+    token = os.getenv("EROS_REFRESH_TOKEN")
+    if not token:
+        error = {"success": False, "error": "Rafraîchissement désactivé (EROS_REFRESH_TOKEN absent)"}
+        return Response(content=json.dumps(error, ensure_ascii=False).encode('utf-8'),
+                        status_code=404, media_type="application/json")
+    if not x_refresh_token or not hmac.compare_digest(x_refresh_token.encode('utf-8'), token.encode('utf-8')):
+        return Response(content=b'{"success": false, "error": "Token invalide"}',
+                        status_code=403, media_type="application/json")
+    await snapshot_service.refresh()
+    return {"success": True, "snapshot": snapshot_service.stats()}
+
+
+def _stream_hello():
+    """Premier message d'un client: ETag du snapshot courant (recharger /api/predictions s'il diffère)"""
+    snapshot = snapshot_service.snapshot
+    return {"etag": snapshot.etag if snapshot else None, "ready": snapshot is not None}
+
+
+@app.get("/api/stream")
+async def stream_predictions(request: Request, last_event_id: Optional[str] = Header(None)):
+    """
+    Flux Server-Sent Events des deltas de prédictions et de scores
+    Last-Event-ID (reconnexion automatique d'EventSource) rejoue les messages manqués.
+    """
+    async def events():
+        async for message in broadcaster.messages(last_event_id, hello=_stream_hello()):
+            if await request.is_disconnected():
+                break
+            yield message.sse if message is not None else b": ping\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.websocket("/ws/predictions")
+async def predictions_socket(websocket: WebSocket):
+    """Mêmes messages que /api/stream sur WebSocket (?last_event_id=... pour reprendre)"""
+    await websocket.accept()
+    try:
+        async for message in broadcaster.messages(websocket.query_params.get("last_event_id"),
+                                                  hello=_stream_hello()):
+            await websocket.send_text(message.ws if message is not None else '{"event": "ping"}')
+    except WebSocketDisconnect:
+        pass
+
+
+@app.get("/api/stream/stats")
+async def stream_stats():
+    """Clients connectés et messages diffusés"""
+    return {"stream": broadcaster.stats(), "live": live_loop.stats() if live_loop else None}
+
+
+# ============================================
+# POINT D'ENTRÉE POUR UVICORN
+# ============================================
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    port = int(os.getenv("PORT", 8000))
+    print(f"🚀 Démarrage de Eros Bot API sur le port {port}")
+    print(f"📍 URLs disponibles:")
+    print(f"   - http://localhost:{port}/")
+    print(f"   - http://localhost:{port}/health")
+    print(f"   - http://localhost:{port}/api/predictions")
+    
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        log_level="info"
+)
@@ -0,0 +1,154 @@
+"""
+Eros Bot - Pool HTTP du client Supabase (httpx)
+Un transport par processus (un pour le client synchrone, un pour l'asynchrone): les
+connexions keep-alive vers PostgREST sont réutilisées par tous les services, les erreurs
+de connexion et les 502/503/504 des lectures sont relancées avec un délai croissant, et
+chaque connexion TCP ouverte est comptée (stats exposées par storage_stats()).
+Importé seulement quand un client Supabase est créé.
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+
+# Réponses relancées (lectures seulement: un POST peut avoir été appliqué)
+RETRY_STATUSES = (502, 503, 504)
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class PoolStats:
+    """Compteurs partagés par les transports d'un processus"""
+
+    FIELDS = ('connections_opened', 'requests', 'retries', 'errors')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = dict.fromkeys(self.FIELDS, 0)
+
+    def add(self, field, count=1):
+        with self._lock:
+            self.counts[field] += count
+
+    def trace(self, event, info):
+        # Extension "trace" de httpcore: "connection.connect_tcp.complete" à chaque nouvelle connexion
+        if event.endswith('connect_tcp.complete'):
+            self.add('connections_opened')
+
+    async def atrace(self, event, info):
+        self.trace(event, info)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+class _RetryPolicy:
+    def __init__(self, retries, backoff):
+        self.retries = retries
+        self.backoff = backoff
+
+    def should_retry(self, request, attempt, response=None, error=None):
+        if attempt >= self.retries:
+            return False
+        if error is not None:
+            # Connexion jamais établie: rien n'a été envoyé, toute méthode est rejouable
+            return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)) or (
+                request.method in IDEMPOTENT_METHODS and isinstance(error, httpx.TransportError))
+        return request.method in IDEMPOTENT_METHODS and response.status_code in RETRY_STATUSES
+
+    def delay(self, attempt):
+        return self.backoff * (2 ** attempt)
+
+
+class PooledTransport(httpx.BaseTransport):
+    """HTTPTransport à pool borné, avec relances et comptage des connexions"""
+
+    def __init__(self, stats, pool_size=10, retries=2, backoff=0.25, http2=True):
+        self.stats = stats
+        self.policy = _RetryPolicy(retries, backoff)
+        self.transport = httpx.HTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    def handle_request(self, request):
+        request.extensions.setdefault('trace', self.stats.trace)
+        attempt = 0
+        while True:
+            self.stats.add('requests')
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError as e:
+                if not self.policy.should_retry(request, attempt, error=e):
+                    self.stats.add('errors')
+                    raise
+            else:
+                if not self.policy.should_retry(request, attempt, response=response):
+                    return response
+                # Corps lu avant fermeture: la connexion retourne au pool au lieu d'être coupée
+                response.read()
+                response.close()
+            self.stats.add('retries')
+            time.sleep(self.policy.delay(attempt))
+            attempt += 1
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncPooledTransport(httpx.AsyncBaseTransport):
+    """Version asyncio de PooledTransport (mêmes compteurs)"""
+
+    def __init__(self, stats, pool_size=10, retries=2, backoff=0.25, http2=True):
+        self.stats = stats
+        self.policy = _RetryPolicy(retries, backoff)
+        self.transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+    async def handle_async_request(self, request):
+        request.extensions.setdefault('trace', self.stats.atrace)
+        attempt = 0
+        while True:
+            self.stats.add('requests')
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                if not self.policy.should_retry(request, attempt, error=e):
+                    self.stats.add('errors')
+                    raise
+            else:
+                if not self.policy.should_retry(request, attempt, response=response):
+                    return response
+                await response.aread()
+                await response.aclose()
+            self.stats.add('retries')
+            await asyncio.sleep(self.policy.delay(attempt))
+            attempt += 1
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def timeout_config(total, connect):
+    return httpx.Timeout(total, connect=connect)
+
+
+def attach_pool(postgrest, transport, timeout):
+    """
+    Remplace la session httpx du client PostgREST par une session sur le transport partagé
+    (même URL et mêmes en-têtes d'authentification)
+    """
+    session = postgrest.session
+    pooled = type(session)(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=timeout,
+        transport=transport,
+        follow_redirects=True,
+    )
+    postgrest.session = pooled
+    return pooled
@@ -0,0 +1,252 @@
+"""
+Eros Bot - Boucle de suivi des matchs en direct
+Interroge football-data.org à intervalle adaptatif (rapide en 2e mi-temps, au repos quand
+rien n'est en direct), compare chaque match au dernier état vu (score, statut, score à la
+mi-temps) et n'écrit / ne re-prédit que les matchs qui ont réellement changé.
+Chaque changement est publié aux abonnés sous forme d'événement (dict sérialisable en JSON):
+
+    {'event': 'new' | 'update' | 'finished' | 'ended', 'match_id': '123',
+     'match': {...ligne matches...}, 'changed': ['home_score'], 'previous': {...},
+     'prediction': {...} | None, 'at': '2026-01-10T16:02:11'}
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from backend.app.services import metrics
+
+# Champs comparés d'un passage à l'autre (colonnes de FootballDataOrgConnector.extract_match_data)
+LIVE_FIELDS = ('status', 'home_score', 'away_score', 'home_score_ht', 'away_score_ht')
+# Coup d'envoi + 45 min + pause: au-delà, un match en cours est en 2e mi-temps
+SECOND_HALF_AFTER = timedelta(minutes=62)
+
+FETCH = metrics.stage('fetch')
+
+
+class LiveMatchLoop:
+    """
+    Suivi incrémental des matchs en direct
+
+    Usage:
+        loop = LiveMatchLoop(connector, match_service, predictor)
+        unsubscribe = loop.subscribe(lambda event: print(event['event'], event['match_id']))
+        events = loop.poll()    # un passage
+        loop.run()              # boucle bloquante, loop.stop() depuis un autre thread
+
+    Intervalles (secondes): EROS_LIVE_FAST_INTERVAL (2e mi-temps, 20), EROS_LIVE_INTERVAL
+    (matchs en cours, 45), EROS_LIVE_IDLE_INTERVAL (aucun match en direct, 300).
+    Chaque passage coûte 2 requêtes (IN_PLAY + PAUSED), plus 1 par match sorti du direct.
+    """
+
+    # Passages sans réponse de /matches/{id} avant d'oublier un match sorti du direct
+    MAX_MISSING_POLLS = 3
+
+    def __init__(self, connector=None, match_service=None, predictor=None,
+                 fast_interval=None, live_interval=None, idle_interval=None):
+        if connector is None:
+            from backend.connectors.football_data_org import FootballDataOrgConnector
+            connector = FootballDataOrgConnector()
+        self.connector = connector
+        self.match_service = match_service
+        self.predictor = predictor
+        self.fast_interval = fast_interval if fast_interval is not None else float(os.getenv("EROS_LIVE_FAST_INTERVAL", "20"))
+        self.live_interval = live_interval if live_interval is not None else float(os.getenv("EROS_LIVE_INTERVAL", "45"))
+        self.idle_interval = idle_interval if idle_interval is not None else float(os.getenv("EROS_LIVE_IDLE_INTERVAL", "300"))
+
+        # match_id → valeurs de LIVE_FIELDS au dernier passage
+        self._state = {}
+        self._rows = {}
+        self._half_time_seen = set()
+        self._second_half = set()
+        self._missing = {}
+        self._subscribers = []
+        self._stop = threading.Event()
+
+        self.polls = 0
+        self.events_published = 0
+        self.rows_written = 0
+        self.predictions = 0
+
+    # ---------- Abonnés ----------
+
+    def subscribe(self, callback):
+        """Appelle `callback(event)` à chaque changement; retourne la fonction de désabonnement"""
+        self._subscribers.append(callback)
+
+        def unsubscribe():
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _publish(self, event):
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"⚠️ Abonné live en erreur: {e}")
+        self.events_published += 1
+
+    # ---------- Différences ----------
+
+    @staticmethod
+    def _event(kind, row, previous, changed):
+        return {
+            'event': kind,
+            'match_id': row['match_id_api'],
+            'match': row,
+            'changed': changed,
+            'previous': dict(zip(LIVE_FIELDS, previous)) if previous else None,
+            'prediction': None,
+            'at': datetime.now().isoformat()
+        }
+
+    def _diff(self, row):
+        """Événement si le match a changé depuis le dernier passage, sinon None"""
+        match_id = row['match_id_api']
+        snapshot = tuple(row.get(field) for field in LIVE_FIELDS)
+        previous = self._state.get(match_id)
+        if previous == snapshot:
+            return None
+        self._state[match_id] = snapshot
+        self._rows[match_id] = row
+        if previous is None:
+            return self._event('new', row, None, list(LIVE_FIELDS))
+        changed = [field for field, old, new in zip(LIVE_FIELDS, previous, snapshot) if old != new]
+        return self._event('update', row, previous, changed)
+
+    def _update_phase(self, match_id, match, now):
+        """Repère les matchs en 2e mi-temps (mi-temps déjà vue, minute > 45 ou heure du coup d'envoi)"""
+        if match.get('status') == 'PAUSED':
+            self._half_time_seen.add(match_id)
+            self._second_half.discard(match_id)
+            return
+        kickoff = match.get('utcDate')
+        late = False
+        if kickoff:
+            try:
+                late = now - datetime.fromisoformat(kickoff.replace('Z', '+00:00')) >= SECOND_HALF_AFTER
+            except ValueError:
+                pass
+        if match_id in self._half_time_seen or (match.get('minute') or 0) > 45 or late:
+            self._second_half.add(match_id)
+
+    def _forget(self, match_id):
+        for state in (self._state, self._rows, self._missing):
+            state.pop(match_id, None)
+        self._half_time_seen.discard(match_id)
+        self._second_half.discard(match_id)
+
+    def _left_live(self, match_id):
+        """Match absent du direct: récupère son état final. Retourne (événement, match brut)"""
+        final = self.connector.get_match(match_id) if hasattr(self.connector, 'get_match') else None
+        row = self.connector.extract_match_data(final) if final else None
+        if row is None:
+            self._missing[match_id] = self._missing.get(match_id, 0) + 1
+            if self._missing[match_id] < self.MAX_MISSING_POLLS:
+                return None, None
+            previous_row = self._rows.get(match_id)
+            previous = self._state.get(match_id)
+            self._forget(match_id)
+            return (self._event('ended', previous_row, previous, []) if previous_row else None), None
+        if row.get('status') == 'live':
+            # /matches/{id} et /matches?status=... pas encore synchronisés: on réessaiera
+            return None, None
+        previous = self._state.get(match_id)
+        changed = [field for field, old in zip(LIVE_FIELDS, previous) if row.get(field) != old]
+        self._forget(match_id)
+        return self._event('finished' if row.get('status') == 'finished' else 'ended', row, previous, changed), final
+
+    # ---------- Passage ----------
+
+    def poll(self):
+        """Un passage: diff, écriture et re-prédiction des matchs changés, publication. Retourne les événements"""
+        self.polls += 1
+        now = datetime.now(timezone.utc)
+        events, changed_matches, seen = [], [], set()
+
+        start = FETCH.start()
+        try:
+            live_matches = self.connector.get_live_matches()
+        except Exception:
+            FETCH.error()
+            raise
+        FETCH.stop(start)
+
+        for match in live_matches:
+            row = self.connector.extract_match_data(match)
+            if not row or row.get('match_id_api') in (None, 'None'):
+                continue
+            match_id = row['match_id_api']
+            seen.add(match_id)
+            self._missing.pop(match_id, None)
+            self._update_phase(match_id, match, now)
+            event = self._diff(row)
+            if event is not None:
+                events.append(event)
+                changed_matches.append(match)
+
+        for match_id in [m for m in self._state if m not in seen]:
+            event, final = self._left_live(match_id)
+            if event is not None:
+                events.append(event)
+            if final is not None:
+                changed_matches.append(final)
+
+        if changed_matches and self.match_service is not None:
+            summary = self.match_service.save_matches_bulk(changed_matches, self.connector)
+            self.rows_written += summary.get('written', 0)
+
+        if events and self.predictor is not None:
+            try:
+                predictions = self.predictor.predict_many([event['match'] for event in events])
+                for event, prediction in zip(events, predictions):
+                    event['prediction'] = prediction
+                self.predictions += len(predictions)
+            except Exception as e:
+                print(f"⚠️ Re-prédiction live impossible: {e}")
+
+        for event in events:
+            self._publish(event)
+        return events
+
+    def interval(self):
+        """Délai avant le prochain passage"""
+        if not self._state:
+            return self.idle_interval
+        if self._second_half:
+            return self.fast_interval
+        return self.live_interval
+
+    def run(self, max_polls=None):
+        """Boucle bloquante jusqu'à stop() (ou max_polls passages)"""
+        self._stop.clear()
+        polls = 0
+        while not self._stop.is_set():
+            start = time.monotonic()
+            try:
+                events = self.poll()
+                if events:
+                    print(f"⚽ Live: {len(events)} changements, {len(self._state)} matchs en direct")
+            except Exception as e:
+                print(f"❌ Passage live en erreur: {e}")
+            polls += 1
+            if max_polls is not None and polls >= max_polls:
+                break
+            self._stop.wait(max(0.0, self.interval() - (time.monotonic() - start)))
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        return {
+            'live_matches': len(self._state),
+            'second_half': len(self._second_half),
+            'polls': self.polls,
+            'events': self.events_published,
+            'rows_written': self.rows_written,
+            'predictions': self.predictions,
+            'next_interval': self.interval(),
+            'subscribers': len(self._subscribers)
+        }
@@ -0,0 +1,480 @@
+"""
+Eros Bot - Stockage local SQLite (alternative à Supabase)
+Mêmes tables que la base Supabase (matches, predictions, prediction_logs, match_results,
+ai_weights, agent_accuracy_daily) dans un fichier SQLite en mode WAL, derrière la même
+API fluide que le client supabase-py (table().select().eq()...execute()).
+Backtests, job quotidien et tests tournent ainsi sans réseau et sans toucher la prod.
+
+Activation:
+    EROS_STORAGE=sqlite                # supabase par défaut
+    EROS_SQLITE_PATH=.cache/eros.db    # ':memory:' pour une base éphémère
+
+Usage:
+    client = SQLiteClient('.cache/eros.db')
+    client.table('matches').upsert(rows, on_conflict='match_id_api').execute()
+    client.table('matches').select('*').eq('status', 'finished').order('match_date').execute().data
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import uuid
+from contextlib import nullcontext
+
+DEFAULT_SQLITE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    '.cache', 'eros.db'
+)
+
+# Colonnes connues de chaque table; une colonne inconnue écrite par le code est ajoutée à la volée
+TABLES = {
+    'matches': """
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        match_id_api TEXT UNIQUE,
+        home_team TEXT,
+        away_team TEXT,
+        match_date TEXT,
+        league TEXT,
+        status TEXT,
+        home_score INTEGER,
+        away_score INTEGER,
+        home_score_ht INTEGER,
+        away_score_ht INTEGER,
+        competition_code TEXT,
+        venue TEXT,
+        referee TEXT,
+        content_hash TEXT,
+        created_at TEXT
+    """,
+    'predictions': """
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        prediction_key TEXT UNIQUE,
+        match_id TEXT,
+        league TEXT,
+        best_market TEXT,
+        prediction_type TEXT,
+        confidence_score REAL,
+        risk_level TEXT,
+        weights_version TEXT,
+        status TEXT,
+        created_at TEXT
+    """,
+    'prediction_logs': """
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        prediction_key TEXT UNIQUE,
+        match_id TEXT,
+        agent_name TEXT,
+        market_type TEXT,
+        predicted_outcome TEXT,
+        confidence REAL,
+        weights_version TEXT,
+        predicted_at TEXT,
+        status TEXT,
+        is_correct BOOLEAN,
+        actual_outcome TEXT,
+        resolved_at TEXT
+    """,
+    'match_results': """
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        match_id TEXT UNIQUE,
+        actual_outcome_1n2 TEXT,
+        home_score INTEGER,
+        away_score INTEGER,
+        total_goals INTEGER,
+        resolved_at TEXT
+    """,
+    'ai_weights': """
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        weights TEXT,
+        updated_at TEXT,
+        version TEXT
+    """,
+    'agent_accuracy_daily': """
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        agent_name TEXT,
+        market_type TEXT,
+        day TEXT,
+        correct INTEGER,
+        total INTEGER,
+        sum_confidence REAL,
+        updated_at TEXT,
+        UNIQUE (agent_name, market_type, day)
+    """,
+}
+
+# (nom, table, colonnes) — match_id_api, prediction_key... sont déjà indexés par leur UNIQUE
+INDEXES = (
+    ('idx_matches_match_date', 'matches', 'match_date'),
+    ('idx_matches_status_date', 'matches', 'status, match_date'),
+    ('idx_predictions_match', 'predictions', 'match_id'),
+    ('idx_prediction_logs_agent_market', 'prediction_logs', 'agent_name, market_type, predicted_at'),
+    ('idx_prediction_logs_match_status', 'prediction_logs', 'match_id, status'),
+    ('idx_prediction_logs_status', 'prediction_logs', 'status'),
+)
+
+# Colonnes BOOLEAN: SQLite les stocke en 0/1, PostgREST les renvoie en true/false
+BOOLEAN_COLUMNS = {'prediction_logs': ('is_correct',)}
+
+# Paramètres liés par requête (SQLITE_MAX_VARIABLE_NUMBER vaut 32766 depuis SQLite 3.32)
+MAX_VARIABLES = 32000
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+class StorageError(Exception):
+    """Requête invalide pour le stockage local (table ou colonne inconnue...)"""
+
+
+def _quote(name):
+    if not _IDENTIFIER.match(name):
+        raise StorageError(f"Identifiant invalide: {name!r}")
+    return f'"{name}"'
+
+
+def _adapt(value):
+    """dict / list → JSON (équivalent des colonnes jsonb)"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+class StorageResponse:
+    """Même forme que l'APIResponse de supabase-py"""
+
+    __slots__ = ('data', 'count')
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+    def __repr__(self):
+        return f"StorageResponse(rows={len(self.data)}, count={self.count})"
+
+
+class SQLiteQuery:
+    """Requête construite par chaînage, exécutée par execute()"""
+
+    def __init__(self, client, table):
+        if table not in client.columns:
+            raise StorageError(f"Table inconnue: {table}")
+        self.client = client
+        self.table = table
+        self._action = 'select'
+        self._columns = '*'
+        self._count = None
+        self._payload = None
+        self._on_conflict = None
+        self._ignore_duplicates = False
+        self._filters = []
+        self._params = []
+        self._order = []
+        self._limit = None
+        self._offset = None
+
+    # ---------- Actions ----------
+
+    def select(self, columns='*', count=None):
+        self._action = 'select'
+        if columns.strip() != '*':
+            columns = ', '.join(_quote(c.strip()) for c in columns.split(',') if c.strip())
+        self._columns = columns
+        self._count = count
+        return self
+
+    def insert(self, values, **kwargs):
+        self._action = 'insert'
+        self._payload = values
+        return self
+
+    def upsert(self, values, on_conflict='', ignore_duplicates=False, **kwargs):
+        self._action = 'upsert'
+        self._payload = values
+        self._on_conflict = on_conflict or 'id'
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, values, **kwargs):
+        self._action = 'update'
+        self._payload = values
+        return self
+
+    def delete(self, **kwargs):
+        self._action = 'delete'
+        return self
+
+    # ---------- Filtres ----------
+
+    def _filter(self, column, operator, value):
+        self._filters.append(f"{_quote(column)} {operator} ?")
+        self._params.append(_adapt(value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, '=', value)
+
+    def neq(self, column, value):
+        return self._filter(column, '!=', value)
+
+    def gt(self, column, value):
+        return self._filter(column, '>', value)
+
+    def gte(self, column, value):
+        return self._filter(column, '>=', value)
+
+    def lt(self, column, value):
+        return self._filter(column, '<', value)
+
+    def lte(self, column, value):
+        return self._filter(column, '<=', value)
+
+    def in_(self, column, values):
+        values = list(values)
+        if not values:
+            self._filters.append('0')
+            return self
+        self._filters.append(f"{_quote(column)} IN ({', '.join('?' * len(values))})")
+        self._params.extend(_adapt(v) for v in values)
+        return self
+
+    def is_(self, column, value):
+        if value is None or str(value).lower() == 'null':
+            self._filters.append(f"{_quote(column)} IS NULL")
+            return self
+        return self._filter(column, 'IS', value)
+
+    # ---------- Tri / pagination ----------
+
+    def order(self, column, desc=False, **kwargs):
+        # Même placement des NULL que PostgreSQL
+        self._order.append(f"{_quote(column)} {'DESC NULLS FIRST' if desc else 'ASC NULLS LAST'}")
+        return self
+
+    def limit(self, size, **kwargs):
+        self._limit = int(size)
+        return self
+
+    def range(self, start, end, **kwargs):
+        self._offset = int(start)
+        self._limit = int(end) - int(start) + 1
+        return self
+
+    # ---------- Exécution ----------
+
+    def _where(self):
+        return f" WHERE {' AND '.join(self._filters)}" if self._filters else ''
+
+    def execute(self):
+        return getattr(self, f"_execute_{self._action}")()
+
+    def _execute_select(self):
+        sql = f'SELECT {self._columns} FROM "{self.table}"{self._where()}'
+        if self._order:
+            sql += ' ORDER BY ' + ', '.join(self._order)
+        if self._limit is not None or self._offset is not None:
+            sql += f" LIMIT {self._limit if self._limit is not None else -1} OFFSET {self._offset or 0}"
+        with self.client.connection() as conn:
+            rows = conn.execute(sql, self._params).fetchall()
+            count = None
+            if self._count:
+                count = conn.execute(f'SELECT COUNT(*) FROM "{self.table}"{self._where()}', self._params).fetchone()[0]
+        return StorageResponse(self.client.to_dicts(self.table, rows), count)
+
+    def _rows(self):
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        if rows:
+            self.client.ensure_columns(self.table, {column for row in rows for column in row})
+        return rows
+
+    def _write_rows(self, suffix):
+        """INSERT multi-lignes (RETURNING * ne marche pas avec executemany), en une transaction"""
+        written = []
+        groups = {}
+        for row in self._rows():
+            groups.setdefault(tuple(row), []).append(row)
+        with self.client.connection() as conn:
+            with conn:
+                for columns, group in groups.items():
+                    placeholders = f"({', '.join('?' * len(columns))})"
+                    step = max(1, MAX_VARIABLES // len(columns))
+                    for i in range(0, len(group), step):
+                        chunk = group[i:i + step]
+                        sql = (f'INSERT INTO "{self.table}" ({", ".join(_quote(c) for c in columns)}) '
+                               f'VALUES {", ".join([placeholders] * len(chunk))}{suffix(columns)} RETURNING *')
+                        params = [_adapt(row[c]) for row in chunk for c in columns]
+                        written.extend(conn.execute(sql, params).fetchall())
+        return StorageResponse(self.client.to_dicts(self.table, written))
+
+    def _execute_insert(self):
+        return self._write_rows(lambda columns: '')
+
+    def _execute_upsert(self):
+        target = ', '.join(_quote(c.strip()) for c in self._on_conflict.split(','))
+        conflict = {c.strip() for c in self._on_conflict.split(',')}
+
+        def suffix(columns):
+            updates = [f"{_quote(c)} = excluded.{_quote(c)}" for c in columns if c not in conflict]
+            if self._ignore_duplicates or not updates:
+                return f" ON CONFLICT ({target}) DO NOTHING"
+            return f" ON CONFLICT ({target}) DO UPDATE SET {', '.join(updates)}"
+
+        return self._write_rows(suffix)
+
+    def _execute_update(self):
+        (values,) = self._rows()
+        columns = list(values)
+        sql = (f'UPDATE "{self.table}" SET {", ".join(f"{_quote(c)} = ?" for c in columns)}'
+               f'{self._where()} RETURNING *')
+        with self.client.connection() as conn:
+            with conn:
+                rows = conn.execute(sql, [_adapt(values[c]) for c in columns] + self._params).fetchall()
+        return StorageResponse(self.client.to_dicts(self.table, rows))
+
+    def _execute_delete(self):
+        with self.client.connection() as conn:
+            with conn:
+                rows = conn.execute(f'DELETE FROM "{self.table}"{self._where()} RETURNING *', self._params).fetchall()
+        return StorageResponse(self.client.to_dicts(self.table, rows))
+
+
+class SQLiteClient:
+    """
+    Client SQLite compatible avec l'usage de supabase-py dans Eros Bot
+
+    Une connexion par thread (WAL: les lectures ne bloquent pas l'écriture en cours);
+    ':memory:' partage une seule connexion protégée par un verrou.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or DEFAULT_SQLITE_PATH
+        self.memory = self.path == ':memory:'
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._memory_conn = None
+        self._memory_lock = threading.RLock()
+        if self.memory:
+            self._memory_conn = self._open(f"file:eros-{uuid.uuid4().hex}?mode=memory", uri=True)
+        else:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.columns = {}
+        self._create_schema()
+
+    def __repr__(self):
+        return f"SQLiteClient({self.path!r})"
+
+    # ---------- Connexions ----------
+
+    @staticmethod
+    def _open(database, uri=False):
+        conn = sqlite3.connect(database, uri=uri, timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA foreign_keys=ON')
+        return conn
+
+    def connection(self):
+        """Contexte qui fournit la connexion du thread courant"""
+        if self.memory:
+            return _Locked(self._memory_conn, self._memory_lock)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._open(self.path)
+        return nullcontext(conn)
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ---------- Schéma ----------
+
+    def _create_schema(self):
+        with self.connection() as conn:
+            with conn:
+                for table, columns in TABLES.items():
+                    conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns})')
+                    # Base créée par une version précédente: colonnes simples ajoutées depuis
+                    existing = {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+                    for declaration in columns.strip().splitlines():
+                        name, _, kind = declaration.strip().rstrip(',').partition(' ')
+                        if _IDENTIFIER.match(name) and name not in existing and name != 'UNIQUE' \
+                                and 'UNIQUE' not in kind and 'PRIMARY' not in kind:
+                            conn.execute(f'ALTER TABLE "{table}" ADD COLUMN {_quote(name)} {kind}')
+                for name, table, columns in INDEXES:
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({columns})')
+            for table in TABLES:
+                self.columns[table] = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+
+    def ensure_columns(self, table, columns):
+        """Ajoute les colonnes écrites par le code mais absentes du schéma"""
+        missing = [c for c in columns if c not in self.columns[table]]
+        if not missing:
+            return
+        with self._schema_lock, self.connection() as conn:
+            for column in missing:
+                if column not in self.columns[table]:
+                    conn.execute(f'ALTER TABLE "{table}" ADD COLUMN {_quote(column)}')
+                    self.columns[table] = self.columns[table] + [column]
+            conn.commit()
+
+    def to_dicts(self, table, rows):
+        booleans = [c for c in BOOLEAN_COLUMNS.get(table, ()) if rows and c in rows[0].keys()]
+        data = [dict(row) for row in rows]
+        for column in booleans:
+            for row in data:
+                if row[column] is not None:
+                    row[column] = bool(row[column])
+        return data
+
+    # ---------- API ----------
+
+    def table(self, name):
+        return SQLiteQuery(self, name)
+
+    from_ = table
+
+
+class _Locked:
+    """Connexion partagée (base en mémoire) utilisée sous verrou"""
+
+    def __init__(self, conn, lock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self):
+        self.lock.acquire()
+        return self.conn
+
+    def __exit__(self, *exc):
+        self.lock.release()
+        return False
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def storage_backend():
+    """'sqlite' ou 'supabase' (EROS_STORAGE)"""
+    return os.getenv("EROS_STORAGE", "supabase").strip().lower()
+
+
+def local_storage_client(path=None):
+    """
+    Client SQLite partagé si EROS_STORAGE=sqlite, sinon None (le code garde Supabase)
+    Un seul client par fichier dans le processus: tous les services voient les mêmes données.
+    """
+    if storage_backend() != 'sqlite':
+        return None
+    path = path or os.getenv("EROS_SQLITE_PATH") or DEFAULT_SQLITE_PATH
+    with _clients_lock:
+        if path not in _clients:
+            _clients[path] = SQLiteClient(path)
+            print(f"✅ Stockage local SQLite: {path}", file=sys.stderr)
+        return _clients[path]
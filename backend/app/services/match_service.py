@@ -1,9 +1,17 @@
-from supabase import create_client, Client
 import os
-from datetime import datetime
-from dotenv import load_dotenv
+import json
+import time
+import hashlib
+from datetime import datetime, timedelta
 
-load_dotenv()
+from backend.app.services import metrics
+from backend.app.services.supabase_client import get_supabase_client, load_environment
+
+# Champs ignorés dans l'empreinte (changent à chaque extraction, ou l'empreinte elle-même)
+HASH_EXCLUDED_FIELDS = ('created_at', 'content_hash')
+
+NORMALISE = metrics.stage('normalise')
+PERSISTENCE = metrics.stage('persistence')
 
 class MatchService:
     """
@@ -11,20 +19,26 @@ class MatchService:
     Gère l'insertion, la mise à jour et la récupération des matchs
     """
     
-    def __init__(self):
-        """Initialise la connexion Supabase"""
+    # Taille des lots envoyés à PostgREST par save_matches_bulk
+    BULK_CHUNK_SIZE = 500
+    
+    def __init__(self, client=None):
+        """
+        Initialise la connexion Supabase
+        client: client Supabase déjà créé (sinon le client partagé du processus, créé
+        depuis SUPABASE_URL / SUPABASE_KEY, ou la base locale avec EROS_STORAGE=sqlite)
+        """
+        load_environment()
         self.supabase_url = os.getenv("SUPABASE_URL")
         self.supabase_key = os.getenv("SUPABASE_KEY")
         
-        if not self.supabase_url or not self.supabase_key:
-            print("⚠️  ATTENTION: Variables Supabase non configurées dans .env")
+        if client is not None:
+            self.supabase = client
+            return
         
-        try:
-            self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
-            print("✅ Connexion Supabase initialisée")
-        except Exception as e:
-            print(f"❌ Erreur connexion Supabase: {e}")
-            self.supabase = None
+        self.supabase = get_supabase_client()
+        if self.supabase is None and (not self.supabase_url or not self.supabase_key):
+            print("⚠️  ATTENTION: Variables Supabase non configurées dans .env")
     
     def save_match(self, match_data):
         """
@@ -44,6 +58,8 @@ class MatchService:
                 'status': self._map_status(match_data.get('fixture', {}).get('status', {}).get('short')),
                 'home_score': match_data.get('goals', {}).get('home'),
                 'away_score': match_data.get('goals', {}).get('away'),
+                # Ligne écrite sans empreinte: le prochain save_matches_bulk la réécrira
+                'content_hash': None,
                 'created_at': datetime.now().isoformat()
             }
             
@@ -95,6 +111,7 @@ class MatchService:
                 'status': connector.map_match_status(match_data.get('status')),
                 'home_score': full_time.get('home'),
                 'away_score': full_time.get('away'),
+                'content_hash': None,
                 'created_at': datetime.now().isoformat()
             }
             
@@ -115,6 +132,91 @@ class MatchService:
             print(f"❌ Erreur Supabase (football-data): {e}")
             return None
     
+    def save_matches_bulk(self, matches, connector, chunk_size=None, force=False):
+        """
+        Enregistre un lot de matchs football-data.org en quelques requêtes
+        - normalisation via connector.extract_match_data
+        - upsert par lots (on_conflict='match_id_api'): 1 aller-retour par lot au lieu de 2 par match
+        - les matchs dont l'empreinte en base (colonne content_hash) est identique sont ignorés:
+          la base fait foi (base restaurée, autre hôte ou autre écrivain compris)
+        force: réécrit tous les matchs sans comparer les empreintes
+        Retourne un résumé (lignes reçues / écrites / ignorées, temps, débit)
+        """
+        start = time.perf_counter()
+        chunk_size = chunk_size or self.BULK_CHUNK_SIZE
+        summary = {'received': len(matches), 'written': 0, 'unchanged': 0, 'invalid': 0,
+                   'chunks': 0, 'lookups': 0, 'errors': 0}
+        
+        if not self.supabase:
+            print("❌ Supabase non connecté")
+            summary['errors'] = 1
+            return summary
+        
+        # Normalisation + dédoublonnage (un upsert ne peut pas toucher 2 fois la même ligne)
+        timer = NORMALISE.start()
+        rows = {}
+        for match in matches:
+            data = connector.extract_match_data(match)
+            if not data or data.get('match_id_api') in (None, 'None'):
+                summary['invalid'] += 1
+                continue
+            data['content_hash'] = self._content_hash(data)
+            rows[data['match_id_api']] = data
+        if matches:
+            NORMALISE.stop(timer, len(matches))
+        if summary['invalid']:
+            NORMALISE.error(summary['invalid'])
+        
+        items = list(rows.items())
+        for i in range(0, len(items), chunk_size):
+            chunk = items[i:i + chunk_size]
+            timer = PERSISTENCE.start()
+            if force:
+                pending = [data for _, data in chunk]
+            else:
+                stored = self._stored_hashes([match_id for match_id, _ in chunk])
+                summary['lookups'] += 1
+                pending = [data for match_id, data in chunk if stored.get(match_id) != data['content_hash']]
+                summary['unchanged'] += len(chunk) - len(pending)
+            if not pending:
+                continue
+            try:
+                self.supabase.table('matches').upsert(pending, on_conflict='match_id_api').execute()
+            except Exception as e:
+                print(f"❌ Erreur Supabase (upsert lot {i // chunk_size + 1}): {e}")
+                PERSISTENCE.error()
+                summary['errors'] += 1
+                continue
+            PERSISTENCE.stop(timer)
+            summary['chunks'] += 1
+            summary['written'] += len(pending)
+        
+        elapsed = time.perf_counter() - start
+        summary['elapsed_seconds'] = round(elapsed, 3)
+        summary['rows_per_sec'] = round(len(rows) / elapsed, 1) if elapsed > 0 else 0.0
+        print(f"✅ {summary['written']} matchs enregistrés, {summary['unchanged']} inchangés "
+              f"({summary['lookups'] + summary['chunks']} requêtes, {summary['elapsed_seconds']}s)")
+        return summary
+    
+    @staticmethod
+    def _content_hash(data):
+        """Empreinte du contenu d'une ligne (hors champs volatils)"""
+        stable = {k: v for k, v in data.items() if k not in HASH_EXCLUDED_FIELDS}
+        return hashlib.sha1(json.dumps(stable, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    
+    def _stored_hashes(self, match_ids):
+        """
+        {match_id_api: content_hash} des lignes déjà en base
+        En cas d'erreur: {} (tout le lot est réécrit plutôt que d'ignorer un match jamais écrit)
+        """
+        try:
+            result = self.supabase.table('matches').select('match_id_api,content_hash').in_(
+                'match_id_api', match_ids).execute()
+        except Exception as e:
+            print(f"⚠️  Empreintes illisibles, lot réécrit en entier: {e}")
+            return {}
+        return {row['match_id_api']: row.get('content_hash') for row in (result.data or [])}
+    
     def _map_status(self, status_short):
         """
         Mappe le statut API vers notre format (pour API-Football)
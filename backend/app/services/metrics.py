@@ -0,0 +1,203 @@
+"""
+Eros Bot - Instrumentation du pipeline de prédiction
+Latences par étape (fetch, normalise, feature_lookup, agent.<nom>, aggregation, persistence,
+predict) mesurées en perf_counter_ns dans des histogrammes à seaux fixes, compteurs d'erreurs
+et de hits de cache, le tout rendu au format texte Prometheus par render() (/metrics de l'API).
+
+Usage sur un chemin chaud:
+    FETCH = stage('fetch')              # une fois, au chargement du module
+    start = FETCH.start()               # 0 si désactivé
+    ...
+    FETCH.stop(start)                   # count=n pour un lot de n matchs (latence amortie)
+
+EROS_METRICS=0 désactive la collecte: start()/stop() ne font alors qu'un test (< 1µs par mesure,
+voir benchmarks/bench_metrics.py).
+"""
+
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter_ns
+
+# Bornes supérieures des seaux (ns): 10µs → 5s
+BUCKETS_NS = (
+    10_000, 25_000, 50_000, 100_000, 250_000, 500_000,
+    1_000_000, 2_500_000, 5_000_000, 10_000_000, 25_000_000, 50_000_000,
+    100_000_000, 250_000_000, 500_000_000, 1_000_000_000, 5_000_000_000,
+)
+
+_enabled = os.getenv("EROS_METRICS", "1") != "0"
+_lock = threading.Lock()
+_stages = {}
+_counters = {}
+_collectors = []
+
+
+def enabled():
+    return _enabled
+
+
+def set_enabled(value):
+    """Active/désactive la collecte pour tout le processus (les valeurs déjà collectées restent)"""
+    global _enabled
+    _enabled = bool(value)
+
+
+class Stage:
+    """Histogramme de latence d'une étape + compteur d'erreurs"""
+
+    __slots__ = ('name', 'buckets', 'sum_ns', 'count', 'errors', '_lock')
+
+    def __init__(self, name):
+        self.name = name
+        self.buckets = [0] * (len(BUCKETS_NS) + 1)
+        self.sum_ns = 0
+        self.count = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        return perf_counter_ns() if _enabled else 0
+
+    def stop(self, start, count=1):
+        """Enregistre la durée depuis start(); count > 1: lot de count éléments, latence répartie"""
+        if start:
+            self.record(perf_counter_ns() - start, count)
+
+    def record(self, elapsed_ns, count=1):
+        """Durée déjà mesurée par l'appelant (ns)"""
+        if not _enabled:
+            return
+        bucket = bisect_left(BUCKETS_NS, elapsed_ns // count)
+        with self._lock:
+            self.buckets[bucket] += count
+            self.sum_ns += elapsed_ns
+            self.count += count
+
+    def error(self, count=1):
+        if _enabled:
+            with self._lock:
+                self.errors += count
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.buckets), self.sum_ns, self.count, self.errors
+
+
+class Counter:
+    """Compteur monotone avec étiquettes fixes"""
+
+    __slots__ = ('name', 'labels', 'value', '_lock')
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, count=1):
+        if _enabled:
+            with self._lock:
+                self.value += count
+
+
+def stage(name):
+    """Étape partagée du processus (créée au premier appel)"""
+    found = _stages.get(name)
+    if found is None:
+        with _lock:
+            found = _stages.setdefault(name, Stage(name))
+    return found
+
+
+def counter(name, **labels):
+    """Compteur partagé du processus, ex: counter('eros_cache_hits_total', cache='predictions')"""
+    key = (name, tuple(sorted(labels.items())))
+    found = _counters.get(key)
+    if found is None:
+        with _lock:
+            found = _counters.setdefault(key, Counter(name, key[1]))
+    return found
+
+
+def register_collector(collector):
+    """
+    collector() -> [(nom, type, aide, {étiquette: valeur}, valeur)] lu à chaque render()
+    (statistiques déjà tenues ailleurs: pool Supabase, snapshot...)
+    """
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+
+def reset():
+    """Remet tous les compteurs à zéro (benchmarks)"""
+    with _lock:
+        for name in list(_stages):
+            _stages[name].__init__(name)
+        for found in _counters.values():
+            found.value = 0
+
+
+def stats():
+    """{étape: {'count', 'errors', 'avg_us'}} pour les résumés affichés"""
+    summary = {}
+    for name, found in sorted(_stages.items()):
+        _, sum_ns, count, errors = found.snapshot()
+        if count or errors:
+            summary[name] = {'count': count, 'errors': errors,
+                             'avg_us': round(sum_ns / count / 1000, 2) if count else 0.0}
+    return summary
+
+
+# ---------- Format Prometheus ----------
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+def render():
+    """Toutes les métriques au format texte Prometheus (version 0.0.4)"""
+    lines = [
+        '# HELP eros_stage_duration_seconds Latence par étape du pipeline (par match pour les lots)',
+        '# TYPE eros_stage_duration_seconds histogram',
+    ]
+    errors = []
+    for name, found in sorted(_stages.items()):
+        buckets, sum_ns, count, stage_errors = found.snapshot()
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS_NS, buckets):
+            cumulative += bucket_count
+            lines.append(f'eros_stage_duration_seconds_bucket{_labels((("stage", name), ("le", f"{bound / 1e9:g}")))} {cumulative}')
+        lines.append(f'eros_stage_duration_seconds_bucket{_labels((("stage", name), ("le", "+Inf")))} {count}')
+        lines.append(f'eros_stage_duration_seconds_sum{_labels((("stage", name),))} {sum_ns / 1e9:.9f}')
+        lines.append(f'eros_stage_duration_seconds_count{_labels((("stage", name),))} {count}')
+        errors.append(f'eros_stage_errors_total{_labels((("stage", name),))} {stage_errors}')
+
+    lines.append('# HELP eros_stage_errors_total Erreurs par étape du pipeline')
+    lines.append('# TYPE eros_stage_errors_total counter')
+    lines.extend(errors)
+
+    by_name = {}
+    for found in _counters.values():
+        by_name.setdefault(found.name, []).append(found)
+    for name, found_list in sorted(by_name.items()):
+        lines.append(f'# TYPE {name} counter')
+        lines.extend(f'{name}{_labels(found.labels)} {found.value}' for found in found_list)
+
+    declared = set()
+    for collector in list(_collectors):
+        try:
+            samples = collector()
+        except Exception as e:
+            lines.append(f'# collecteur en erreur: {e}'.replace('\n', ' '))
+            continue
+        for name, kind, help_text, labels, value in samples:
+            if name not in declared:
+                declared.add(name)
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+            lines.append(f'{name}{_labels(tuple(sorted(labels.items())))} {value}')
+    return '\n'.join(lines) + '\n'
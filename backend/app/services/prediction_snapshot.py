@@ -0,0 +1,249 @@
+"""
+Eros Bot - Snapshot des prédictions du jour
+Les prédictions sont calculées en tâche de fond (au démarrage, toutes les
+EROS_SNAPSHOT_INTERVAL secondes et sur demande après une ingestion) puis figées
+en un JSON déjà sérialisé. Une requête HTTP ne fait que renvoyer ces octets:
+sa latence ne dépend plus du nombre de matchs ni du temps de calcul des IA.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+# Champs qui changent à chaque calcul sans que la prédiction change
+VOLATILE_FIELDS = ('execution_time_ms', 'timestamp')
+# Champs internes non exposés par l'API (votes détaillés des IA, persistés en base)
+PRIVATE_FIELDS = ('agent_votes',)
+
+
+class PredictionSnapshot:
+    """Réponse figée de /api/predictions: corps JSON encodé + ETag"""
+
+    __slots__ = ('body', 'etag', 'content_hash', 'count', 'generated_at', 'demo', 'build_seconds', 'predictions',
+                 'markets')
+
+    def __init__(self, predictions, demo=False, build_seconds=0.0, markets=None):
+        predictions = [{k: v for k, v in p.items() if k not in PRIVATE_FIELDS} for p in predictions]
+        stable = [{k: v for k, v in p.items() if k not in VOLATILE_FIELDS} for p in predictions]
+        self.content_hash = hashlib.sha1(
+            json.dumps([stable, demo], sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        generated_at = datetime.now().isoformat()
+        payload = {
+            "success": True,
+            "count": len(predictions),
+            "predictions": predictions,
+            "generated_at": generated_at,
+            "demo": demo
+        }
+        if markets is not None:
+            payload["markets"] = markets
+        self.body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest()[:20] + '"'
+        self.count = len(predictions)
+        self.generated_at = generated_at
+        self.demo = demo
+        self.build_seconds = build_seconds
+        # Prédictions publiques (deltas du flux temps réel, sélections de marchés)
+        self.predictions = predictions
+        # Marchés retenus (None = tous)
+        self.markets = markets
+
+    def matches_etag(self, if_none_match):
+        """True si l'en-tête If-None-Match du client désigne déjà ce snapshot"""
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or self.etag in tags or f"W/{self.etag}" in tags
+
+
+class PredictionSnapshotService:
+    """
+    Calcule et publie le snapshot des prédictions
+
+    Usage (FastAPI):
+        service = PredictionSnapshotService()
+        service.start()                 # au démarrage de l'application
+        snapshot = service.snapshot     # None tant que le premier calcul n'est pas fini
+        await service.refresh()         # après une ingestion
+        await service.market_snapshot(['1N2', 'DOUBLE_CHANCE'])   # ?markets=1N2,DOUBLE_CHANCE
+    """
+
+    # Sélections de marchés gardées par snapshot (les plus anciennes sont oubliées)
+    MAX_MARKET_SNAPSHOTS = 32
+
+    def __init__(self, predictor_factory=None, interval=None, limit=None):
+        """
+        predictor_factory: fonction qui crée l'ErosPredictor (appelée une fois, dans un thread)
+        interval: secondes entre deux recalculs (EROS_SNAPSHOT_INTERVAL, 600 par défaut)
+        limit: nombre maximum de matchs du jour (EROS_SNAPSHOT_LIMIT, 500 par défaut)
+        """
+        self.predictor_factory = predictor_factory
+        self.interval = interval if interval is not None else float(os.getenv("EROS_SNAPSHOT_INTERVAL", "600"))
+        self.limit = limit if limit is not None else int(os.getenv("EROS_SNAPSHOT_LIMIT", "500"))
+
+        self.snapshot = None
+        self.last_error = None
+        self.refreshes = 0
+        self._predictor = None
+        self._predictor_lock = threading.Lock()
+        self._refresh_lock = None
+        # Calculs lancés par refresh(), incrémenté sous le verrou avant chaque calcul
+        self._builds_started = 0
+        self._task = None
+        self._listeners = []
+        self._market_snapshots = {}
+        # Constructions de sélections en cours (un Future par sélection)
+        self._market_builds = {}
+        self._market_source = None
+
+    def _get_predictor(self):
+        with self._predictor_lock:
+            if self._predictor is None:
+                if self.predictor_factory is None:
+                    from backend.app.ai_engine.predictor import ErosPredictor
+                    self.predictor_factory = ErosPredictor
+                self._predictor = self.predictor_factory()
+            return self._predictor
+
+    def build(self):
+        """Calcule un nouveau snapshot (bloquant: à exécuter hors de la boucle d'événements)"""
+        from backend.app.ai_engine.predictor import DEMO_MATCHES
+
+        start = time.perf_counter()
+        predictor = self._get_predictor()
+        # Poids ré-entraînés par le job quotidien (autre processus): appliqués avant le calcul,
+        # ce qui change aussi la version du cache de prédictions
+        if hasattr(predictor, 'refresh_weights'):
+            predictor.refresh_weights()
+        matches = predictor.get_today_matches(self.limit)
+        if matches is None and getattr(predictor, 'supabase', None):
+            # Erreur de lecture: refresh() garde le snapshot précédent au lieu de publier la démo
+            raise RuntimeError("matchs du jour illisibles (erreur Supabase)")
+        # Démo seulement sans base configurée ou sans match du jour
+        demo = not matches
+        matches = DEMO_MATCHES if demo else matches
+        predictions = predictor.predict_many(matches)
+        return PredictionSnapshot(predictions, demo=demo, build_seconds=time.perf_counter() - start)
+
+    def build_markets(self, snapshot, markets):
+        """
+        `snapshot` limité à `markets` (bloquant, ValueError si marché inconnu): sélection dans les
+        marchés déjà calculés, aucune IA relancée (voir ErosPredictor.select_markets)
+        """
+        start = time.perf_counter()
+        predictions = self._get_predictor().select_markets(snapshot.predictions, markets)
+        return PredictionSnapshot(predictions, demo=snapshot.demo, build_seconds=time.perf_counter() - start,
+                                  markets=sorted(markets))
+
+    async def market_snapshot(self, markets):
+        """
+        Snapshot courant limité à `markets`, construit une fois par snapshot et par sélection
+        (les requêtes simultanées sur une même sélection attendent la même construction).
+        None tant que le premier snapshot n'est pas prêt.
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
+            return None
+        if self._market_source is not snapshot:
+            self._market_snapshots = {}
+            self._market_builds = {}
+            self._market_source = snapshot
+        key = frozenset(markets)
+        cached = self._market_snapshots.get(key)
+        if cached is not None:
+            return cached
+        builds = self._market_builds
+        future = builds.get(key)
+        if future is None:
+            future = builds[key] = asyncio.get_running_loop().run_in_executor(None, self.build_markets, snapshot, key)
+            future.add_done_callback(lambda done: self._market_built(snapshot, builds, key, done))
+        # asyncio.shield: une requête annulée n'annule pas la construction partagée
+        return await asyncio.shield(future)
+
+    def _market_built(self, snapshot, builds, key, future):
+        builds.pop(key, None)
+        if future.cancelled() or future.exception() is not None or self._market_source is not snapshot:
+            return
+        self._market_snapshots[key] = future.result()
+        while len(self._market_snapshots) > self.MAX_MARKET_SNAPSHOTS:
+            self._market_snapshots.pop(next(iter(self._market_snapshots)))
+
+    async def refresh(self):
+        """
+        Recalcule le snapshot; les appels qui attendent ensemble partagent le même calcul.
+        Un calcul déjà en cours à l'arrivée de l'appel ne compte pas: il a lu les matchs
+        avant (ex: avant la fin de l'ingestion qui demande ce recalcul).
+        """
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        # Calculs commencés avant cet appel (celui en cours compris)
+        builds = self._builds_started
+        async with self._refresh_lock:
+            if self._builds_started != builds:
+                # Un calcul commencé après l'arrivée de cet appel s'est terminé pendant l'attente
+                return self.snapshot
+            self._builds_started += 1
+            try:
+                snapshot = await asyncio.get_running_loop().run_in_executor(None, self.build)
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"❌ Snapshot des prédictions non recalculé: {e}")
+                return self.snapshot
+            previous = self.snapshot
+            if previous is not None and snapshot.content_hash == previous.content_hash:
+                # Prédictions inchangées: même corps et même ETag (les clients gardent leur 304)
+                snapshot = previous
+            # Remplacement atomique: une requête en cours garde l'ancien snapshot complet
+            self.snapshot = snapshot
+            self.last_error = None
+            self.refreshes += 1
+            print(f"✅ Snapshot des prédictions: {snapshot.count} matchs en {snapshot.build_seconds:.2f}s")
+            if snapshot is not previous:
+                for callback in self._listeners:
+                    try:
+                        callback(previous, snapshot)
+                    except Exception as e:
+                        print(f"⚠️ Notification du nouveau snapshot échouée: {e}")
+            return snapshot
+
+    def on_snapshot(self, callback):
+        """Enregistre une fonction appelée avec (ancien, nouveau) snapshot quand les prédictions changent"""
+        self._listeners.append(callback)
+
+    async def _run(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Lance le recalcul périodique (à appeler depuis la boucle d'événements)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self):
+        snapshot = self.snapshot
+        return {
+            'ready': snapshot is not None,
+            'count': snapshot.count if snapshot else 0,
+            'generated_at': snapshot.generated_at if snapshot else None,
+            'demo': snapshot.demo if snapshot else None,
+            'build_seconds': round(snapshot.build_seconds, 3) if snapshot else None,
+            'bytes': len(snapshot.body) if snapshot else 0,
+            'refreshes': self.refreshes,
+            'market_selections': len(self._market_snapshots),
+            'last_error': self.last_error
+        }
@@ -0,0 +1,216 @@
+"""
+Eros Bot - Flux temps réel des prédictions et des scores (SSE / WebSocket)
+Un seul diffuseur par processus: chaque changement (nouveau snapshot de prédictions,
+score en direct) est transformé en delta, sérialisé une fois, puis copié dans la file de
+chaque client connecté. Un client ne déclenche aucun calcul côté serveur, quel que soit
+le nombre de tableaux de bord ouverts.
+
+Messages (champ `data`, JSON):
+    predictions: {'etag': ..., 'generated_at': ..., 'changes': [{'match_id', 'match',
+                  'fields': {...}, 'markets': {marché: {champs modifiés}}}], 'removed': [...]}
+    score:       {'match_id', 'event', 'changed': {champ: nouvelle valeur}, 'match'}
+    resync:      le client a décroché (file pleine ou historique dépassé): recharger /api/predictions
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+from collections import deque
+
+# Champs de premier niveau d'une prédiction diffusés quand ils changent
+PREDICTION_DELTA_FIELDS = ('best_market', 'final_prediction', 'final_confidence', 'risk_level', 'recommendation')
+
+
+def prediction_key(prediction):
+    """Identifiant stable d'une prédiction formatée (id API, sinon "A vs B@date")"""
+    return str(prediction.get('match_id') or f"{prediction.get('match')}@{prediction.get('match_date')}")
+
+
+def prediction_deltas(previous, current):
+    """
+    Différences entre deux listes de prédictions formatées
+    Retourne (changements, clés retirées); un changement ne porte que les champs et les
+    champs de marché modifiés (tout, pour un match nouveau).
+    """
+    before = {prediction_key(p): p for p in previous or []}
+    changes = []
+    for prediction in current:
+        key = prediction_key(prediction)
+        old = before.pop(key, None)
+        markets = prediction.get('all_markets', {})
+        if old is None:
+            changes.append({'match_id': key, 'match': prediction.get('match'), 'added': True,
+                            'fields': {f: prediction.get(f) for f in PREDICTION_DELTA_FIELDS},
+                            'markets': markets})
+            continue
+        fields = {f: prediction.get(f) for f in PREDICTION_DELTA_FIELDS if prediction.get(f) != old.get(f)}
+        old_markets = old.get('all_markets', {})
+        changed_markets = {}
+        for name, market in markets.items():
+            old_market = old_markets.get(name) or {}
+            changed = {k: v for k, v in market.items() if old_market.get(k) != v}
+            if changed:
+                changed_markets[name] = changed
+        if fields or changed_markets:
+            changes.append({'match_id': key, 'match': prediction.get('match'),
+                            'fields': fields, 'markets': changed_markets})
+    return changes, list(before)
+
+
+class StreamMessage:
+    """Message diffusé, encodé une fois pour SSE et pour WebSocket"""
+
+    __slots__ = ('id', 'event', 'data', 'sse', 'ws')
+
+    def __init__(self, message_id, event, data):
+        self.id = message_id
+        self.event = event
+        self.data = json.dumps(data, ensure_ascii=False, default=str)
+        self.sse = f"id: {message_id}\nevent: {event}\ndata: {self.data}\n\n".encode('utf-8')
+        self.ws = f'{{"id": {message_id}, "event": "{event}", "data": {self.data}}}'
+
+
+class PredictionBroadcaster:
+    """
+    Diffusion en éventail des deltas vers les clients SSE / WebSocket
+
+    Usage (FastAPI):
+        broadcaster = PredictionBroadcaster()
+        broadcaster.bind()                                   # au démarrage, dans la boucle
+        snapshot_service.on_snapshot(broadcaster.publish_snapshot)
+        live_loop.subscribe(broadcaster.publish_live)        # thread de la boucle live: OK
+        async for message in broadcaster.messages(last_event_id):
+            ...                                              # None = heartbeat
+
+    Queue par client bornée (EROS_STREAM_QUEUE): un client trop lent est vidé et reçoit
+    `resync` au lieu de faire grossir la mémoire. Les EROS_STREAM_HISTORY derniers messages
+    sont rejoués à la reconnexion (Last-Event-ID).
+    """
+
+    def __init__(self, queue_size=None, history=None, heartbeat=None):
+        self.queue_size = queue_size or int(os.getenv("EROS_STREAM_QUEUE", "256"))
+        self.heartbeat = heartbeat or float(os.getenv("EROS_STREAM_HEARTBEAT", "15"))
+        self._history = deque(maxlen=history or int(os.getenv("EROS_STREAM_HISTORY", "500")))
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._loop = None
+        self.last_id = 0
+        self.published = 0
+        self.resyncs = 0
+
+    def bind(self, loop=None):
+        """Boucle d'événements qui porte les clients (à appeler depuis celle-ci si loop est omis)"""
+        self._loop = loop or asyncio.get_running_loop()
+
+    # ---------- Publication ----------
+
+    def publish(self, event, data):
+        """Diffuse un message (appelable depuis n'importe quel thread)"""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        # Sous verrou: les messages entrent dans les files dans l'ordre de leurs ids
+        with self._lock:
+            message = StreamMessage(next(self._ids), event, data)
+            self.last_id = message.id
+            loop = self._loop
+            if loop is None or loop.is_closed():
+                # Aucun client possible: on garde seulement l'historique
+                self._history.append(message)
+            elif running is loop:
+                self._dispatch(message)
+            else:
+                loop.call_soon_threadsafe(self._dispatch, message)
+        return message
+
+    def _dispatch(self, message):
+        """Copie le message dans la file de chaque client (dans la boucle d'événements)"""
+        self._history.append(message)
+        self.published += 1
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._resync(queue)
+
+    def _resync(self, queue):
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(StreamMessage(self.last_id, 'resync', {'reason': 'lagging'}))
+        self.resyncs += 1
+
+    def publish_snapshot(self, previous, snapshot):
+        """Listener de PredictionSnapshotService: diffuse les marchés modifiés"""
+        changes, removed = prediction_deltas(previous.predictions if previous else [], snapshot.predictions)
+        if not changes and not removed:
+            return None
+        return self.publish('predictions', {
+            'etag': snapshot.etag,
+            'generated_at': snapshot.generated_at,
+            'demo': snapshot.demo,
+            'changes': changes,
+            'removed': removed
+        })
+
+    def publish_live(self, event):
+        """Abonné de LiveMatchLoop: diffuse les champs de score modifiés"""
+        match = event.get('match') or {}
+        return self.publish('score', {
+            'match_id': event.get('match_id'),
+            'event': event.get('event'),
+            'match': f"{match.get('home_team', '?')} vs {match.get('away_team', '?')}",
+            'changed': {field: match.get(field) for field in event.get('changed', [])}
+        })
+
+    # ---------- Clients ----------
+
+    def _replay(self, last_event_id):
+        """Messages manqués depuis last_event_id, ou resync si l'historique ne remonte pas assez loin"""
+        try:
+            last_event_id = int(last_event_id)
+        except (TypeError, ValueError):
+            return []
+        history = list(self._history)
+        if last_event_id >= self.last_id:
+            return []
+        if not history or history[0].id > last_event_id + 1:
+            self.resyncs += 1
+            return [StreamMessage(self.last_id, 'resync', {'reason': 'history'})]
+        return [message for message in history if message.id > last_event_id]
+
+    async def messages(self, last_event_id=None, hello=None):
+        """
+        Messages d'un client jusqu'à sa déconnexion; None toutes les `heartbeat` secondes
+        hello: données du premier message (ex: ETag du snapshot courant)
+        """
+        if self._loop is None:
+            self.bind()
+        queue = asyncio.Queue(self.queue_size)
+        self._subscribers.add(queue)
+        # Rejeu calculé avant le premier yield: un message publié ensuite n'arrive que par la file
+        missed = self._replay(last_event_id)
+        try:
+            if hello is not None:
+                yield StreamMessage(self.last_id, 'hello', hello)
+            for message in missed:
+                yield message
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self._subscribers.discard(queue)
+
+    def stats(self):
+        return {
+            'clients': len(self._subscribers),
+            'published': self.published,
+            'last_id': self.last_id,
+            'history': len(self._history),
+            'resyncs': self.resyncs
+        }
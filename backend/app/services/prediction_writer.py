@@ -0,0 +1,159 @@
+"""
+Eros Bot - Écriture groupée des prédictions
+Une prédiction d'ErosPredictor devient:
+- 1 ligne `predictions` (meilleur marché, comme avant)
+- 1 ligne `prediction_logs` par marché du consensus (agent 'meta_orchestrator')
+- 1 ligne `prediction_logs` par vote d'IA sur chaque marché
+le tout en quelques upserts par lots. Chaque ligne porte une clé déterministe
+(match, marché, IA, version des poids): relancer la même journée ne crée aucun doublon
+et ne remet pas en attente une prédiction déjà résolue.
+
+La clé ne contient pas l'issue prédite: avec la même version des poids, seule la première
+prédiction d'un (match, marché, IA) est conservée, une nouvelle prédiction différente
+(cotes ou forme mises à jour dans la journée) est ignorée. Une nouvelle version des poids
+produit de nouvelles lignes. Schéma Supabase: backend/migrations/003_prediction_keys.sql
+"""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from time import perf_counter_ns
+
+from backend.app.services import metrics
+
+CONSENSUS_AGENT = 'meta_orchestrator'
+PERSISTENCE = metrics.stage('persistence')
+
+
+def prediction_key(match_ref, market_type, agent_name, weights_version):
+    raw = f"{match_ref}|{market_type}|{agent_name}|{weights_version}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class PredictionWriter:
+    """
+    Persistance des prédictions en lots, synchrone ou en tâche de fond
+
+    Usage:
+        writer = PredictionWriter(supabase)
+        writer.save(predictions)                # bloquant, retourne un résumé
+        future = writer.save_async(predictions) # rend la main tout de suite
+        writer.flush()                          # attend les écritures en cours
+    """
+
+    CHUNK_SIZE = 500
+
+    def __init__(self, client, chunk_size=None):
+        self.supabase = client
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        # Un seul thread d'écriture: les lots partent dans l'ordre de soumission
+        self._executor = None
+        self._pending = []
+
+    # ---------- Construction des lignes ----------
+
+    @staticmethod
+    def build_rows(predictions):
+        """(lignes predictions, lignes prediction_logs) d'un lot de prédictions formatées"""
+        now = datetime.now().isoformat()
+        prediction_rows, log_rows = [], []
+        seen = set()
+        for pred in predictions:
+            if pred.get('final_prediction') in (None, 'ERROR'):
+                continue
+            match_id = pred.get('match_id') or pred.get('match')
+            # Sans id API, "A vs B" ne suffit pas à distinguer deux rencontres: on ajoute la date
+            match_ref = pred.get('match_id') or f"{pred.get('match')}@{pred.get('match_date')}"
+            weights_version = pred.get('details', {}).get('weights_version')
+            key = prediction_key(match_ref, pred.get('best_market'), None, weights_version)
+            if key in seen:
+                continue
+            seen.add(key)
+            prediction_rows.append({
+                'prediction_key': key,
+                'match_id': match_id,
+                'league': pred.get('league'),
+                'best_market': pred.get('best_market'),
+                'prediction_type': pred['final_prediction'],
+                'confidence_score': pred['final_confidence'],
+                'risk_level': pred.get('risk_level'),
+                'weights_version': weights_version,
+                'status': 'pending',
+                'created_at': now
+            })
+
+            votes = [(CONSENSUS_AGENT, pred.get('all_markets', {}))]
+            votes.extend(pred.get('agent_votes', {}).items())
+            for agent_name, markets in votes:
+                for market_type, market in markets.items():
+                    log_rows.append({
+                        'prediction_key': prediction_key(match_ref, market_type, agent_name, weights_version),
+                        'match_id': match_id,
+                        'agent_name': agent_name,
+                        'market_type': market_type,
+                        'predicted_outcome': market['prediction'],
+                        'confidence': market['confidence'],
+                        'weights_version': weights_version,
+                        'predicted_at': now,
+                        'status': 'pending'
+                    })
+        return prediction_rows, log_rows
+
+    # ---------- Écriture ----------
+
+    def _write(self, table, rows, summary):
+        for i in range(0, len(rows), self.chunk_size):
+            try:
+                # ignore_duplicates: une ligne déjà présente (éventuellement résolue) reste intacte,
+                # même si l'issue prédite a changé depuis (voir l'en-tête du module)
+                self.supabase.table(table).upsert(
+                    rows[i:i + self.chunk_size], on_conflict='prediction_key', ignore_duplicates=True
+                ).execute()
+                summary['requests'] += 1
+                summary['rows'] += len(rows[i:i + self.chunk_size])
+            except Exception as e:
+                print(f"⚠️ Erreur sauvegarde ({table}, lot {i // self.chunk_size + 1}): {e}")
+                summary['errors'] += 1
+
+    def save(self, predictions, verbose=True):
+        """Écrit un lot de prédictions, retourne un résumé (lignes, requêtes, erreurs, temps; affiché si verbose)"""
+        start = perf_counter_ns()
+        summary = {'predictions': 0, 'logs': 0, 'rows': 0, 'requests': 0, 'errors': 0}
+        if not self.supabase:
+            summary['errors'] = 1
+            return summary
+
+        prediction_rows, log_rows = self.build_rows(predictions)
+        summary['predictions'] = len(prediction_rows)
+        summary['logs'] = len(log_rows)
+        self._write('predictions', prediction_rows, summary)
+        self._write('prediction_logs', log_rows, summary)
+
+        elapsed = perf_counter_ns() - start
+        summary['elapsed_seconds'] = round(elapsed / 1e9, 3)
+        PERSISTENCE.record(elapsed)
+        if summary['errors']:
+            PERSISTENCE.error(summary['errors'])
+        if verbose:
+            print(f"\n✅ {summary['predictions']} prédictions et {summary['logs']} votes sauvegardés dans Supabase "
+                  f"({summary['requests']} requêtes, {summary['elapsed_seconds']}s)")
+        return summary
+
+    def save_async(self, predictions, verbose=True):
+        """Écrit le lot en tâche de fond (fire-and-forget), retourne le Future du résumé"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prediction-writer')
+        future = self._executor.submit(self.save, list(predictions), verbose)
+        self._pending = [f for f in self._pending if not f.done()] + [future]
+        return future
+
+    def flush(self, timeout=None):
+        """Attend la fin des écritures en tâche de fond"""
+        for future in self._pending:
+            future.result(timeout=timeout)
+        self._pending = []
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
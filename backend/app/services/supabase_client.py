@@ -0,0 +1,213 @@
+"""
+Eros Bot - Client de stockage partagé du processus
+Le .env est chargé une seule fois et le client (Supabase, ou SQLite locale avec
+EROS_STORAGE=sqlite) n'est créé qu'à la première demande, puis partagé par ErosPredictor,
+PerformanceTracker, MatchService et le backtest. Rien n'est lu ni importé au chargement du
+module: `supabase` (plusieurs centaines de ms d'import) ne l'est que si un client est demandé.
+
+Les requêtes PostgREST passent par un pool de connexions keep-alive unique (http_pool),
+avec timeouts et relances configurables:
+    EROS_SUPABASE_TIMEOUT=10          # secondes par requête
+    EROS_SUPABASE_CONNECT_TIMEOUT=5   # secondes pour ouvrir une connexion
+    EROS_SUPABASE_RETRIES=2           # relances (connexion impossible, 502/503/504 en lecture)
+    EROS_SUPABASE_POOL_SIZE=10        # connexions simultanées max
+
+Usage:
+    client = get_supabase_client()               # None si rien n'est configuré
+    client = await get_async_supabase_client()   # API FastAPI (Supabase uniquement)
+    storage_stats()                              # clients créés, connexions ouvertes, relances...
+
+Les messages de connexion partent sur stderr: stdout reste aux rapports (jsonl parsable).
+"""
+
+import os
+import sys
+import threading
+from pathlib import Path
+
+from backend.app.services.local_storage import local_storage_client, storage_backend
+
+ROOT = Path(__file__).resolve().parents[3]
+
+# Premier fichier trouvé chargé (les variables déjà définies dans l'environnement gagnent)
+ENV_PATHS = (
+    Path('/sdcard/Eros_bot_app/backend/.env'),
+    Path('/sdcard/Eros_bot_app/.env'),
+    ROOT / 'backend' / '.env',
+    ROOT / '.env',
+)
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_RETRIES = 2
+DEFAULT_POOL_SIZE = 10
+
+_lock = threading.RLock()
+_env_loaded = False
+_client = None
+_client_ready = False
+_async_client = None
+_async_lock = None
+_pool_stats = None
+_transports = []
+_clients_created = 0
+
+
+def load_environment():
+    """Charge le .env une fois par processus; retourne le chemin chargé (ou None)"""
+    global _env_loaded
+    with _lock:
+        if _env_loaded:
+            return None
+        _env_loaded = True
+        try:
+            from dotenv import load_dotenv
+        except ImportError:
+            print("⚠️ python-dotenv non installé (optionnel)", file=sys.stderr)
+            return None
+        for env_path in ENV_PATHS:
+            if env_path.exists():
+                load_dotenv(dotenv_path=env_path)
+                print(f"✅ .env chargé: {env_path}", file=sys.stderr)
+                return env_path
+    return None
+
+
+def _settings():
+    """(timeout httpx, relances, taille du pool) depuis EROS_SUPABASE_*"""
+    from backend.app.services.http_pool import timeout_config
+
+    timeout = timeout_config(float(os.getenv("EROS_SUPABASE_TIMEOUT", DEFAULT_TIMEOUT)),
+                             float(os.getenv("EROS_SUPABASE_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)))
+    retries = max(0, int(os.getenv("EROS_SUPABASE_RETRIES", DEFAULT_RETRIES)))
+    pool_size = max(1, int(os.getenv("EROS_SUPABASE_POOL_SIZE", DEFAULT_POOL_SIZE)))
+    return timeout, retries, pool_size
+
+
+def _credentials():
+    supa_url = os.getenv("SUPABASE_URL")
+    supa_key = os.getenv("SUPABASE_KEY")
+    if not supa_url or not supa_key:
+        return None
+    return supa_url, supa_key
+
+
+def _stats():
+    global _pool_stats
+    if _pool_stats is None:
+        from backend.app.services.http_pool import PoolStats
+        _pool_stats = PoolStats()
+    return _pool_stats
+
+
+def _create_client():
+    global _clients_created
+
+    load_environment()
+    # EROS_STORAGE=sqlite: base locale à la place de Supabase (backtests, tests, hors ligne)
+    client = local_storage_client()
+    if client is not None:
+        _clients_created += 1
+        return client
+
+    credentials = _credentials()
+    if credentials is None:
+        return None
+    try:
+        from supabase import create_client, ClientOptions
+        from backend.app.services.http_pool import PooledTransport, attach_pool
+    except ImportError:
+        print("⚠️ Supabase non disponible (pip install supabase)", file=sys.stderr)
+        return None
+    try:
+        timeout, retries, pool_size = _settings()
+        client = create_client(*credentials, options=ClientOptions(postgrest_client_timeout=timeout))
+        transport = PooledTransport(_stats(), pool_size=pool_size, retries=retries)
+        attach_pool(client.postgrest, transport, timeout)
+        _transports.append(transport)
+        _clients_created += 1
+        print(f"✅ Supabase connecté (pool {pool_size} connexions, {retries} relances)", file=sys.stderr)
+        return client
+    except Exception as e:
+        print(f"⚠️ Supabase non connecté: {e}", file=sys.stderr)
+        return None
+
+
+async def _create_async_client():
+    global _clients_created
+
+    credentials = _credentials()
+    if credentials is None:
+        return None
+    try:
+        from supabase import acreate_client, ClientOptions
+        from backend.app.services.http_pool import AsyncPooledTransport, attach_pool
+    except ImportError:
+        print("⚠️ Supabase non disponible (pip install supabase)", file=sys.stderr)
+        return None
+    try:
+        timeout, retries, pool_size = _settings()
+        client = await acreate_client(*credentials, options=ClientOptions(postgrest_client_timeout=timeout))
+        transport = AsyncPooledTransport(_stats(), pool_size=pool_size, retries=retries)
+        attach_pool(client.postgrest, transport, timeout)
+        _transports.append(transport)
+        _clients_created += 1
+        print(f"✅ Supabase (async) connecté (pool {pool_size} connexions, {retries} relances)", file=sys.stderr)
+        return client
+    except Exception as e:
+        print(f"⚠️ Supabase (async) non connecté: {e}", file=sys.stderr)
+        return None
+
+
+def get_supabase_client():
+    """Client partagé du processus (créé au premier appel), ou None si indisponible"""
+    global _client, _client_ready
+    if _client_ready:
+        return _client
+    with _lock:
+        if not _client_ready:
+            _client = _create_client()
+            _client_ready = True
+    return _client
+
+
+async def get_async_supabase_client():
+    """
+    Client asynchrone partagé (requêtes à `await`), créé au premier appel dans la boucle de l'API.
+    None si Supabase n'est pas configuré ou avec EROS_STORAGE=sqlite (base locale synchrone:
+    utiliser get_supabase_client() dans un exécuteur).
+    """
+    global _async_client, _async_lock
+    load_environment()
+    if storage_backend() == 'sqlite':
+        return None
+    if _async_client is not None:
+        return _async_client
+    if _async_lock is None:
+        import asyncio
+        _async_lock = asyncio.Lock()
+    async with _async_lock:
+        if _async_client is None:
+            _async_client = await _create_async_client()
+    return _async_client
+
+
+def storage_stats():
+    """Métriques du stockage pour le processus: clients créés, connexions HTTP ouvertes, relances"""
+    stats = {'backend': storage_backend(), 'clients_created': _clients_created}
+    stats.update(_pool_stats.snapshot() if _pool_stats is not None else dict.fromkeys(
+        ('connections_opened', 'requests', 'retries', 'errors'), 0))
+    return stats
+
+
+async def close_clients():
+    """Ferme les pools HTTP (arrêt de l'API); les clients sont recréés à la demande suivante"""
+    global _client, _client_ready, _async_client
+    with _lock:
+        transports, _transports[:] = list(_transports), []
+        _client, _client_ready, _async_client = None, False, None
+    for transport in transports:
+        if hasattr(transport, 'aclose'):
+            await transport.aclose()
+        else:
+            transport.close()
@@ -0,0 +1,168 @@
+"""
+Eros Bot - Client HTTP asynchrone commun (aiohttp)
+Base des connecteurs async: session partagée avec limite de connexions,
+rate limiting par hôte (TokenBucket partagé avec les connecteurs synchrones
+si besoin), cache HTTP optionnel et annulation propre des requêtes en vol.
+"""
+
+import asyncio
+import json
+from urllib.parse import urlparse
+
+import aiohttp
+
+try:
+    from .rate_limiter import TokenBucket
+except ImportError:
+    from rate_limiter import TokenBucket
+
+
+class _CacheablePayload:
+    """Réponse aiohttp déjà lue, au format attendu par HttpCache.store()"""
+
+    def __init__(self, headers, text):
+        self.headers = headers
+        self.text = text
+
+
+class AsyncHttpClient:
+    """
+    Client aiohttp partagé par les connecteurs asynchrones
+
+    Usage:
+        async with AsyncFootballDataOrgConnector() as connector:
+            matches = await connector.get_matches_for_competition('PL', d1, d2)
+    """
+
+    def __init__(self, headers=None, max_connections=10, max_connections_per_host=None,
+                 timeout=15, rate_limiters=None, default_rate_limit=None, cache=None):
+        """
+        rate_limiters: {hôte: TokenBucket} pour partager un quota existant
+        default_rate_limit: fabrique (hôte → TokenBucket) pour les hôtes non listés, None = illimité
+        """
+        self.headers = headers or {}
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host or max_connections
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.rate_limiters = dict(rate_limiters or {})
+        self.default_rate_limit = default_rate_limit
+        self.cache = cache
+        self._session = None
+
+    # ---------- Cycle de vie ----------
+
+    def _get_session(self):
+        # Créée paresseusement: aiohttp exige une boucle d'événements active
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, headers=self.headers, timeout=self.timeout
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # ---------- Requêtes ----------
+
+    def limiter_for(self, url):
+        """TokenBucket de l'hôte de l'URL (None si non limité)"""
+        host = urlparse(url).netloc
+        limiter = self.rate_limiters.get(host)
+        if limiter is None and self.default_rate_limit is not None:
+            limiter = self.rate_limiters[host] = self.default_rate_limit(host)
+        return limiter
+
+    async def get_json(self, url, params=None, use_cache=True):
+        """
+        GET JSON rate-limité (par hôte) et mis en cache
+        Lève aiohttp.ClientResponseError pour un statut HTTP >= 400.
+        Une annulation (asyncio.CancelledError) libère le jeton et se propage.
+        """
+        cache = self.cache if use_cache else None
+        entry = None
+        if cache is not None:
+            entry = await asyncio.to_thread(cache.get, url, params)
+            if entry is not None and cache.is_fresh(entry):
+                cache.record_hit(entry)
+                return _loads(entry['body'])
+
+        extra_headers = cache.conditional_headers(entry) if entry is not None else None
+        limiter = self.limiter_for(url)
+        session = self._get_session()
+
+        for _ in range(2):
+            if limiter is not None:
+                await limiter.acquire_async()
+            try:
+                async with session.get(url, params=params, headers=extra_headers) as response:
+                    status = response.status
+                    headers = response.headers
+                    text = await response.text()
+                    request_info, history = response.request_info, response.history
+            except BaseException:
+                # Erreur réseau ou annulation: la requête n'a pas consommé de réponse
+                if limiter is not None:
+                    limiter.release()
+                raise
+            if limiter is not None:
+                limiter.update_from_headers(headers, status)
+            if status != 429:
+                break
+
+        if cache is not None:
+            if status == 304 and entry is not None:
+                entry = await asyncio.to_thread(cache.refresh, url, params, entry)
+                return _loads(entry['body'])
+            if status == 200:
+                await asyncio.to_thread(cache.store, url, params, _CacheablePayload(headers, text))
+
+        if status >= 400:
+            raise aiohttp.ClientResponseError(request_info, history, status=status, message=text[:200])
+        return _loads(text)
+
+    async def run_jobs(self, jobs, timeout=None):
+        """
+        Lance des IngestionJob (key, method, args) en parallèle
+        Retourne {key: résultat}. Si `timeout` expire, les jobs restants sont annulés
+        et absents du résultat.
+        """
+        tasks = {asyncio.ensure_future(getattr(self, job.method)(*job.args)): job.key for job in jobs}
+        if not tasks:
+            return {}
+
+        done = set()
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=timeout)
+        finally:
+            # Timeout ou annulation de l'appelant: on annule tout ce qui reste en vol
+            unfinished = [task for task in tasks if task not in done]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+
+        results = {}
+        for task in done:
+            if task.exception() is None:
+                results[tasks[task]] = task.result()
+            else:
+                print(f"❌ Job {tasks[task]} en erreur: {task.exception()}")
+        if unfinished:
+            print(f"⚠️  {len(unfinished)} jobs annulés (timeout {timeout}s)")
+        return results
+
+
+def _loads(text):
+    return json.loads(text) if text else {}
@@ -1,9 +1,17 @@
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 import os
-import time
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+try:
+    from .rate_limiter import TokenBucket
+    from .http_cache import HttpCache, CachedResponse
+except ImportError:
+    from rate_limiter import TokenBucket
+    from http_cache import HttpCache, CachedResponse
+
 load_dotenv()
 
 class FootballDataOrgConnector:
@@ -12,8 +20,28 @@ class FootballDataOrgConnector:
     Gère la récupération des matchs, compétitions et données associées
     """
     
-    def __init__(self):
-        """Initialise le connecteur avec la clé API"""
+    # Compétitions servies par l'endpoint global /matches (offre gratuite)
+    GLOBAL_ENDPOINT_COMPETITIONS = frozenset(
+        os.getenv(
+            "FOOTBALL_DATA_GLOBAL_COMPETITIONS",
+            "WC,CL,BL1,DED,BSA,PD,FL1,ELC,PPL,EC,SA,PL"
+        ).split(',')
+    )
+    # Plage maximale acceptée par dateFrom/dateTo
+    MAX_RANGE_DAYS = 10
+    # Cache HTTP par défaut: <racine du repo>/.cache/football_data
+    DEFAULT_CACHE_DIR = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        '.cache', 'football_data'
+    )
+    
+    def __init__(self, rate_limiter=None, cache=None, use_cache=True):
+        """
+        Initialise le connecteur avec la clé API
+        rate_limiter: TokenBucket partagé (créé automatiquement sur le quota 10 req/min sinon)
+        cache: HttpCache à utiliser (FOOTBALL_DATA_CACHE_DIR ou .cache/football_data par défaut)
+        use_cache: False pour désactiver complètement le cache disque
+        """
         self.api_key = os.getenv("FOOTBALL_DATA_API_KEY")
         self.base_url = os.getenv("FOOTBALL_DATA_BASE_URL", "https://api.football-data.org/v4")
         
@@ -23,20 +51,79 @@ class FootballDataOrgConnector:
         self.headers = {
             'X-Auth-Token': self.api_key
         }
+        
+        if rate_limiter is None:
+            rate_limiter = TokenBucket(
+                capacity=int(os.getenv("FOOTBALL_DATA_RATE_LIMIT", "10")),
+                period=60.0
+            )
+        self.rate_limiter = rate_limiter
+        
+        # Session keep-alive partagée: une poignée de main TCP+TLS par connexion du pool,
+        # pool dimensionné sur le nombre de requêtes en vol autorisées
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, self.rate_limiter.capacity))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        if cache is None and use_cache:
+            cache = HttpCache(os.getenv("FOOTBALL_DATA_CACHE_DIR", self.DEFAULT_CACHE_DIR))
+        self.cache = cache if use_cache else None
     
-    def get_matches_by_date(self, date_str):
+    def _request(self, url, params=None, timeout=15, use_cache=True):
         """
-        Récupère les matchs pour une date donnée (endpoint global)
-        ⚠️  Limité aux compétitions majeures uniquement
+        GET rate-limité et mis en cache:
+        - entrée fraîche en cache → réponse servie sans requête (aucun quota consommé)
+        - entrée périmée → GET conditionnel (If-None-Match / If-Modified-Since), 304 = cache
+        - sinon prend un jeton dans le bucket partagé et resynchronise le bucket avec
+          les en-têtes de quota de la réponse. Un 429 est rejoué une fois, après le reset.
+        """
+        cache = self.cache if use_cache else None
+        entry = cache.get(url, params) if cache else None
+        if entry is not None and cache.is_fresh(entry):
+            cache.record_hit(entry)
+            return CachedResponse(entry)
+        
+        extra_headers = cache.conditional_headers(entry) if entry is not None else None
+        for _ in range(2):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, headers=extra_headers, params=params, timeout=timeout)
+            except Exception:
+                self.rate_limiter.release()
+                raise
+            self.rate_limiter.update_from_headers(response.headers, response.status_code)
+            if response.status_code != 429:
+                break
+        
+        if cache:
+            if response.status_code == 304 and entry is not None:
+                return CachedResponse(cache.refresh(url, params, entry))
+            if response.status_code == 200:
+                cache.store(url, params, response)
+        return response
+    
+    def cache_stats(self):
+        """Compteurs du cache HTTP (hits = requêtes économisées sur le quota)"""
+        return self.cache.stats() if self.cache else {}
+    
+    def get_matches_by_date(self, date_str, date_to=None, competitions=None):
+        """
+        Récupère les matchs pour une date (ou une plage date_str → date_to) via l'endpoint global
+        competitions: liste optionnelle de codes pour filtrer (ex: ['PL', 'FL1'])
+        ⚠️  Limité aux compétitions majeures uniquement (GLOBAL_ENDPOINT_COMPETITIONS)
         """
         url = f"{self.base_url}/matches"
         params = {
             'dateFrom': date_str,
-            'dateTo': date_str
+            'dateTo': date_to or date_str
         }
+        if competitions:
+            params['competitions'] = ','.join(competitions)
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
+            response = self._request(url, params=params, timeout=15)
             response.raise_for_status()
             data = response.json()
             return data.get('matches', [])
@@ -62,7 +149,7 @@ class FootballDataOrgConnector:
         }
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
+            response = self._request(url, params=params, timeout=15)
             response.raise_for_status()
             data = response.json()
             matches = data.get('matches', [])
@@ -77,28 +164,46 @@ class FootballDataOrgConnector:
             print(f"❌ Erreur Football-Data.org ({competition_code}): {e}")
             return []
     
+    def _get_live_status(self, status):
+        url = f"{self.base_url}/matches"
+        try:
+            response = self._request(url, params={'status': status}, timeout=15)
+            response.raise_for_status()
+            return response.json().get('matches', [])
+        except Exception as e:
+            print(f"❌ Erreur Football-Data.org Live ({status}): {e}")
+            return []
+    
     def get_live_matches(self):
         """
         Récupère les matchs en cours (IN_PLAY ou PAUSED)
+        Les deux statuts partent en parallèle (le token bucket suffit à respecter le quota)
         """
-        all_live_matches = []
-        
         # football-data.org n'accepte qu'un seul status à la fois
-        for status in ['IN_PLAY', 'PAUSED']:
-            url = f"{self.base_url}/matches"
-            params = {'status': status}
-            
-            try:
-                response = requests.get(url, headers=self.headers, params=params, timeout=15)
-                response.raise_for_status()
-                data = response.json()
-                matches = data.get('matches', [])
-                all_live_matches.extend(matches)
-                time.sleep(0.1)  # Petit délai entre les appels
-            except Exception as e:
-                print(f"❌ Erreur Football-Data.org Live ({status}): {e}")
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            in_play, paused = pool.map(self._get_live_status, ['IN_PLAY', 'PAUSED'])
+        
+        # Un match qui passe de IN_PLAY à PAUSED entre les deux appels n'est gardé qu'une fois
+        all_live_matches = {}
+        for match in in_play + paused:
+            all_live_matches[match.get('id')] = match
+        return list(all_live_matches.values())
+    
+    def get_match(self, match_id):
+        """
+        Récupère un match par son id (ex: score final d'un match sorti du direct)
+        """
+        url = f"{self.base_url}/matches/{match_id}"
         
-        return all_live_matches
+        try:
+            response = self._request(url, timeout=15)
+            response.raise_for_status()
+            data = response.json()
+            # v4 renvoie le match à la racine, v2 sous la clé 'match'
+            return data.get('match', data)
+        except Exception as e:
+            print(f"❌ Erreur Football-Data.org match ({match_id}): {e}")
+            return None
     
     def get_competitions(self):
         """
@@ -107,7 +212,7 @@ class FootballDataOrgConnector:
         url = f"{self.base_url}/competitions"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
+            response = self._request(url, timeout=15)
             response.raise_for_status()
             data = response.json()
             return data.get('competitions', [])
@@ -125,7 +230,7 @@ class FootballDataOrgConnector:
             params['season'] = season
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
+            response = self._request(url, params=params, timeout=15)
             response.raise_for_status()
             data = response.json()
             return data.get('standings', [])
@@ -147,7 +252,7 @@ class FootballDataOrgConnector:
             params['status'] = status
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=15)
+            response = self._request(url, params=params, timeout=15)
             response.raise_for_status()
             data = response.json()
             return data.get('matches', [])
@@ -155,6 +260,22 @@ class FootballDataOrgConnector:
             print(f"❌ Erreur matchs équipe ({team_id}): {e}")
             return []
     
+    def covers_all_competitions(self, competition_codes):
+        """Vrai si l'endpoint global /matches couvre toutes ces compétitions"""
+        return set(competition_codes) <= self.GLOBAL_ENDPOINT_COMPETITIONS
+    
+    @staticmethod
+    def split_matches_by_day(matches, dates=None):
+        """
+        Répartit des matchs récupérés sur une plage par jour (date UTC du coup d'envoi)
+        dates: jours attendus, toujours présents dans le résultat (liste vide si aucun match)
+        """
+        by_day = {date: [] for date in (dates or [])}
+        for match in matches:
+            day = (match.get('utcDate') or '')[:10]
+            by_day.setdefault(day, []).append(match)
+        return by_day
+    
     def map_match_status(self, status):
         """
         Mappe le statut API vers notre format interne
@@ -211,7 +332,7 @@ class FootballDataOrgConnector:
         """
         try:
             url = f"{self.base_url}/competitions"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self._request(url, timeout=10, use_cache=False)
             
             if response.status_code == 200:
                 comps = response.json().get('competitions', [])
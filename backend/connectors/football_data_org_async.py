@@ -0,0 +1,161 @@
+"""
+Eros Bot - Connecteur football-data.org asynchrone (aiohttp)
+Même surface que FootballDataOrgConnector, sans bloquer la boucle d'événements:
+utilisable depuis FastAPI ou pour lancer toute l'ingestion en parallèle.
+"""
+
+import asyncio
+import os
+
+import aiohttp
+from dotenv import load_dotenv
+
+try:
+    from .async_http import AsyncHttpClient
+    from .football_data_org import FootballDataOrgConnector
+    from .http_cache import HttpCache
+    from .rate_limiter import TokenBucket
+except ImportError:
+    from async_http import AsyncHttpClient
+    from football_data_org import FootballDataOrgConnector
+    from http_cache import HttpCache
+    from rate_limiter import TokenBucket
+
+load_dotenv()
+
+
+class AsyncFootballDataOrgConnector(AsyncHttpClient):
+    """
+    Connecteur asynchrone pour l'API football-data.org
+
+    Usage:
+        async with AsyncFootballDataOrgConnector() as connector:
+            pl, cl = await asyncio.gather(
+                connector.get_matches_for_competition('PL', d1, d2),
+                connector.get_matches_for_competition('CL', d1, d2)
+            )
+    """
+
+    GLOBAL_ENDPOINT_COMPETITIONS = FootballDataOrgConnector.GLOBAL_ENDPOINT_COMPETITIONS
+    MAX_RANGE_DAYS = FootballDataOrgConnector.MAX_RANGE_DAYS
+    DEFAULT_CACHE_DIR = FootballDataOrgConnector.DEFAULT_CACHE_DIR
+
+    def __init__(self, rate_limiter=None, cache=None, use_cache=True, max_connections=None, timeout=15):
+        """
+        rate_limiter: TokenBucket partagé (ex: celui du connecteur synchrone) pour un quota commun
+        cache: HttpCache à utiliser (FOOTBALL_DATA_CACHE_DIR ou .cache/football_data par défaut)
+        max_connections: connexions simultanées (par défaut = capacité du bucket)
+        """
+        self.api_key = os.getenv("FOOTBALL_DATA_API_KEY")
+        self.base_url = os.getenv("FOOTBALL_DATA_BASE_URL", "https://api.football-data.org/v4")
+
+        if not self.api_key:
+            print("⚠️  ATTENTION: Clé API FOOTBALL_DATA_API_KEY non trouvée dans .env")
+
+        if rate_limiter is None:
+            rate_limiter = TokenBucket(
+                capacity=int(os.getenv("FOOTBALL_DATA_RATE_LIMIT", "10")),
+                period=60.0
+            )
+        self.rate_limiter = rate_limiter
+
+        if cache is None and use_cache:
+            cache = HttpCache(os.getenv("FOOTBALL_DATA_CACHE_DIR", self.DEFAULT_CACHE_DIR))
+
+        super().__init__(
+            headers={'X-Auth-Token': self.api_key or ''},
+            max_connections=max_connections or max(1, rate_limiter.capacity),
+            timeout=timeout,
+            cache=cache if use_cache else None,
+            # Un même bucket quel que soit l'hôte: base_url peut être modifiée après coup
+            default_rate_limit=lambda host: self.rate_limiter
+        )
+
+    def cache_stats(self):
+        """Compteurs du cache HTTP (hits = requêtes économisées sur le quota)"""
+        return self.cache.stats() if self.cache else {}
+
+    async def _get(self, path, params, key, error_label):
+        """GET JSON → data[key], liste vide en cas d'erreur (une annulation se propage)"""
+        try:
+            data = await self.get_json(f"{self.base_url}{path}", params=params or None)
+            return data.get(key, [])
+        except asyncio.TimeoutError:
+            print(f"❌ Timeout API ({error_label})")
+            return []
+        except aiohttp.ClientConnectionError:
+            print(f"❌ Erreur de connexion API ({error_label})")
+            return []
+        except Exception as e:
+            print(f"❌ Erreur Football-Data.org ({error_label}): {e}")
+            return []
+
+    async def get_matches_by_date(self, date_str, date_to=None, competitions=None):
+        """
+        Récupère les matchs pour une date (ou une plage date_str → date_to) via l'endpoint global
+        ⚠️  Limité aux compétitions majeures uniquement (GLOBAL_ENDPOINT_COMPETITIONS)
+        """
+        params = {'dateFrom': date_str, 'dateTo': date_to or date_str}
+        if competitions:
+            params['competitions'] = ','.join(competitions)
+        return await self._get("/matches", params, 'matches', f"date {date_str}")
+
+    async def get_matches_for_competition(self, competition_code, date_from, date_to):
+        """Récupère les matchs pour une compétition spécifique"""
+        params = {'dateFrom': date_from, 'dateTo': date_to}
+        return await self._get(f"/competitions/{competition_code}/matches", params, 'matches', competition_code)
+
+    async def get_live_matches(self):
+        """Récupère les matchs en cours (IN_PLAY et PAUSED interrogés en parallèle)"""
+        # football-data.org n'accepte qu'un seul status à la fois
+        results = await asyncio.gather(*(
+            self._get("/matches", {'status': status}, 'matches', f"Live {status}")
+            for status in ('IN_PLAY', 'PAUSED')
+        ))
+        return [match for matches in results for match in matches]
+
+    async def get_competitions(self):
+        """Récupère la liste de toutes les compétitions accessibles"""
+        return await self._get("/competitions", None, 'competitions', "Competitions")
+
+    async def get_competition_standings(self, competition_code, season=None):
+        """Récupère le classement d'une compétition"""
+        params = {'season': season} if season else None
+        return await self._get(f"/competitions/{competition_code}/standings", params, 'standings',
+                               f"classement {competition_code}")
+
+    async def get_team_matches(self, team_id, date_from=None, date_to=None, status=None):
+        """Récupère les matchs d'une équipe spécifique"""
+        params = {}
+        if date_from:
+            params['dateFrom'] = date_from
+        if date_to:
+            params['dateTo'] = date_to
+        if status:
+            params['status'] = status
+        return await self._get(f"/teams/{team_id}/matches", params, 'matches', f"équipe {team_id}")
+
+    # Helpers sans I/O partagés avec le connecteur synchrone
+    covers_all_competitions = FootballDataOrgConnector.covers_all_competitions
+    split_matches_by_day = staticmethod(FootballDataOrgConnector.split_matches_by_day)
+    map_match_status = FootballDataOrgConnector.map_match_status
+    extract_match_data = FootballDataOrgConnector.extract_match_data
+
+
+# ============================================
+# TEST RAPIDE (si exécuté directement)
+# ============================================
+if __name__ == "__main__":
+    from datetime import datetime
+
+    async def _main():
+        today = datetime.now().strftime('%Y-%m-%d')
+        async with AsyncFootballDataOrgConnector() as connector:
+            codes = ['PL', 'PD', 'BL1', 'SA', 'FL1']
+            results = await asyncio.gather(*(
+                connector.get_matches_for_competition(code, today, today) for code in codes
+            ))
+            for code, matches in zip(codes, results):
+                print(f"   {code}: {len(matches)} matchs")
+
+    asyncio.run(_main())
@@ -0,0 +1,172 @@
+"""
+Eros Bot - Cache HTTP sur disque (GET conditionnels)
+Clé = URL + paramètres. Respecte ETag / Last-Modified et un TTL par endpoint:
+tant qu'une entrée est fraîche, aucune requête n'est envoyée (aucun quota consommé);
+une fois périmée, elle est revalidée par un GET conditionnel (304 = pas de téléchargement).
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+# Règles de TTL (secondes), évaluées dans l'ordre: (motif sur le chemin, TTL)
+DEFAULT_TTL_RULES = [
+    (r'/competitions$', 24 * 3600),           # liste des compétitions: 24h
+    (r'/standings$', 3600),                   # classements: 1h
+    (r'/teams/[^/]+/matches$', 1800),         # historique d'une équipe: 30 min
+    (r'/matches$', 600),                      # calendriers / résultats: 10 min
+]
+LIVE_TTL = 15                                 # matchs en direct: 15s
+LIVE_STATUSES = {'IN_PLAY', 'PAUSED', 'LIVE'}
+
+
+class CachedResponse:
+    """Réponse reconstituée depuis le cache (même interface que requests.Response pour nos usages)"""
+
+    def __init__(self, entry, status_code=200):
+        self.status_code = status_code
+        self.headers = entry.get('headers', {})
+        self.text = entry['body']
+        self.from_cache = True
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        return None
+
+
+class HttpCache:
+    """
+    Cache HTTP persistant (un fichier JSON par entrée)
+
+    Usage:
+        cache = HttpCache('.cache/football_data')
+        entry = cache.get(url, params)
+        if entry and cache.is_fresh(entry): ...
+        cache.store(url, params, response)
+    """
+
+    def __init__(self, cache_dir, ttl_rules=None, live_ttl=LIVE_TTL):
+        self.cache_dir = cache_dir
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in (ttl_rules or DEFAULT_TTL_RULES)]
+        self.live_ttl = live_ttl
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.hits = 0           # entrée fraîche servie sans requête
+        self.revalidated = 0    # 304 Not Modified
+        self.misses = 0         # téléchargement complet
+        self.bytes_saved = 0
+
+    # ---------- Clés et TTL ----------
+
+    @staticmethod
+    def key(url, params=None):
+        raw = url + '?' + json.dumps(params or {}, sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def ttl_for(self, url, params=None):
+        """TTL applicable à une requête (0 = toujours revalider)"""
+        if params and params.get('status') in LIVE_STATUSES:
+            return self.live_ttl
+        path = url.split('?', 1)[0]
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(path):
+                return ttl
+        return 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    # ---------- Lecture / écriture ----------
+
+    def get(self, url, params=None):
+        """Entrée en cache (fraîche ou non), None si absente/illisible"""
+        try:
+            with open(self._path(self.key(url, params)), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry):
+        return time.time() - entry.get('stored_at', 0) < entry.get('ttl', 0)
+
+    def conditional_headers(self, entry):
+        """En-têtes If-None-Match / If-Modified-Since pour revalider une entrée"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _write(self, key, entry):
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    def store(self, url, params, response):
+        """Enregistre une réponse 200"""
+        entry = {
+            'url': url,
+            'params': params or {},
+            'stored_at': time.time(),
+            'ttl': self.ttl_for(url, params),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'headers': {'Content-Type': response.headers.get('Content-Type', 'application/json')},
+            'body': response.text
+        }
+        try:
+            self._write(self.key(url, params), entry)
+        except OSError as e:
+            print(f"⚠️  Cache HTTP non écrit ({url}): {e}")
+        with self._lock:
+            self.misses += 1
+        return entry
+
+    def refresh(self, url, params, entry):
+        """Prolonge une entrée revalidée par un 304"""
+        entry['stored_at'] = time.time()
+        entry['ttl'] = self.ttl_for(url, params)
+        try:
+            self._write(self.key(url, params), entry)
+        except OSError:
+            pass
+        with self._lock:
+            self.revalidated += 1
+            self.bytes_saved += len(entry['body'])
+        return entry
+
+    def record_hit(self, entry):
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(entry['body'])
+
+    def stats(self):
+        """Compteurs hit/miss (les hits n'ont consommé aucune requête du quota)"""
+        with self._lock:
+            total = self.hits + self.revalidated + self.misses
+            return {
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'requests_saved': self.hits,
+                'hit_rate': round((self.hits + self.revalidated) / total, 3) if total else 0.0,
+                'bytes_saved': self.bytes_saved
+            }
+
+    def clear(self):
+        """Vide le cache disque"""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
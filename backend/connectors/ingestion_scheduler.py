@@ -0,0 +1,102 @@
+"""
+Eros Bot - Scheduler d'ingestion concurrent
+Pilote FootballDataOrgConnector en parallèle à travers son token bucket:
+autant de requêtes en vol que le quota l'autorise, aucune pause tant qu'il reste du budget.
+"""
+
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# key: identifiant libre (ex: ('PL', '2026-01-10', '2026-01-12')), method: nom de la méthode du connecteur
+IngestionJob = namedtuple('IngestionJob', ['key', 'method', 'args'])
+
+
+def plan_fetch_jobs(connector, competitions, dates, range_fetch=True, include_live=True):
+    """
+    Construit les jobs d'ingestion pour des compétitions × dates (dates triées, consécutives)
+
+    Clés des jobs: (code compétition | 'ALL' | 'LIVE', date_from, date_to)
+    - range_fetch=False: une requête par compétition et par jour (ancien mode)
+    - range_fetch=True: une requête par compétition pour toute la plage (dateFrom/dateTo),
+      ou une seule requête sur l'endpoint global /matches si celui-ci couvre toutes les compétitions
+    """
+    jobs = []
+    if range_fetch:
+        # dateFrom/dateTo est limité à MAX_RANGE_DAYS jours par requête
+        step = connector.MAX_RANGE_DAYS
+        windows = [(dates[i], dates[min(i + step, len(dates)) - 1]) for i in range(0, len(dates), step)]
+        for date_from, date_to in windows:
+            if connector.covers_all_competitions(competitions):
+                jobs.append(IngestionJob(('ALL', date_from, date_to), 'get_matches_by_date',
+                                         (date_from, date_to, list(competitions))))
+            else:
+                jobs.extend(
+                    IngestionJob((comp_code, date_from, date_to), 'get_matches_for_competition',
+                                 (comp_code, date_from, date_to))
+                    for comp_code in competitions
+                )
+    else:
+        jobs.extend(
+            IngestionJob((comp_code, date, date), 'get_matches_for_competition', (comp_code, date, date))
+            for comp_code in competitions
+            for date in dates
+        )
+
+    if include_live:
+        jobs.append(IngestionJob(('LIVE', None, None), 'get_live_matches', ()))
+    return jobs
+
+
+class IngestionScheduler:
+    """
+    Exécute des appels du connecteur en parallèle
+
+    Usage:
+        scheduler = IngestionScheduler(connector)
+        jobs = [IngestionJob(('PL', date), 'get_matches_for_competition', ('PL', date, date))]
+        for key, matches in scheduler.run(jobs):
+            ...
+    """
+
+    def __init__(self, connector, max_in_flight=None):
+        self.connector = connector
+        # Par défaut: exactement le nombre de requêtes autorisées par le quota
+        self.max_in_flight = max_in_flight or connector.rate_limiter.capacity
+        self.jobs_done = 0
+        self.elapsed_seconds = 0.0
+
+    def run(self, jobs):
+        """
+        Lance tous les jobs et rend (key, résultat) au fil de leur complétion
+        Les résultats sont consommés dans le thread appelant (écritures DB non concurrentes)
+        Remet à zéro les statistiques: stats() décrit toujours la dernière exécution.
+        """
+        jobs = list(jobs)
+        self.jobs_done = 0
+        self.elapsed_seconds = 0.0
+        start = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            futures = {
+                pool.submit(getattr(self.connector, job.method), *job.args): job.key
+                for job in jobs
+            }
+            try:
+                for future in as_completed(futures):
+                    self.jobs_done += 1
+                    yield futures[future], future.result()
+            finally:
+                # Arrêt anticipé du consommateur: on n'envoie pas les requêtes restantes
+                for future in futures:
+                    future.cancel()
+                self.elapsed_seconds = time.monotonic() - start
+
+    def stats(self):
+        """Statistiques de la dernière exécution"""
+        return {
+            'jobs': self.jobs_done,
+            'elapsed_seconds': round(self.elapsed_seconds, 2),
+            'max_in_flight': self.max_in_flight,
+            'rate_limiter': self.connector.rate_limiter.stats()
+        }
@@ -0,0 +1,182 @@
+"""
+Eros Bot - Rate limiter partagé (token bucket)
+Répartit le quota football-data.org (10 req/min en gratuit) entre tous les appels
+et se resynchronise sur les en-têtes de quota renvoyés par l'API.
+"""
+
+import asyncio
+import threading
+import time
+
+
+def _parse_header_number(value):
+    """Convertit un en-tête numérique (ex: '7' ou '12.5') en float, None si absent/invalide"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe dimensionné sur le quota de l'API
+
+    - `capacity` jetons disponibles immédiatement (pas d'attente tant qu'il reste du budget)
+    - recharge continue de `capacity` jetons par `period` secondes
+    - `update_from_headers()` aligne le bucket sur X-Requests-Available-Minute /
+      X-RequestCounter-Reset: jusqu'au reset annoncé, le bucket ne dépasse jamais
+      le budget restant côté serveur moins les requêtes encore en vol
+    - utilisable depuis des threads (acquire) comme depuis asyncio (acquire_async)
+    """
+
+    def __init__(self, capacity=10, period=60.0,
+                 available_header='X-Requests-Available-Minute',
+                 reset_header='X-RequestCounter-Reset'):
+        self.capacity = int(capacity)
+        self.period = float(period)
+        self.rate = self.capacity / self.period
+        # En-têtes de quota de l'API (football-data.org par défaut)
+        self.available_header = available_header
+        self.reset_header = reset_header
+
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._in_flight = 0
+        # Budget annoncé par le serveur pour sa fenêtre courante (None = inconnu)
+        self._server_budget = None
+        self._window_end = None
+        self._cond = threading.Condition()
+
+        # Statistiques
+        self.total_acquired = 0
+        self.total_waited = 0.0
+
+    def _refill(self, now):
+        """Recharge le bucket (à appeler sous verrou)"""
+        if self._server_budget is not None and now >= self._window_end:
+            # Nouvelle fenêtre côté serveur → budget complet
+            self._server_budget = None
+            self._window_end = None
+            self._tokens = float(self.capacity)
+
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(float(self.capacity), self._tokens + elapsed * self.rate)
+        if self._server_budget is not None:
+            self._tokens = min(self._tokens, float(self._server_budget))
+        self._updated = now
+
+    def _delay_until_next_token(self, now):
+        """Temps d'attente avant le prochain jeton (à appeler sous verrou)"""
+        if self._server_budget is not None and self._server_budget < 1:
+            return max(0.0, self._window_end - now)
+        return max(0.0, (1.0 - self._tokens) / self.rate)
+
+    def _try_take(self, start):
+        """
+        Tente de prendre un jeton (sous verrou)
+        Retourne (True, temps attendu) ou (False, délai avant le prochain jeton)
+        """
+        now = time.monotonic()
+        self._refill(now)
+
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            self._in_flight += 1
+            if self._server_budget is not None:
+                self._server_budget -= 1
+            waited = now - start
+            self.total_acquired += 1
+            self.total_waited += waited
+            return True, waited
+        return False, self._delay_until_next_token(now)
+
+    @staticmethod
+    def _bounded_delay(delay, start, timeout):
+        if timeout is None:
+            return delay
+        remaining = timeout - (time.monotonic() - start)
+        if remaining <= 0:
+            raise TimeoutError("Quota API épuisé (timeout d'attente du rate limiter)")
+        return min(delay, remaining)
+
+    def acquire(self, timeout=None):
+        """
+        Prend un jeton, en attendant si nécessaire
+        Retourne le temps d'attente en secondes (0.0 si du budget restait)
+        Lève TimeoutError si `timeout` est dépassé
+        """
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                taken, value = self._try_take(start)
+                if taken:
+                    return value
+                # wait() relâche le verrou: un update_from_headers() peut nous réveiller
+                self._cond.wait(self._bounded_delay(value, start, timeout))
+
+    async def acquire_async(self, timeout=None):
+        """Équivalent asyncio de acquire(): attend sans bloquer la boucle d'événements"""
+        start = time.monotonic()
+        while True:
+            with self._cond:
+                taken, value = self._try_take(start)
+            if taken:
+                return value
+            await asyncio.sleep(self._bounded_delay(value, start, timeout))
+
+    def release(self):
+        """Signale qu'une requête prise avec acquire() n'a pas abouti (pas de réponse)"""
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    def update_from_headers(self, headers, status_code=None):
+        """
+        Synchronise le bucket avec les en-têtes de quota de l'API
+        (à appeler une fois par réponse reçue). Pour football-data.org:
+        - X-Requests-Available-Minute: requêtes restantes dans la fenêtre courante
+        - X-RequestCounter-Reset: secondes avant la remise à zéro du compteur
+        """
+        available = _parse_header_number(headers.get(self.available_header))
+        reset_in = _parse_header_number(headers.get(self.reset_header)) if self.reset_header else None
+
+        if available is None and status_code == 429:
+            available = 0
+
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            if available is None:
+                return
+
+            now = time.monotonic()
+            self._refill(now)
+            # Les requêtes encore en vol n'ont peut-être pas été comptées par le serveur.
+            # Dans une même fenêtre les réponses peuvent arriver dans le désordre:
+            # on garde la borne la plus stricte.
+            budget = max(0.0, available - self._in_flight)
+            if self._server_budget is None:
+                self._server_budget = budget
+                self._window_end = now + (reset_in if reset_in is not None else self.period)
+            else:
+                self._server_budget = min(self._server_budget, budget)
+            self._tokens = min(self._tokens, self._server_budget)
+
+            self._cond.notify_all()
+
+    @property
+    def available(self):
+        """Nombre de jetons disponibles immédiatement"""
+        with self._cond:
+            self._refill(time.monotonic())
+            return int(self._tokens)
+
+    def stats(self):
+        """Statistiques d'utilisation du bucket"""
+        return {
+            'capacity': self.capacity,
+            'period_seconds': self.period,
+            'acquired': self.total_acquired,
+            'waited_seconds': round(self.total_waited, 3)
+        }
@@ -0,0 +1,13 @@
+-- Eros Bot - Empreinte du contenu des matchs (MatchService.save_matches_bulk)
+-- La base fait foi: un match n'est ignoré que si son empreinte en base est identique.
+-- save_matches_bulk() upserte les lignes complètes de extract_match_data(): toutes leurs
+-- colonnes doivent exister, sinon PostgREST rejette chaque lot (scores de mi-temps
+-- nécessaires aussi à la résolution des marchés HT_FT / OVER_UNDER_HT).
+-- À exécuter dans l'éditeur SQL Supabase avant de déployer.
+
+alter table matches add column if not exists home_score_ht integer;
+alter table matches add column if not exists away_score_ht integer;
+alter table matches add column if not exists competition_code text;
+alter table matches add column if not exists venue text;
+alter table matches add column if not exists referee text;
+alter table matches add column if not exists content_hash text;
@@ -0,0 +1,22 @@
+-- Eros Bot - Agrégats de précision des IA (PerformanceTracker, table agent_accuracy_daily)
+-- Une ligne par (agent, marché, jour de prédiction), recalculée depuis prediction_logs à chaque
+-- résolution: la clé unique sert de cible aux upserts (on_conflict='agent_name,market_type,day').
+-- À exécuter dans l'éditeur SQL Supabase avant de déployer, puis reprendre l'historique une fois:
+--     python -m backend.app.ai_engine.performance_tracker --rebuild-aggregates
+-- (sans cette reprise, get_optimal_weights() ignore les prédictions résolues avant la migration)
+
+create table if not exists agent_accuracy_daily (
+    id bigint generated by default as identity primary key,
+    agent_name text not null,
+    market_type text not null,
+    day date not null,
+    correct integer not null default 0,
+    total integer not null default 0,
+    sum_confidence double precision not null default 0,
+    updated_at timestamptz default now(),
+    constraint agent_accuracy_daily_key unique (agent_name, market_type, day)
+);
+
+-- Recalcul des agrégats touchés: prédictions résolues d'un jour
+create index if not exists prediction_logs_status_predicted_at_idx
+    on prediction_logs (status, predicted_at);
@@ -0,0 +1,33 @@
+-- Eros Bot - Clés déterministes des prédictions (PredictionWriter)
+-- prediction_key = sha1(match | marché | IA | version des poids): cible des upserts
+-- on_conflict='prediction_key' (contrainte unique obligatoire, sinon PostgREST refuse l'upsert).
+-- Les lignes antérieures gardent une clé NULL (plusieurs NULL sont admis par la contrainte).
+-- À exécuter dans l'éditeur SQL Supabase avant de déployer.
+
+-- predictions: 1 ligne par match (meilleur marché)
+alter table predictions add column if not exists prediction_key text;
+alter table predictions add column if not exists weights_version text;
+alter table predictions add column if not exists league text;
+alter table predictions add column if not exists best_market text;
+alter table predictions add column if not exists risk_level text;
+alter table predictions add column if not exists status text default 'pending';
+
+do $$ begin
+    alter table predictions add constraint predictions_prediction_key_key unique (prediction_key);
+exception when duplicate_object or duplicate_table then null;
+end $$;
+
+-- prediction_logs: 1 ligne par vote d'IA et par marché, plus les lignes du consensus
+-- (agent_name = 'meta_orchestrator', mêmes colonnes que les votes)
+alter table prediction_logs add column if not exists prediction_key text;
+alter table prediction_logs add column if not exists weights_version text;
+alter table prediction_logs add column if not exists market_type text default '1N2';
+alter table prediction_logs add column if not exists actual_outcome text;
+alter table prediction_logs add column if not exists resolved_at timestamptz;
+
+do $$ begin
+    alter table prediction_logs add constraint prediction_logs_prediction_key_key unique (prediction_key);
+exception when duplicate_object or duplicate_table then null;
+end $$;
+
+create index if not exists prediction_logs_match_status_idx on prediction_logs (match_id, status);
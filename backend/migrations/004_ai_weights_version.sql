@@ -0,0 +1,6 @@
+-- Eros Bot - Version des poids sauvegardés (PerformanceTracker.save_weights)
+-- Une ligne par sauvegarde; refresh_weights() lit la plus récente (id le plus grand) et
+-- compare sa version (même empreinte que MetaOrchestratorAgent.weights_version).
+-- À exécuter dans l'éditeur SQL Supabase avant de déployer.
+
+alter table ai_weights add column if not exists version text;
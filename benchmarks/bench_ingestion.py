@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Eros Bot - Benchmark ingestion (serveur bouchon local)
+Compare le temps total d'ingestion de COMPETITIONS_TO_FETCH × 3 dates:
+- séquentiel avec pause fixe (ancien fetch_matches.py: 6.5s après chaque appel)
+- IngestionScheduler + token bucket partagé, jour par jour
+- IngestionScheduler en mode plage (une requête par compétition)
+- mode plage sur le Top 5 (entièrement couvert par l'endpoint global /matches)
+- deux cycles consécutifs avec le cache HTTP (le 2e est servi depuis le disque)
+
+Le quota est mis à l'échelle (--window secondes au lieu de 60) pour que le
+benchmark tourne vite; les temps "équivalent réel" sont extrapolés à 60s.
+
+    python benchmarks/bench_ingestion.py --window 6
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from connectors.football_data_org import FootballDataOrgConnector
+from connectors.rate_limiter import TokenBucket
+from connectors.http_cache import HttpCache
+from connectors.ingestion_scheduler import IngestionScheduler, plan_fetch_jobs
+from benchmarks.stub_football_data import StubFootballDataServer
+
+# Même liste que fetch_matches.py (copiée pour ne pas importer MatchService/Supabase)
+COMPETITIONS = ['PL', 'PD', 'BL1', 'SA', 'FL1', 'CL', 'EL', 'ECL', 'ELC', 'DED', 'PPL', 'BSA', 'CLI']
+TOP5 = ['PL', 'PD', 'BL1', 'SA', 'FL1']
+QUOTA = 10
+
+
+def _dates():
+    return [(datetime.now() + timedelta(days=d)).strftime('%Y-%m-%d') for d in range(3)]
+
+
+def _connector(stub, bucket, cache=None):
+    connector = FootballDataOrgConnector(rate_limiter=bucket, cache=cache, use_cache=cache is not None)
+    connector.base_url = stub.base_url
+    return connector
+
+
+def run_sequential(window, latency):
+    """Ancien algorithme: une requête à la fois + pause fixe (6.5s pour une fenêtre de 60s)"""
+    delay = 6.5 * window / 60.0
+    with StubFootballDataServer(limit=QUOTA, window=window, latency=latency) as stub:
+        # Bucket illimité: seul le sleep fixe rythme les appels, comme avant
+        connector = _connector(stub, TokenBucket(capacity=10**9, period=1.0))
+        dates = _dates()
+        start = time.monotonic()
+        matches = 0
+        for idx, comp in enumerate(COMPETITIONS, 1):
+            for date_idx, date in enumerate(dates):
+                matches += len(connector.get_matches_for_competition(comp, date, date))
+                if not (date_idx == len(dates) - 1 and idx == len(COMPETITIONS)):
+                    time.sleep(delay)
+            if idx < len(COMPETITIONS):
+                time.sleep(delay)
+        matches += len(connector.get_live_matches())
+        elapsed = time.monotonic() - start
+        return {'elapsed': elapsed, 'matches': matches, 'requests': stub.quota.total,
+                'rejected_429': stub.quota.rejected}
+
+
+def run_scheduler(window, latency, competitions=COMPETITIONS, range_fetch=False, cache=None, cycles=1):
+    """Nouvel algorithme: token bucket partagé + requêtes en parallèle (dernier cycle mesuré)"""
+    with StubFootballDataServer(limit=QUOTA, window=window, latency=latency) as stub:
+        connector = _connector(stub, TokenBucket(capacity=QUOTA, period=window), cache)
+        for _ in range(cycles):
+            requests_before = stub.quota.total
+            scheduler = IngestionScheduler(connector)
+            jobs = plan_fetch_jobs(connector, competitions, _dates(), range_fetch=range_fetch)
+            start = time.monotonic()
+            matches = sum(len(result) for _, result in scheduler.run(jobs))
+            elapsed = time.monotonic() - start
+        return {'elapsed': elapsed, 'matches': matches, 'requests': stub.quota.total - requests_before,
+                'rejected_429': stub.quota.rejected, 'cache': connector.cache_stats()}
+
+
+def _report(label, result, scale):
+    print(f"   {label:<28} {result['elapsed']:7.2f}s  (≈ {result['elapsed'] * scale / 60:5.1f} min réelles)"
+          f" | {result['requests']} requêtes | {result['rejected_429']} × 429 | {result['matches']} matchs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--window', type=float, default=6.0, help="durée de la fenêtre de quota (s), 60 = réel")
+    parser.add_argument('--latency', type=float, default=0.15, help="latence simulée par requête (s)")
+    parser.add_argument('--skip-sequential', action='store_true', help="ne lance pas la référence séquentielle")
+    args = parser.parse_args()
+
+    scale = 60.0 / args.window
+    print("=" * 70)
+    print(f"⏱️  BENCHMARK INGESTION - {len(COMPETITIONS)} compétitions × 3 dates "
+          f"(quota {QUOTA} req / {args.window:g}s)")
+    print("=" * 70)
+
+    if not args.skip_sequential:
+        _report("Séquentiel + pause fixe", run_sequential(args.window, args.latency), scale)
+    _report("Scheduler + token bucket", run_scheduler(args.window, args.latency), scale)
+    _report("Scheduler + plage de dates", run_scheduler(args.window, args.latency, range_fetch=True), scale)
+    print("-" * 70)
+    _report("Top 5 jour par jour", run_scheduler(args.window, args.latency, TOP5), scale)
+    _report("Top 5 endpoint global", run_scheduler(args.window, args.latency, TOP5, range_fetch=True), scale)
+    print("-" * 70)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        result = run_scheduler(args.window, args.latency, range_fetch=True, cache=HttpCache(cache_dir), cycles=2)
+        _report("2e cycle avec cache HTTP", result, scale)
+        print(f"   cache: {result['cache']}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Eros Bot - Benchmark prédictions limitées à certains marchés
+Mesure, pour tous les marchés puis pour des sélections (1N2, 1N2 + DOUBLE_CHANCE...):
+- la latence de ErosPredictor.predict_match() match par match et de predict_many() sur le lot
+- les allocations (pic tracemalloc et nombre de blocs alloués) d'un predict_many()
+Le cache de prédictions est désactivé: chaque passage recalcule les IA.
+
+    python benchmarks/bench_markets.py --fixtures 10000 --single 2000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.app.ai_engine.predictor import ErosPredictor
+from bench_predict_many import make_fixtures
+
+SELECTIONS = (None, ('1N2',), ('1N2', 'DOUBLE_CHANCE'), ('OVER_UNDER_2.5', 'BTTS'))
+
+
+def allocations(predictor, fixtures, markets):
+    """(pic en Mo, blocs alloués) pendant un predict_many()"""
+    tracemalloc.start()
+    before = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.reset_peak()
+    predictions = predictor.predict_many(fixtures, markets)
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename')) - before
+    tracemalloc.stop()
+    del predictions
+    return peak / 1e6, blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', type=int, default=10000)
+    parser.add_argument('--single', type=int, default=2000, help="matchs prédits un par un")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor = ErosPredictor()
+    predictor.cache = None
+    fixtures = make_fixtures(args.fixtures)
+    singles = fixtures[:args.single]
+    # Échauffement: équipes internées dans le feature store, plans en cache
+    for markets in SELECTIONS:
+        predictor.predict_many(fixtures[:100], markets)
+
+    print("=" * 86)
+    print(f"🎯 BENCHMARK MARCHÉS DEMANDÉS - {len(fixtures)} matchs (lot), {len(singles)} matchs (unitaire)")
+    print("=" * 86)
+    print(f"   {'Marchés':<26} {'unitaire µs':>12} {'lot matchs/s':>13} {'pic Mo':>8} {'blocs':>10} {'IA':>4}")
+    baseline = None
+    for markets in SELECTIONS:
+        start = time.perf_counter()
+        for match in singles:
+            predictor.predict_match(match, markets)
+        single_us = (time.perf_counter() - start) / len(singles) * 1e6
+
+        start = time.perf_counter()
+        predictions = predictor.predict_many(fixtures, markets)
+        batch_rate = len(fixtures) / (time.perf_counter() - start)
+
+        peak, blocks = allocations(predictor, fixtures, markets)
+        label = ', '.join(markets) if markets else 'tous'
+        agents = len(predictions[0]['details']['agents_used'])
+        print(f"   {label:<26} {single_us:12.1f} {batch_rate:13.0f} {peak:8.1f} {blocks:10d} {agents:4d}")
+        if baseline is None:
+            baseline = (single_us, batch_rate, peak)
+        else:
+            print(f"   {'':<26} {'×' + format(baseline[0] / single_us, '.1f'):>12} "
+                  f"{'×' + format(batch_rate / baseline[1], '.1f'):>13} {'÷' + format(baseline[2] / peak, '.1f'):>8}")
+    print("=" * 86)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Eros Bot - Benchmark écriture des matchs (stand-in PostgREST local)
+Compare le débit (lignes/s) de:
+- save_match_football_data() par match (select puis insert/update: 2 allers-retours par ligne)
+- save_matches_bulk() à froid (upsert par lots)
+- save_matches_bulk() relancé sur les mêmes matchs (lignes inchangées ignorées)
+
+    python benchmarks/bench_match_upsert.py --rows 1000 --latency 0.005
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from supabase import create_client
+
+from connectors.football_data_org import FootballDataOrgConnector
+from backend.app.services.match_service import MatchService
+from benchmarks.stub_football_data import synthetic_matches, BUSY_COMPETITIONS, MATCHES_PER_DAY
+from benchmarks.stub_postgrest import StubPostgrestServer, STUB_KEY
+
+
+def make_matches(rows):
+    """Au moins `rows` matchs synthétiques au format football-data.org"""
+    per_day = len(BUSY_COMPETITIONS) * MATCHES_PER_DAY
+    days = max(1, -(-rows // per_day))
+    date_from = datetime.now()
+    date_to = (date_from + timedelta(days=days - 1)).strftime('%Y-%m-%d')
+    matches = []
+    for code in BUSY_COMPETITIONS:
+        matches.extend(synthetic_matches(code, date_from.strftime('%Y-%m-%d'), date_to))
+    return matches[:rows]
+
+
+def _service(stub):
+    client = create_client(stub.url, STUB_KEY)
+    return MatchService(client=client)
+
+
+def run_per_row(matches, connector, latency):
+    with StubPostgrestServer(latency=latency) as stub:
+        service = _service(stub)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for match in matches:
+                service.save_match_football_data(match, connector)
+        elapsed = time.perf_counter() - start
+        return elapsed, stub.request_count
+
+
+def run_bulk(matches, connector, latency, reruns=0):
+    with StubPostgrestServer(latency=latency) as stub:
+        service = _service(stub)
+        results = []
+        for _ in range(1 + reruns):
+            before = stub.request_count
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                service.save_matches_bulk(matches, connector)
+                elapsed = time.perf_counter() - start
+            results.append((elapsed, stub.request_count - before))
+        return results
+
+
+def _report(label, rows, elapsed, requests):
+    print(f"   {label:<34} {rows / elapsed:10.1f} lignes/s  ({elapsed:6.3f}s, {requests} requêtes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.005, help="latence simulée par requête (s)")
+    args = parser.parse_args()
+
+    connector = FootballDataOrgConnector(use_cache=False)
+    matches = make_matches(args.rows)
+    rows = len(matches)
+
+    print("=" * 70)
+    print(f"💾 BENCHMARK ÉCRITURE MATCHS - {rows} lignes, latence {args.latency * 1000:.0f}ms/requête")
+    print("=" * 70)
+    _report("Avant: select + insert/update", rows, *run_per_row(matches, connector, args.latency))
+    (cold, cold_req), (warm, warm_req) = run_bulk(matches, connector, args.latency, reruns=1)
+    _report("Après: upsert par lots (à froid)", rows, cold, cold_req)
+    _report("Après: relance, lignes inchangées", rows, warm, warm_req)
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Eros Bot - Benchmark de l'instrumentation (backend/app/services/metrics.py)
+Mesure:
+- le coût d'une mesure start()/stop() et d'un incrément de compteur, collecte activée puis désactivée
+- la latence de predict_match() et le débit de predict_many() avec et sans collecte
+Échoue (code 1) si une mesure désactivée dépasse --budget-ns (1µs par défaut).
+
+    python benchmarks/bench_metrics.py --samples 1000000 --fixtures 10000 --single 2000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.app.services import metrics
+from backend.app.ai_engine.predictor import ErosPredictor
+from bench_predict_many import make_fixtures
+
+
+def sample_cost_ns(samples):
+    """(ns par start()/stop(), ns par inc()) pour l'état courant de la collecte"""
+    stage = metrics.stage('bench')
+    counter = metrics.counter('eros_bench_total')
+    start = time.perf_counter_ns()
+    for _ in range(samples):
+        stage.stop(stage.start())
+    per_sample = (time.perf_counter_ns() - start) / samples
+
+    start = time.perf_counter_ns()
+    for _ in range(samples):
+        counter.inc()
+    per_inc = (time.perf_counter_ns() - start) / samples
+
+    # Boucle vide soustraite: seul le coût de l'instrumentation reste
+    start = time.perf_counter_ns()
+    for _ in range(samples):
+        pass
+    empty = (time.perf_counter_ns() - start) / samples
+    return per_sample - empty, per_inc - empty
+
+
+def pipeline(predictor, fixtures, singles):
+    """(µs par predict_match(), matchs/s de predict_many())"""
+    start = time.perf_counter()
+    for match in singles:
+        predictor.predict_match(match)
+    single_us = (time.perf_counter() - start) / len(singles) * 1e6
+
+    start = time.perf_counter()
+    predictor.predict_many(fixtures)
+    return single_us, len(fixtures) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=1000000)
+    parser.add_argument('--fixtures', type=int, default=10000)
+    parser.add_argument('--single', type=int, default=2000, help="matchs prédits un par un")
+    parser.add_argument('--budget-ns', type=float, default=1000.0, help="coût max d'une mesure désactivée")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor = ErosPredictor()
+    predictor.cache = None
+    fixtures = make_fixtures(args.fixtures)
+    singles = fixtures[:args.single]
+    pipeline(predictor, fixtures[:200], fixtures[:50])
+
+    print("=" * 78)
+    print(f"📏 BENCHMARK INSTRUMENTATION - {args.samples} mesures, {len(fixtures)} matchs")
+    print("=" * 78)
+    print(f"   {'Collecte':<12} {'start/stop ns':>14} {'inc ns':>8} {'unitaire µs':>12} {'lot matchs/s':>13}")
+    results = {}
+    for label, state in (('activée', True), ('désactivée', False)):
+        metrics.set_enabled(state)
+        per_sample, per_inc = sample_cost_ns(args.samples)
+        single_us, batch_rate = pipeline(predictor, fixtures, singles)
+        results[state] = (per_sample, per_inc, single_us, batch_rate)
+        print(f"   {label:<12} {per_sample:14.1f} {per_inc:8.1f} {single_us:12.1f} {batch_rate:13.0f}")
+    metrics.set_enabled(True)
+
+    overhead = results[True][2] / results[False][2] - 1
+    print(f"   Surcoût de la collecte sur predict_match(): {overhead * 100:+.1f}%")
+    ok = max(results[False][0], results[False][1]) <= args.budget_ns
+    print(f"   {'✅' if ok else '❌'} Mesure désactivée: {results[False][0]:.1f} ns (budget {args.budget_ns:.0f} ns)")
+    print("=" * 78)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
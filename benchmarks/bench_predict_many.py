@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Eros Bot - Benchmark prédiction par lots
+Compare sur N matchs synthétiques:
+- ErosPredictor.predict_match() match par match (chemin historique)
+- ErosPredictor.predict_many() sur le lot (IA vectorisées)
+- ErosPredictor.predict_many() servi par le cache de prédictions (2e passage)
+et vérifie que les prédictions sont identiques (hors champs de temps).
+
+    python benchmarks/bench_predict_many.py --fixtures 10000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.app.ai_engine.predictor import ErosPredictor
+
+LEAGUES = ['Ligue 1', 'Premier League', 'La Liga', 'Serie A', 'Bundesliga', 'Eredivisie']
+TIMING_FIELDS = ('execution_time_ms', 'timestamp')
+
+
+def make_fixtures(count, teams=400, seed=42):
+    """Matchs synthétiques tirés dans un pool d'équipes (noms déterministes)"""
+    rng = random.Random(seed)
+    pool = [f"Team {rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')}{i} FC" for i in range(teams)]
+    return [
+        {
+            'match_id_api': str(i),
+            'home_team': rng.choice(pool),
+            'away_team': rng.choice(pool),
+            'league': rng.choice(LEAGUES),
+            'match_date': '2026-01-01T20:00:00Z'
+        }
+        for i in range(count)
+    ]
+
+
+def _comparable(prediction):
+    """Prédiction sans les champs de temps (latences par IA incluses)"""
+    result = {k: v for k, v in prediction.items() if k not in TIMING_FIELDS}
+    result['details'] = {k: v for k, v in result['details'].items() if k != 'agent_latencies_ms'}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', type=int, default=10000)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor = ErosPredictor()
+    cache = predictor.cache
+    predictor.cache = None
+    fixtures = make_fixtures(args.fixtures)
+
+    start = time.perf_counter()
+    single = [predictor.predict_match(m) for m in fixtures]
+    single_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = predictor.predict_many(fixtures)
+    batch_elapsed = time.perf_counter() - start
+
+    predictor.cache = cache
+    cached_elapsed = None
+    if cache is not None:
+        predictor.predict_many(fixtures)
+        start = time.perf_counter()
+        cached = predictor.predict_many(fixtures)
+        cached_elapsed = time.perf_counter() - start
+        batch_mismatches = sum(1 for a, b in zip(batch, cached) if _comparable(a) != _comparable(b))
+    
+    mismatches = sum(1 for a, b in zip(single, batch) if _comparable(a) != _comparable(b))
+    if cached_elapsed is not None:
+        mismatches += batch_mismatches
+
+    print("=" * 70)
+    print(f"🎯 BENCHMARK PRÉDICTION PAR LOTS - {len(fixtures)} matchs")
+    print("=" * 70)
+    print(f"   {'predict_match() en boucle':<28} {single_elapsed:7.3f}s  ({len(fixtures) / single_elapsed:9.0f} matchs/s)")
+    print(f"   {'predict_many()':<28} {batch_elapsed:7.3f}s  ({len(fixtures) / batch_elapsed:9.0f} matchs/s)")
+    if cached_elapsed is not None:
+        print(f"   {'predict_many() (cache)':<28} {cached_elapsed:7.3f}s  ({len(fixtures) / cached_elapsed:9.0f} matchs/s)")
+    print(f"   Accélération: ×{single_elapsed / batch_elapsed:.1f}")
+    print(f"   {'✅' if mismatches == 0 else '❌'} Prédictions différentes: {mismatches}")
+    print("=" * 70)
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
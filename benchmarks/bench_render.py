@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Eros Bot - Benchmark des modes d'affichage de predict_today_matches()
+Base SQLite en mémoire garnie de --matches matchs du jour; pour chaque mode (none, summary,
+jsonl, full), mesure le cycle complet (écriture des prédictions comprise) et le seul rendu
+(PredictionRenderer.render()).
+La sortie va dans un tampon: seul le formatage est mesuré, pas le terminal.
+
+    python benchmarks/bench_render.py --matches 2000 --rounds 3
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.update({'EROS_STORAGE': 'sqlite', 'EROS_SQLITE_PATH': ':memory:', 'EROS_PREDICTION_CACHE_TTL': '0'})
+
+from backend.app.ai_engine.prediction_report import PredictionRenderer, RENDER_MODES
+from backend.app.ai_engine.predictor import ErosPredictor
+from backend.app.services.supabase_client import get_supabase_client
+
+
+def seed(client, count):
+    today = datetime.now().strftime('%Y-%m-%d')
+    client.table('matches').upsert([
+        {'match_id_api': str(i), 'home_team': f"Home {i}", 'away_team': f"Away {i % 97}",
+         'league': 'Ligue 1', 'match_date': f"{today}T20:00:00", 'status': 'SCHEDULED'}
+        for i in range(count)
+    ], on_conflict='match_id_api').execute()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--matches', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=3, help="meilleur temps sur N cycles")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed(get_supabase_client(), args.matches)
+        predictor = ErosPredictor()
+        predictions = predictor.predict_today_matches(limit=args.matches, render='none')
+
+    print("=" * 78)
+    print(f"🖨️  BENCHMARK AFFICHAGE - {len(predictions)} matchs du jour, meilleur de {args.rounds} cycles")
+    print("=" * 78)
+    print(f"   {'Mode':<10} {'cycle ms':>10} {'rendu ms':>10} {'rendu µs/match':>15} {'sortie Ko':>10}")
+    for mode in RENDER_MODES:
+        cycle, render, size = float('inf'), float('inf'), 0
+        for _ in range(args.rounds):
+            buffer = io.StringIO()
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                predictor.predict_today_matches(limit=args.matches, render=mode)
+                predictor.writer.flush()
+                cycle = min(cycle, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            PredictionRenderer(mode, buffer).render(predictions)
+            render = min(render, time.perf_counter() - start)
+            size = len(buffer.getvalue().encode('utf-8'))
+        print(f"   {mode:<10} {cycle * 1000:10.1f} {render * 1000:10.2f} "
+              f"{render / len(predictions) * 1e6:15.2f} {size / 1024:10.1f}")
+    print("=" * 78)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Eros Bot - Benchmark résolution des prédictions (stand-in PostgREST local)
+Journal synthétique: N matchs × 4 IA × marchés des IA, tous en attente. Compare:
+- l'ancien chemin: par match, select des prédictions en attente puis un update par ligne
+- PerformanceTracker.resolve_matches(): lecture par lots + upserts groupés, tous marchés
+
+    python benchmarks/bench_resolve_predictions.py --matches 200 --latency 0.005
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from supabase import create_client
+
+from backend.app.ai_engine.performance_tracker import PerformanceTracker
+from backend.app.ai_engine.market_outcomes import outcome_1n2
+from benchmarks.stub_postgrest import StubPostgrestServer, STUB_KEY
+
+AGENT_MARKETS = {
+    'statistician': [('1N2', 'HOME_WIN'), ('OVER_UNDER_1.5', 'OVER_1.5'), ('OVER_UNDER_2.5', 'OVER_2.5'),
+                     ('OVER_UNDER_3.5', 'UNDER_3.5'), ('BTTS', 'BTTS_YES'), ('EXACT_GOALS_HOME', 'EXACT_1_GOALS'),
+                     ('EXACT_GOALS_AWAY', 'EXACT_1_GOALS'), ('OVER_UNDER_HT', 'OVER_0.5_HT'),
+                     ('HT_FT', 'HOME_HOME'), ('DOUBLE_CHANCE', '1N'), ('CORRECT_SCORE', 'CS_1_1')],
+    'form_detector': [('1N2', 'DRAW'), ('DOUBLE_CHANCE', 'N2'), ('OVER_UNDER_2.5', 'OVER_2.5'), ('BTTS', 'BTTS_YES')],
+    'time_series': [('1N2', 'AWAY_WIN'), ('OVER_UNDER_2.5', 'OVER_2.5'), ('BTTS', 'BTTS_YES'),
+                    ('OVER_UNDER_HT', 'OVER_0.5_HT')],
+    'context_analyst': [('1N2', 'HOME_WIN'), ('H2H_ADVANTAGE', 'HOME'), ('CORNERS', 'OVER_9.5'), ('CARDS', 'UNDER_4.5')],
+}
+
+
+def make_dataset(matches, seed=7):
+    rng = random.Random(seed)
+    now = datetime.now().isoformat()
+    results = [{'match_id': str(1000 + i), 'home_score': rng.randint(0, 4), 'away_score': rng.randint(0, 3)}
+               for i in range(matches)]
+    logs = [
+        {'match_id': r['match_id'], 'agent_name': agent, 'market_type': market, 'predicted_outcome': predicted,
+         'confidence': 0.6, 'predicted_at': now, 'status': 'pending'}
+        for r in results for agent, markets in AGENT_MARKETS.items() for market, predicted in markets
+    ]
+    return results, logs
+
+
+def _tracker(stub, logs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracker = PerformanceTracker()
+    tracker.supabase = create_client(stub.url, STUB_KEY)
+    tracker.supabase.table('prediction_logs').insert(logs).execute()
+    return tracker
+
+
+def run_per_row(results, logs, latency):
+    """Ancien _update_prediction_statuses: 1N2 uniquement, un update par ligne"""
+    with StubPostgrestServer(latency=latency) as stub:
+        client = _tracker(stub, logs).supabase
+        before = stub.request_count
+        start = time.perf_counter()
+        for r in results:
+            actual = outcome_1n2(r['home_score'], r['away_score'])
+            client.table('match_results').upsert({'match_id': r['match_id'], 'actual_outcome_1n2': actual},
+                                                 on_conflict='match_id').execute()
+            preds = client.table('prediction_logs').select('*').eq('match_id', r['match_id']).eq('status', 'pending').execute()
+            for pred in preds.data:
+                client.table('prediction_logs').update({
+                    'status': 'resolved',
+                    'is_correct': pred['predicted_outcome'] == actual,
+                    'actual_outcome': actual,
+                    'resolved_at': datetime.now().isoformat()
+                }).eq('id', pred['id']).execute()
+        return time.perf_counter() - start, stub.request_count - before, None
+
+
+def run_bulk(results, logs, latency):
+    with StubPostgrestServer(latency=latency) as stub:
+        tracker = _tracker(stub, logs)
+        before = stub.request_count
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            summary = tracker.resolve_matches(results)
+            elapsed = time.perf_counter() - start
+        rows = stub.table('prediction_logs').rows
+        assert not any(r['status'] == 'pending' for r in rows)
+        return elapsed, stub.request_count - before, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--matches', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.005, help="latence simulée par requête (s)")
+    args = parser.parse_args()
+
+    results, logs = make_dataset(args.matches)
+
+    print("=" * 70)
+    print(f"✅ BENCHMARK RÉSOLUTION - {args.matches} matchs, {len(logs)} prédictions, "
+          f"latence {args.latency * 1000:.0f}ms/requête")
+    print("=" * 70)
+    for label, runner in (("Avant: update par ligne (1N2)", run_per_row), ("Après: resolve_matches()", run_bulk)):
+        elapsed, requests, summary = runner(results, logs, args.latency)
+        print(f"   {label:<32} {len(logs) / elapsed:9.0f} lignes/s  ({elapsed:6.3f}s, {requests} requêtes)")
+        if summary:
+            print(f"   {'':<32} {summary['resolved']} résolues, {summary['correct']} correctes, {summary['void']} void")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
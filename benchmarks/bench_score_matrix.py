@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Eros Bot - Benchmark matrice de scores
+Prix de tous les marchés de buts (1N2, over/under 0.5→4.5, BTTS, score exact, MT/FT)
+pour N matchs:
+- boucle scalaire (math.factorial, double boucle sur les scores, un match à la fois)
+- ScoreMatrix vectorisée sur le lot
+et vérifie que les probabilités concordent.
+
+    python benchmarks/bench_score_matrix.py --fixtures 500
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.app.ai_engine.score_matrix import ScoreMatrix, OVER_UNDER_LINES, HALF_TIME_SHARE
+
+MAX_GOALS = 10
+
+
+def _pmf(lam, k):
+    return math.exp(-lam) * lam ** k / math.factorial(k)
+
+
+def price_scalar(home_xg, away_xg):
+    """Chemin naïf: double boucle sur les scores avec math.factorial"""
+    home = [_pmf(home_xg, k) for k in range(MAX_GOALS + 1)]
+    away = [_pmf(away_xg, k) for k in range(MAX_GOALS + 1)]
+    home[-1] += 1 - sum(home)
+    away[-1] += 1 - sum(away)
+
+    outcomes = [0.0, 0.0, 0.0]
+    over = [0.0] * len(OVER_UNDER_LINES)
+    btts = 0.0
+    best_score = (0, 0, 0.0)
+    for i in range(MAX_GOALS + 1):
+        for j in range(MAX_GOALS + 1):
+            p = home[i] * away[j]
+            outcomes[0 if i > j else (1 if i == j else 2)] += p
+            for n, line in enumerate(OVER_UNDER_LINES):
+                if i + j > line:
+                    over[n] += p
+            if i > 0 and j > 0:
+                btts += p
+            if p > best_score[2]:
+                best_score = (i, j, p)
+
+    # MT/FT: quatre boucles imbriquées sur les scores des deux mi-temps
+    first = ([_pmf(home_xg * HALF_TIME_SHARE, k) for k in range(MAX_GOALS + 1)],
+             [_pmf(away_xg * HALF_TIME_SHARE, k) for k in range(MAX_GOALS + 1)])
+    second = ([_pmf(home_xg * (1 - HALF_TIME_SHARE), k) for k in range(MAX_GOALS + 1)],
+              [_pmf(away_xg * (1 - HALF_TIME_SHARE), k) for k in range(MAX_GOALS + 1)])
+    ht_ft = [[0.0] * 3 for _ in range(3)]
+    for h1 in range(MAX_GOALS + 1):
+        for a1 in range(MAX_GOALS + 1):
+            p1 = first[0][h1] * first[1][a1]
+            ht = 0 if h1 > a1 else (1 if h1 == a1 else 2)
+            for h2 in range(MAX_GOALS + 1):
+                for a2 in range(MAX_GOALS + 1):
+                    d = h1 + h2 - a1 - a2
+                    ht_ft[ht][0 if d > 0 else (1 if d == 0 else 2)] += p1 * second[0][h2] * second[1][a2]
+    return outcomes, over, btts, best_score, ht_ft
+
+
+def price_vectorised(home_xg, away_xg):
+    sm = ScoreMatrix(home_xg, away_xg, MAX_GOALS)
+    return sm.outcome_probs(), sm.over_under(OVER_UNDER_LINES), sm.btts(), sm.correct_score(), sm.ht_ft()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    home_xg = np.array([rng.uniform(0.6, 2.6) for _ in range(args.fixtures)])
+    away_xg = np.array([rng.uniform(0.4, 2.2) for _ in range(args.fixtures)])
+
+    start = time.perf_counter()
+    scalar = [price_scalar(h, a) for h, a in zip(home_xg.tolist(), away_xg.tolist())]
+    scalar_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    outcomes, over, btts, (_, _, best_p), ht_ft = price_vectorised(home_xg, away_xg)
+    vector_elapsed = time.perf_counter() - start
+
+    error = max(
+        np.abs(outcomes - np.array([s[0] for s in scalar])).max(),
+        np.abs(over - np.array([s[1] for s in scalar])).max(),
+        np.abs(btts - np.array([s[2] for s in scalar])).max(),
+        np.abs(best_p - np.array([s[3][2] for s in scalar])).max(),
+        np.abs(ht_ft - np.array([s[4] for s in scalar])).max()
+    )
+    # Les queues tronquées des deux mi-temps diffèrent légèrement entre les deux chemins
+    ok = error < 1e-6
+
+    print("=" * 70)
+    print(f"🎲 BENCHMARK MATRICE DE SCORES - {args.fixtures} matchs × {len(OVER_UNDER_LINES)} lignes O/U")
+    print("=" * 70)
+    print(f"   {'boucle scalaire':<20} {scalar_elapsed * 1000:9.1f} ms")
+    print(f"   {'ScoreMatrix':<20} {vector_elapsed * 1000:9.1f} ms")
+    print(f"   Accélération: ×{scalar_elapsed / vector_elapsed:.0f}")
+    print(f"   {'✅' if ok else '❌'} Écart max des probabilités: {error:.2e}")
+    print("=" * 70)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
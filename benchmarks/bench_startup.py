@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Eros Bot - Benchmark démarrage à froid
+Pour chaque point d'entrée, dans un interpréteur neuf:
+- temps jusqu'à « prêt »: import + construction, et processus complet (démarrage de l'interpréteur compris)
+- modules lourds chargés alors qu'ils ne devraient l'être qu'à la demande (supabase, httpx...)
+- profil `python -X importtime` écrit dans --report (artefact à comparer entre commits)
+
+    python benchmarks/bench_startup.py --runs 5 --budget 1.0 --report .cache/importtime.txt
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Point d'entrée → code exécuté jusqu'à « prêt »
+ENTRY_POINTS = {
+    'predictor': "from backend.app.ai_engine.predictor import ErosPredictor; ErosPredictor()",
+    'orchestrator': "from backend.app.ai_engine.agents.meta_orchestrator import MetaOrchestratorAgent; MetaOrchestratorAgent()",
+    'match_service': "from backend.app.services.match_service import MatchService",
+    'api': "from backend.app.main import app",
+}
+# Modules qui ne doivent être importés qu'au premier accès au stockage
+LAZY_MODULES = ('supabase', 'postgrest', 'gotrue', 'httpx')
+
+
+def _environment():
+    env = dict(os.environ)
+    # Aucune connexion pendant la mesure: on mesure le démarrage, pas le réseau
+    for name in ('SUPABASE_URL', 'SUPABASE_KEY', 'EROS_STORAGE'):
+        env.pop(name, None)
+    env['PYTHONPATH'] = ROOT
+    return env
+
+
+def run_entry(code, env):
+    """(secondes jusqu'à prêt, secondes du processus, modules paresseux chargés) ou None si l'import échoue"""
+    probe = (
+        "import sys, time, json\n"
+        "start = time.perf_counter()\n"
+        f"{code}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps([elapsed, [m for m in {LAZY_MODULES!r} if m in sys.modules]]))\n"
+    )
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        return None
+    ready, loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return ready, wall, loaded
+
+
+def import_profile(code, env):
+    """Lignes `-X importtime` triées par temps cumulé décroissant"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, env=env,
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time:  self [us] | cumulative | imported package"
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return sorted(rows, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=1.0, help="secondes max par processus jusqu'à prêt")
+    parser.add_argument('--report', default=os.path.join(ROOT, '.cache', 'importtime.txt'))
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    env = _environment()
+    baseline = statistics.median(run_entry("pass", env)[1] for _ in range(args.runs))
+
+    print("=" * 78)
+    print(f"🚀 BENCHMARK DÉMARRAGE À FROID - médiane de {args.runs} lancements")
+    print("=" * 78)
+    print(f"   {'Entrée':<15}    {'prêt ms':>9} {'processus ms':>13}   (interpréteur vide: {baseline * 1000:.1f} ms)")
+    failures = 0
+    report = []
+    for name, code in ENTRY_POINTS.items():
+        runs = [run_entry(code, env) for _ in range(args.runs)]
+        if any(run is None for run in runs):
+            print(f"   {name:<15} ⏭️  import impossible ici (dépendance absente)")
+            continue
+        ready = statistics.median(run[0] for run in runs)
+        wall = statistics.median(run[1] for run in runs)
+        loaded = sorted(set(m for run in runs for m in run[2]))
+        ok = wall <= args.budget and not loaded
+        failures += not ok
+        print(f"   {name:<15} {'✅' if ok else '❌'} {ready * 1000:9.1f} {wall * 1000:13.1f}"
+              f"{'   chargés trop tôt: ' + ', '.join(loaded) if loaded else ''}")
+
+        rows = import_profile(code, env)
+        report.append(f"# {name}: {code}")
+        report.append(f"# prêt en {ready * 1000:.1f} ms, processus {wall * 1000:.1f} ms "
+                      f"(interpréteur vide: {baseline * 1000:.1f} ms)")
+        report.append(f"{'cumulé µs':>12} {'propre µs':>10}  module")
+        report.extend(f"{cumulative:>12} {own:>10}  {module}" for cumulative, own, module in rows[:args.top])
+        report.append("")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.report)), exist_ok=True)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        f.write("\n".join(report))
+    print(f"   📄 Profil -X importtime: {args.report}")
+    print("=" * 78)
+    return 0 if failures == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
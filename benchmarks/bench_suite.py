@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Eros Bot - Suite de benchmarks reproductible (agents, orchestrateur, ingestion)
+Fixtures synthétiques déterministes (graine fixe) de 100 / 10k / 1M matchs; chaque cible
+tourne dans un processus fils (fork) pour que le pic de RSS soit le sien.
+
+Cibles:
+- agent.<nom>          _analyze_batch() sur le lot (débit), predict() match par match (p50/p99)
+- meta.predict         predict_many() (débit), predict() (p50/p99); poids par défaut
+- predictor.predict_match  predict_many() (débit), predict_match() (p50/p99), sans cache
+- match_service.sqlite     save_matches_bulk() sur SQLite en mémoire (stand-in local)
+- match_service.postgrest  save_matches_bulk() sur le bouchon PostgREST (client partagé + pool HTTP)
+Le débit est mesuré sur tout le lot, par tranches de --chunk (les résultats sont jetés);
+les latences sur les --latency-samples premiers matchs (par appel de --write-batch lignes
+pour les écritures). --write-cap plafonne les écritures MatchService (runs rapides);
+`rows` donne le nombre réellement écrit.
+
+Résultat JSON (stdout ou --output) comparable entre commits:
+    python benchmarks/bench_suite.py --sizes 100,10000,1000000 --output .cache/bench/$(git rev-parse --short HEAD).json
+    python benchmarks/bench_suite.py --sizes 100,10000 --compare .cache/bench/abc1234.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import numpy as np
+
+AGENTS = ('statistician', 'form_detector', 'time_series', 'context_analyst')
+TARGETS = tuple(f'agent.{name}' for name in AGENTS) + (
+    'meta.predict', 'predictor.predict_match', 'match_service.sqlite', 'match_service.postgrest'
+)
+LEAGUES = ('Ligue 1', 'Premier League', 'La Liga', 'Serie A', 'Bundesliga', 'Eredivisie')
+COMPETITIONS = (('PL', 'Premier League'), ('PD', 'Primera Division'), ('BL1', 'Bundesliga'),
+                ('SA', 'Serie A'), ('FL1', 'Ligue 1'), ('ELC', 'Championship'))
+# Une régression au-delà de ce ratio est signalée par --compare
+REGRESSION_THRESHOLD = 0.10
+
+
+# ---------- Fixtures ----------
+
+def make_fixtures(count, teams=400, seed=42):
+    """Lignes `matches` synthétiques (mêmes équipes, mêmes matchs à chaque exécution)"""
+    rng = random.Random(seed)
+    pool = [f"Team {rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')}{i} FC" for i in range(teams)]
+    return [
+        {
+            'match_id_api': str(i),
+            'home_team': rng.choice(pool),
+            'away_team': rng.choice(pool),
+            'league': rng.choice(LEAGUES),
+            'match_date': '2026-01-01T20:00:00Z'
+        }
+        for i in range(count)
+    ]
+
+
+def make_football_data(count, seed=42):
+    """Matchs bruts au format football-data.org (ids uniques, dates dans la fenêtre de rétention)"""
+    rng = random.Random(seed)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    matches = []
+    for i in range(count):
+        code, name = COMPETITIONS[i % len(COMPETITIONS)]
+        kickoff = today + timedelta(days=(i // 500) % 14, hours=12 + i % 10)
+        matches.append({
+            'id': 10_000_000 + i,
+            'utcDate': kickoff.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'status': 'TIMED',
+            'competition': {'name': name, 'code': code},
+            'homeTeam': {'name': f"{code} Home {rng.randrange(20)}"},
+            'awayTeam': {'name': f"{code} Away {rng.randrange(20)}"},
+            'score': {'fullTime': {'home': None, 'away': None}, 'halfTime': {'home': None, 'away': None}},
+            'venue': 'Bench Arena',
+            'referees': []
+        })
+    return matches
+
+
+# ---------- Mesures ----------
+
+def _rss_mb():
+    # ru_maxrss: Ko sous Linux, octets sous macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def _percentiles(samples_ns):
+    if not samples_ns:
+        return None, None
+    p50, p99 = np.percentile(np.asarray(samples_ns, dtype=np.float64), [50, 99])
+    return round(p50 / 1000, 2), round(p99 / 1000, 2)
+
+
+def _timed_calls(call, items):
+    """Durées (ns) de call(item) pour chaque item"""
+    samples = []
+    for item in items:
+        start = time.perf_counter_ns()
+        call(item)
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+WARMUP = 100
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _quiet():
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _meta():
+    from backend.app.ai_engine.agents.meta_orchestrator import MetaOrchestratorAgent
+    # Poids par défaut: le résultat ne dépend pas des poids sauvegardés sur la machine
+    return MetaOrchestratorAgent(weight=1.5, auto_train=False)
+
+
+def bench_agent(name, size, args):
+    meta = _meta()
+    agent = meta.agents[name]
+    fixtures = make_fixtures(size)
+    # Premier appel hors mesure (imports paresseux, caches d'équipes)
+    agent._analyze_batch(meta._build_batch(fixtures[:WARMUP], agent.features_for(None)))
+    latencies = _timed_calls(agent.predict, fixtures[:args.latency_samples])
+    elapsed = 0
+    for chunk in _chunks(fixtures, args.chunk):
+        batch = meta._build_batch(chunk, agent.features_for(None))
+        start = time.perf_counter_ns()
+        agent._analyze_batch(batch)
+        elapsed += time.perf_counter_ns() - start
+    return len(fixtures), elapsed, latencies
+
+
+def bench_meta(size, args):
+    meta = _meta()
+    fixtures = make_fixtures(size)
+    meta.predict_many(fixtures[:WARMUP])
+    latencies = _timed_calls(meta.predict, fixtures[:args.latency_samples])
+    start = time.perf_counter_ns()
+    for chunk in _chunks(fixtures, args.chunk):
+        meta.predict_many(chunk)
+    return len(fixtures), time.perf_counter_ns() - start, latencies
+
+
+def bench_predictor(size, args):
+    from backend.app.ai_engine.predictor import ErosPredictor
+
+    with _quiet():
+        predictor = ErosPredictor(cache=False)
+    predictor.cache = None
+    predictor.meta_agent = _meta()
+    predictor.feature_store = predictor.meta_agent.feature_store
+    fixtures = make_fixtures(size)
+    predictor.predict_many(fixtures[:WARMUP])
+    latencies = _timed_calls(predictor.predict_match, fixtures[:args.latency_samples])
+    start = time.perf_counter_ns()
+    for chunk in _chunks(fixtures, args.chunk):
+        predictor.predict_many(chunk)
+    return len(fixtures), time.perf_counter_ns() - start, latencies
+
+
+def bench_match_service(backend, size, args):
+    from connectors.football_data_org import FootballDataOrgConnector
+    from backend.app.services.match_service import MatchService
+
+    rows = min(size, args.write_cap) if args.write_cap else size
+    matches = make_football_data(rows)
+    with _quiet():
+        connector = FootballDataOrgConnector(use_cache=False)
+
+    with contextlib.ExitStack() as stack:
+        if backend == 'sqlite':
+            from backend.app.services.local_storage import SQLiteClient
+            client = SQLiteClient(':memory:')
+        else:
+            from benchmarks.stub_postgrest import StubPostgrestServer, STUB_KEY
+            from backend.app.services.supabase_client import get_supabase_client
+            stub = stack.enter_context(StubPostgrestServer(latency=0))
+            os.environ.update({'SUPABASE_URL': stub.url, 'SUPABASE_KEY': STUB_KEY})
+            with _quiet():
+                client = get_supabase_client()
+        service = MatchService(client=client)
+
+        with _quiet():
+            start = time.perf_counter_ns()
+            latencies = _timed_calls(lambda part: service.save_matches_bulk(part, connector),
+                                     list(_chunks(matches, args.write_batch)))
+            elapsed = time.perf_counter_ns() - start
+    return rows, elapsed, latencies
+
+
+def run_target(target, size, args):
+    if target.startswith('agent.'):
+        return bench_agent(target.split('.', 1)[1], size, args)
+    if target == 'meta.predict':
+        return bench_meta(size, args)
+    if target == 'predictor.predict_match':
+        return bench_predictor(size, args)
+    return bench_match_service(target.split('.', 1)[1], size, args)
+
+
+def _child(target, size, args, queue):
+    # Aucun stockage réel: tout passe par les stand-ins locaux
+    for name in ('SUPABASE_URL', 'SUPABASE_KEY', 'EROS_STORAGE'):
+        os.environ.pop(name, None)
+    os.environ['EROS_METRICS'] = '0'
+    baseline = _rss_mb()
+    try:
+        rows, elapsed_ns, latencies = run_target(target, size, args)
+    except Exception as e:
+        queue.put({'target': target, 'size': size, 'error': f"{type(e).__name__}: {e}"})
+        return
+    p50, p99 = _percentiles(latencies)
+    queue.put({
+        'target': target,
+        'size': size,
+        'rows': rows,
+        'elapsed_s': round(elapsed_ns / 1e9, 4),
+        'throughput_per_s': round(rows / (elapsed_ns / 1e9), 1) if elapsed_ns else None,
+        'p50_us': p50,
+        'p99_us': p99,
+        'latency_samples': len(latencies),
+        'peak_rss_mb': round(_rss_mb(), 1),
+        'baseline_rss_mb': round(baseline, 1),
+    })
+
+
+def run_isolated(target, size, args):
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    process = context.Process(target=_child, args=(target, size, args, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+# ---------- Rapport ----------
+
+def _metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results, baseline_path):
+    """Lignes 'cible taille: débit ×, p99 ×' par rapport à un JSON précédent; True si régression"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(r['target'], r['size']): r for r in json.load(f)['results'] if 'error' not in r}
+    regressed = False
+    print(f"\n📊 Comparaison avec {baseline_path}", file=sys.stderr)
+    for result in results:
+        before = baseline.get((result['target'], result['size']))
+        if before is None or 'error' in result:
+            continue
+        throughput = result['throughput_per_s'] / before['throughput_per_s']
+        p99 = result['p99_us'] / before['p99_us'] if result['p99_us'] and before['p99_us'] else 1.0
+        worse = throughput < 1 - REGRESSION_THRESHOLD or p99 > 1 + REGRESSION_THRESHOLD
+        regressed |= worse
+        print(f"   {'❌' if worse else '✅'} {result['target']:<26} {result['size']:>8}  "
+              f"débit ×{throughput:.2f}  p99 ×{p99:.2f}", file=sys.stderr)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100,10000,1000000')
+    parser.add_argument('--targets', default=','.join(TARGETS), help="cibles séparées par des virgules")
+    parser.add_argument('--chunk', type=int, default=10000, help="matchs par appel vectorisé")
+    parser.add_argument('--latency-samples', type=int, default=1000, help="appels unitaires mesurés")
+    parser.add_argument('--write-batch', type=int, default=5000, help="lignes par save_matches_bulk()")
+    parser.add_argument('--write-cap', type=int, default=0,
+                        help="lignes max écrites par MatchService (0 = taille complète)")
+    parser.add_argument('--output', help="fichier JSON (stdout sinon)")
+    parser.add_argument('--compare', help="JSON d'un commit précédent")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    targets = [target.strip() for target in args.targets.split(',') if target.strip()]
+    unknown = sorted(set(targets) - set(TARGETS))
+    if unknown:
+        parser.error(f"cibles inconnues: {', '.join(unknown)} (disponibles: {', '.join(TARGETS)})")
+
+    results = []
+    for size in sizes:
+        for target in targets:
+            result = run_isolated(target, size, args)
+            results.append(result)
+            if 'error' in result:
+                print(f"   ❌ {target:<26} {size:>8}  {result['error']}", file=sys.stderr)
+            else:
+                capped = f"  ({result['rows']} lignes, --write-cap)" if result['rows'] != size else ''
+                print(f"   ✅ {target:<26} {size:>8}  {result['throughput_per_s']:>12.0f}/s  "
+                      f"p50 {result['p50_us']}µs  p99 {result['p99_us']}µs  RSS {result['peak_rss_mb']} Mo{capped}",
+                      file=sys.stderr)
+
+    report = {'meta': _metadata(), 'settings': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+              'results': results}
+    payload = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        print(f"📄 {args.output}", file=sys.stderr)
+    else:
+        print(payload)
+
+    failed = any('error' in result for result in results)
+    if args.compare:
+        failed |= compare(results, args.compare)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
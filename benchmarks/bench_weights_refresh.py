@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Eros Bot - Benchmark et contrôle du rafraîchissement des poids (SQLite en mémoire)
+Un tracker sauvegarde --saves jeux de poids successifs (table ai_weights: une ligne par
+sauvegarde), puis:
+- refresh_weights() juste après les sauvegardes ne change rien (les derniers poids font foi)
+- une sauvegarde par un autre tracker (autre processus) est reprise par refresh_weights()
+Mesure aussi la latence de refresh_weights() (une lecture de ai_weights).
+Code de sortie 1 si un contrôle échoue.
+
+    python benchmarks/bench_weights_refresh.py --saves 50 --rounds 200
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.update({'EROS_STORAGE': 'sqlite', 'EROS_SQLITE_PATH': ':memory:'})
+
+from backend.app.ai_engine.performance_tracker import PerformanceTracker
+from backend.app.services.supabase_client import get_supabase_client
+
+
+def weights_for(i):
+    return {'statistician': round(1.0 + i / 100, 3), 'form_detector': 1.0, 'time_series': 0.9, 'context_analyst': 0.8}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--saves', type=int, default=50, help="sauvegardes successives avant le contrôle")
+    parser.add_argument('--rounds', type=int, default=200, help="appels de refresh_weights() mesurés")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stderr(io.StringIO()):
+        client = get_supabase_client()
+    tracker = PerformanceTracker(client)
+    for i in range(args.saves):
+        tracker.save_weights(weights_for(i))
+    last = weights_for(args.saves - 1)
+
+    checks = []
+    changed = tracker.refresh_weights()
+    checks.append(("save → save → refresh garde les derniers poids",
+                   not changed and tracker.current_weights() == last))
+
+    other = PerformanceTracker(client)
+    other.save_weights(weights_for(args.saves))
+    changed = tracker.refresh_weights()
+    checks.append(("poids sauvegardés ailleurs repris par refresh",
+                   changed and tracker.current_weights() == weights_for(args.saves)))
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        tracker.refresh_weights()
+    elapsed = time.perf_counter() - start
+
+    print("=" * 70)
+    print(f"⚖️  RAFRAÎCHISSEMENT DES POIDS - {args.saves + 1} sauvegardes, {args.rounds} refresh")
+    print("=" * 70)
+    for label, ok in checks:
+        print(f"   {'✅' if ok else '❌'} {label}")
+    print(f"   refresh_weights(): {elapsed / args.rounds * 1e6:.1f} µs/appel")
+    print("=" * 70)
+    return 0 if all(ok for _, ok in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Eros Bot - Serveur bouchon football-data.org (local)
+Imite l'API v4 pour les benchmarks: quota en fenêtre fixe avec les en-têtes
+X-Requests-Available-Minute / X-RequestCounter-Reset, 429 en cas de dépassement,
+latence réseau simulée et matchs synthétiques déterministes.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Compétitions qui ont des matchs dans le bouchon (les autres renvoient une liste vide)
+BUSY_COMPETITIONS = {'PL': 'Premier League', 'PD': 'Primera Division', 'BL1': 'Bundesliga',
+                     'SA': 'Serie A', 'FL1': 'Ligue 1', 'ELC': 'Championship'}
+MATCHES_PER_DAY = 4
+
+
+class FixedWindowQuota:
+    """Quota à fenêtre fixe, comme le compteur par minute de football-data.org"""
+
+    def __init__(self, limit=10, window=60.0):
+        self.limit = limit
+        self.window = window
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._count = 0
+        self.total = 0
+        self.rejected = 0
+
+    def hit(self):
+        """Compte une requête. Retourne (autorisée, restantes, secondes avant reset)"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.window:
+                self._window_start = now
+                self._count = 0
+            reset_in = self.window - (now - self._window_start)
+            self.total += 1
+            if self._count >= self.limit:
+                self.rejected += 1
+                return False, 0, reset_in
+            self._count += 1
+            return True, self.limit - self._count, reset_in
+
+
+def _date_range(date_from, date_to):
+    start = datetime.strptime(date_from, '%Y-%m-%d')
+    end = datetime.strptime(date_to, '%Y-%m-%d')
+    while start <= end:
+        yield start.strftime('%Y-%m-%d')
+        start += timedelta(days=1)
+
+
+def synthetic_matches(code, date_from, date_to):
+    """Matchs synthétiques d'une compétition sur une plage de dates"""
+    name = BUSY_COMPETITIONS.get(code)
+    if not name:
+        return []
+    matches = []
+    for day in _date_range(date_from, date_to):
+        day_seed = int(day.replace('-', ''))
+        for i in range(MATCHES_PER_DAY):
+            match_id = (day_seed % 100000) * 1000 + sum(ord(c) for c in code) * 10 + i
+            matches.append({
+                'id': match_id,
+                'utcDate': f"{day}T{15 + i}:00:00Z",
+                'status': 'TIMED',
+                'competition': {'name': name, 'code': code},
+                'homeTeam': {'name': f"{code} Home {i}"},
+                'awayTeam': {'name': f"{code} Away {i}"},
+                'score': {'fullTime': {'home': None, 'away': None},
+                          'halfTime': {'home': None, 'away': None}},
+                'venue': 'Stub Arena',
+                'referees': []
+            })
+    return matches
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Assez grand pour que les connexions parallèles ne soient pas retardées par le backlog
+    request_queue_size = 128
+
+
+class StubFootballDataServer:
+    """
+    Serveur HTTP local lancé dans un thread
+
+    Usage:
+        with StubFootballDataServer(limit=10, window=6.0, latency=0.15) as stub:
+            connector.base_url = stub.base_url
+    """
+
+    def __init__(self, limit=10, window=60.0, latency=0.15, host='127.0.0.1', port=0):
+        self.quota = FixedWindowQuota(limit=limit, window=window)
+        self.latency = latency
+        self.requests_log = []
+        self._server = _Server((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v4"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # En-têtes et corps partent en 2 écritures: sans ça, Nagle + ACK retardé = +40ms
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                allowed, remaining, reset_in = stub.quota.hit()
+                time.sleep(stub.latency)
+
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                stub.requests_log.append((parsed.path, params))
+
+                if not allowed:
+                    status, payload = 429, {'message': 'You reached your request limit.', 'errorCode': 429}
+                else:
+                    status, payload = stub.route(parsed.path, params)
+
+                body = json.dumps(payload).encode('utf-8')
+                etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+                if status == 200 and self.headers.get('If-None-Match') == etag:
+                    status, body = 304, b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.send_header('X-Requests-Available-Minute', str(remaining))
+                self.send_header('X-RequestCounter-Reset', f"{reset_in:.2f}")
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def route(self, path, params):
+        """Réponses de l'API v4 simulées"""
+        parts = [p for p in path.split('/') if p]
+        today = datetime.now().strftime('%Y-%m-%d')
+        date_from = params.get('dateFrom', today)
+        date_to = params.get('dateTo', date_from)
+
+        if parts[-1] == 'matches' and len(parts) == 4 and parts[1] == 'competitions':
+            return 200, {'matches': synthetic_matches(parts[2], date_from, date_to)}
+        if parts[-1] == 'matches' and len(parts) == 2:
+            if 'status' in params:
+                return 200, {'matches': []}
+            codes = params.get('competitions', ','.join(BUSY_COMPETITIONS)).split(',')
+            matches = []
+            for code in codes:
+                matches.extend(synthetic_matches(code, date_from, date_to))
+            return 200, {'matches': matches}
+        if parts[-1] == 'standings':
+            return 200, {'standings': []}
+        if parts[-1] == 'competitions':
+            return 200, {'competitions': [{'code': c, 'name': n} for c, n in BUSY_COMPETITIONS.items()]}
+        return 404, {'message': 'Not found'}
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
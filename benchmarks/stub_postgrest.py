@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Eros Bot - Serveur bouchon compatible PostgREST (local)
+Implémente le sous-ensemble de /rest/v1 utilisé par supabase-py dans Eros Bot:
+select + filtres (eq, neq, gt, gte, lt, lte, in, is), order, limit, count=exact,
+insert, upsert (on_conflict + resolution=merge-duplicates / ignore-duplicates), update et delete.
+Tables en mémoire créées à la volée, latence réseau simulée.
+
+    with StubPostgrestServer(latency=0.02) as stub:
+        client = create_client(stub.url, STUB_KEY)
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+
+# Clé au format JWT (supabase-py valide la forme de la clé, pas sa signature)
+STUB_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.c3R1Yg"
+
+RESERVED_PARAMS = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns'}
+
+
+def _coerce(value):
+    """Convertit une valeur de filtre PostgREST en type Python comparable"""
+    if value == 'null':
+        return None
+    if value in ('true', 'false'):
+        return value == 'true'
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _matches(row, column, expression):
+    op, _, raw = expression.partition('.')
+    value = row.get(column)
+    if op == 'is':
+        return value is _coerce(raw)
+    if op == 'in':
+        options = [_coerce(v.strip('"')) for v in raw.strip('()').split(',')]
+        return value in options or str(value) in [str(o) for o in options]
+    target = _coerce(raw)
+    if value is None:
+        return False
+    if isinstance(value, str) or isinstance(target, str):
+        value, target = str(value), str(target)
+    if op == 'eq':
+        return value == target
+    if op == 'neq':
+        return value != target
+    if op == 'gt':
+        return value > target
+    if op == 'gte':
+        return value >= target
+    if op == 'lt':
+        return value < target
+    if op == 'lte':
+        return value <= target
+    raise ValueError(f"opérateur non supporté: {op}")
+
+
+class InMemoryTable:
+    def __init__(self):
+        self.rows = []
+        self.next_id = 1
+        # Index des clés de conflit des upserts {colonnes: {valeurs: ligne}}, construits à la demande
+        self.indexes = {}
+
+    def insert(self, row):
+        row = dict(row)
+        if row.get('id') is None:
+            row['id'] = self.next_id
+        self.next_id = max(self.next_id, int(row['id'])) + 1
+        self.rows.append(row)
+        for columns, index in self.indexes.items():
+            index.setdefault(tuple(row.get(c) for c in columns), row)
+        return row
+
+    def find(self, columns, row):
+        """Ligne existante ayant les mêmes valeurs que row sur columns (None sinon)"""
+        index = self.indexes.get(columns)
+        if index is None:
+            index = self.indexes[columns] = {}
+            for existing in self.rows:
+                index.setdefault(tuple(existing.get(c) for c in columns), existing)
+        return index.get(tuple(row.get(c) for c in columns))
+
+
+class StubPostgrestServer:
+    """Serveur PostgREST minimal lancé dans un thread"""
+
+    def __init__(self, latency=0.02, host='127.0.0.1', port=0):
+        self.latency = latency
+        self.tables = {}
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def table(self, name):
+        return self.tables.setdefault(name, InMemoryTable())
+
+    # ---------- Logique PostgREST ----------
+
+    def _filter(self, table, params):
+        rows = table.rows
+        for column, expression in params:
+            if column in RESERVED_PARAMS:
+                continue
+            op, _, raw = expression.partition('.')
+            index = table.indexes.get((column,)) if op == 'in' and rows is table.rows else None
+            if index is not None:
+                # in.(...) sur une clé de conflit indexée: lecture directe au lieu d'un parcours
+                found = {}
+                for option in raw.strip('()').split(','):
+                    option = option.strip('"')
+                    for key in ((option,), (_coerce(option),)):
+                        if key in index:
+                            found[id(index[key])] = index[key]
+                rows = list(found.values())
+                continue
+            rows = [r for r in rows if _matches(r, column, expression)]
+        return rows
+
+    @staticmethod
+    def _project(rows, select):
+        if not select or select == '*':
+            return [dict(r) for r in rows]
+        columns = [c.strip() for c in select.split(',')]
+        return [{c: r.get(c) for c in columns} for r in rows]
+
+    def handle(self, method, table_name, params, prefer, body):
+        table = self.table(table_name)
+        query = dict(params)
+
+        if method == 'GET':
+            rows = self._filter(table, params)
+            if 'order' in query:
+                column, _, direction = query['order'].partition('.')
+                rows = sorted(rows, key=lambda r: (r.get(column) is None, r.get(column)),
+                              reverse=direction.startswith('desc'))
+            total = len(rows)
+            offset = int(query.get('offset', 0))
+            if 'limit' in query:
+                rows = rows[offset:offset + int(query['limit'])]
+            return 200, self._project(rows, query.get('select')), total
+
+        if method == 'POST':
+            payload = body if isinstance(body, list) else [body]
+            # Clé de conflit éventuellement composite: on_conflict=agent_name,market_type,day
+            conflict = tuple(c.strip() for c in query['on_conflict'].split(',')) if query.get('on_conflict') else None
+            merge = 'resolution=merge-duplicates' in prefer
+            ignore = 'resolution=ignore-duplicates' in prefer
+            written = []
+            for row in payload:
+                existing = None
+                if conflict and (merge or ignore):
+                    existing = table.find(conflict, row)
+                if existing is not None and ignore:
+                    continue
+                if existing is not None:
+                    existing.update(row)
+                    # Les autres index peuvent porter sur des colonnes modifiées
+                    table.indexes = {conflict: table.indexes[conflict]}
+                    written.append(existing)
+                else:
+                    written.append(table.insert(row))
+            return 201, [dict(r) for r in written], len(written)
+
+        if method == 'PATCH':
+            rows = self._filter(table, params)
+            for row in rows:
+                row.update(body)
+            table.indexes.clear()
+            return 200, [dict(r) for r in rows], len(rows)
+
+        if method == 'DELETE':
+            rows = self._filter(table, params)
+            removed = {id(r) for r in rows}
+            table.rows = [r for r in table.rows if id(r) not in removed]
+            table.indexes.clear()
+            return 200, [dict(r) for r in rows], len(rows)
+
+        return 405, {'message': 'Method not allowed'}, 0
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # En-têtes et corps partent en 2 écritures: sans ça, Nagle + ACK retardé = +40ms
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self):
+                time.sleep(stub.latency)
+                parsed = urlparse(self.path)
+                table_name = parsed.path.rstrip('/').split('/')[-1]
+                params = parse_qsl(parsed.query, keep_blank_values=True)
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'null') if length else None
+                prefer = self.headers.get('Prefer', '')
+
+                with stub._lock:
+                    stub.request_count += 1
+                    try:
+                        status, payload, total = stub.handle(self.command, table_name, params, prefer, body)
+                    except Exception as e:
+                        status, payload, total = 400, {'message': str(e), 'code': 'STUB'}, 0
+
+                data = json.dumps(payload, default=str).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                if isinstance(payload, list):
+                    end = max(0, len(payload) - 1)
+                    self.send_header('Content-Range', f"0-{end}/{total if 'count=' in prefer else '*'}")
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+        return Handler
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -216,8 +216,15 @@ print("""
        league TEXT,
        status TEXT,
        home_score INTEGER,
-       away_score INTEGER
+       away_score INTEGER,
+       home_score_ht INTEGER,
+       away_score_ht INTEGER,
+       competition_code TEXT,
+       venue TEXT,
+       referee TEXT,
+       content_hash TEXT
    );
+   -- Table existante: backend/migrations/001_matches_content_hash.sql
 """)
 
 print("=" * 70)
\ No newline at end of file
@@ -6,20 +6,29 @@ Récupère TOUS les matchs en respectant les limites API (10 req/min)
 
 import sys
 import os
-import time
 from datetime import datetime, timedelta
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from connectors.football_data_org import FootballDataOrgConnector
+from connectors.ingestion_scheduler import IngestionScheduler, plan_fetch_jobs
 from backend.app.services.match_service import MatchService
+from backend.app.services.supabase_client import storage_stats
 
 # ============================================
 # CONFIGURATION RATE LIMITING
 # ============================================
-# football-data.org limite à 10 requêtes/minute en gratuit
-# On utilise 6 secondes entre chaque appel pour être sûr (60s / 10 = 6s)
-API_DELAY_SECONDS = 6.5  # Petite marge de sécurité
+# football-data.org limite à 10 requêtes/minute en gratuit.
+# Plus de pause fixe: le connecteur partage un token bucket de 10 jetons/minute
+# (FOOTBALL_DATA_RATE_LIMIT) resynchronisé sur les en-têtes X-Requests-Available-Minute
+# et X-RequestCounter-Reset. Le scheduler garde autant de requêtes en vol que le quota
+# l'autorise et n'attend que lorsque le budget est réellement épuisé.
+
+# Mode plage: une requête par compétition pour toute la fenêtre (dateFrom/dateTo)
+# au lieu d'une par jour, voire une seule requête globale si /matches couvre tout.
+# Les résultats sont redécoupés par jour côté client (~3× moins de quota).
+RANGE_FETCH = True
+DAYS_TO_FETCH = 3
 
 # Compétitions à surveiller (tu peux commenter celles que tu veux ignorer)
 COMPETITIONS_TO_FETCH = [
@@ -38,81 +47,92 @@ COMPETITIONS_TO_FETCH = [
     'CLI',   # Copa Libertadores - Priorité 3
 ]
 
-def fetch_all_matches():
-    """Fonction principale de récupération des matchs"""
+def fetch_all_matches(competitions=None, range_fetch=RANGE_FETCH, force=False):
+    """
+    Fonction principale de récupération des matchs
+    force: réécrit tous les matchs, même ceux dont l'empreinte en base est identique
+    """
+    competitions = competitions or COMPETITIONS_TO_FETCH
+    
     print("🚀 Eros Bot - Démarrage de la récupération des matchs...")
     print(f"📅 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-" * 70)
     
     connector = FootballDataOrgConnector()
     match_service = MatchService()
+    scheduler = IngestionScheduler(connector)
     
-    total_matches = 0
     total_requests = 0
     dates_to_fetch = [
-        datetime.now().strftime('%Y-%m-%d'),
-        (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d'),
-        (datetime.now() + timedelta(days=2)).strftime('%Y-%m-%d'),
+        (datetime.now() + timedelta(days=offset)).strftime('%Y-%m-%d')
+        for offset in range(DAYS_TO_FETCH)
     ]
     
+    jobs = plan_fetch_jobs(connector, competitions, dates_to_fetch, range_fetch=range_fetch)
+    
     print(f"🗓️  Dates analysées: {dates_to_fetch}")
-    print(f"🏆 Compétitions surveillées: {len(COMPETITIONS_TO_FETCH)}")
-    print(f"⏱️  Délai entre requêtes: {API_DELAY_SECONDS}s (pour éviter 429)")
+    print(f"🏆 Compétitions surveillées: {len(competitions)}")
+    print(f"📦 Mode: {'plage de dates' if range_fetch else 'jour par jour'} ({len(jobs)} jobs)")
+    print(f"⏱️  Quota: {connector.rate_limiter.capacity} req/min, {scheduler.max_in_flight} requêtes en parallèle")
     print("-" * 70)
     
-    # Pour chaque compétition
-    for idx, comp_code in enumerate(COMPETITIONS_TO_FETCH, 1):
-        print(f"\n[{idx}/{len(COMPETITIONS_TO_FETCH)}] 🔍 [{comp_code}] Recherche...")
-        comp_matches_count = 0
-        
-        # Pour chaque date
-        for date_idx, date in enumerate(dates_to_fetch):
-            matches = connector.get_matches_for_competition(comp_code, date, date)
+    comp_matches_count = {comp_code: 0 for comp_code in competitions}
+    live_count = 0
+    fetched_matches = []
+    
+    # Les réponses arrivent dans le désordre: on les regroupe avant l'écriture
+    for (job_code, _, _), matches in scheduler.run(jobs):
+        if job_code == 'LIVE':
+            total_requests += 2  # 2 statuts: IN_PLAY + PAUSED
+            live_count = len(matches)
+        else:
             total_requests += 1
-            
+            # Redécoupage par compétition (endpoint global) puis par jour
+            by_comp = {}
             for match in matches:
-                match_service.save_match_football_data(match, connector)
-                total_matches += 1
-                comp_matches_count += 1
-            
-            if matches:
-                print(f"   📅 {date}: {len(matches)} matchs trouvés")
-            
-            # ⚠️  IMPORTANT: Pause pour respecter la limite API
-            # Sauf après la dernière date de la dernière compétition
-            if not (date_idx == len(dates_to_fetch) - 1 and idx == len(COMPETITIONS_TO_FETCH)):
-                time.sleep(API_DELAY_SECONDS)
-        
-        if comp_matches_count > 0:
-            print(f"   ✅ [{comp_code}] Total: {comp_matches_count} matchs")
-        else:
-            print(f"   ℹ️  [{comp_code}] Aucun match sur ces dates")
+                code = match.get('competition', {}).get('code') if job_code == 'ALL' else job_code
+                by_comp.setdefault(code, []).append(match)
+            for comp_code, comp_matches in by_comp.items():
+                comp_matches_count[comp_code] = comp_matches_count.get(comp_code, 0) + len(comp_matches)
+                for date, day_matches in sorted(connector.split_matches_by_day(comp_matches).items()):
+                    print(f"   📅 [{comp_code}] {date}: {len(day_matches)} matchs trouvés")
         
-        # Pause supplémentaire entre chaque compétition pour être extra-safe
-        if idx < len(COMPETITIONS_TO_FETCH):
-            time.sleep(API_DELAY_SECONDS)
+        fetched_matches.extend(matches)
     
-    # Récupérer les matchs en DIRECT (LIVE) - 2 requêtes max
-    print("\n📊 Récupération des matchs en DIRECT...")
-    live_matches = connector.get_live_matches()
-    total_requests += 2  # 2 statuts: IN_PLAY + PAUSED
+    # Une seule écriture groupée (upsert par lots, matchs inchangés ignorés)
+    save_summary = match_service.save_matches_bulk(fetched_matches, connector, force=force)
+    total_matches = len(fetched_matches)
     
-    for match in live_matches:
-        match_service.save_match_football_data(match, connector)
-        total_matches += 1
+    print()
+    for comp_code in competitions:
+        if comp_matches_count[comp_code] > 0:
+            print(f"   ✅ [{comp_code}] Total: {comp_matches_count[comp_code]} matchs")
+        else:
+            print(f"   ℹ️  [{comp_code}] Aucun match sur ces dates")
     
-    if live_matches:
-        print(f"   ✅ {len(live_matches)} matchs en direct trouvés")
+    print("\n📊 Matchs en DIRECT...")
+    if live_count:
+        print(f"   ✅ {live_count} matchs en direct trouvés")
     else:
         print("   ℹ️  Aucun match en direct actuellement")
     
     # Résumé final
+    stats = scheduler.stats()
     print("\n" + "=" * 70)
     print("📊 RÉSUMÉ DE LA RÉCUPÉRATION")
     print("=" * 70)
     print(f"✅ Matchs traités au total: {total_matches}")
+    print(f"💾 Base: {save_summary['written']} écrits, {save_summary['unchanged']} inchangés ignorés")
     print(f"📡 Requêtes API effectuées: {total_requests}")
-    print(f"⏱️  Temps estimé d'exécution: ~{total_requests * API_DELAY_SECONDS / 60:.1f} minutes")
+    print(f"⏱️  Temps d'exécution: {stats['elapsed_seconds']:.1f}s (dont {stats['rate_limiter']['waited_seconds']:.1f}s d'attente quota)")
+    cache_stats = connector.cache_stats()
+    if cache_stats:
+        print(f"💾 Cache HTTP: {cache_stats['hits']} hits, {cache_stats['revalidated']} revalidés (304), "
+              f"{cache_stats['misses']} téléchargements → {cache_stats['requests_saved']} requêtes économisées")
+    storage = storage_stats()
+    print(f"🔌 Stockage ({storage['backend']}): {storage['clients_created']} client(s), "
+          f"{storage['connections_opened']} connexion(s) ouvertes pour {storage['requests']} requêtes "
+          f"({storage['retries']} relances, {storage['errors']} erreurs)")
     print(f"⏰ Prochaine exécution recommandée: dans 6 heures")
     print("=" * 70)
     
@@ -132,13 +152,60 @@ def fetch_prioritized_matches(priority_level=1):
     competitions = priority_map.get(priority_level, priority_map[1])
     print(f"🎯 Mode prioritaire niveau {priority_level}: {len(competitions)} compétitions")
     
-    # Même logique que fetch_all_matches mais avec la liste filtrée
-    # (Code simplifié pour l'exemple - à implémenter si besoin)
-    return fetch_all_matches()
+    return fetch_all_matches(competitions)
+
+def notify_prediction_refresh():
+    """
+    Demande à l'API de recalculer son snapshot de prédictions (si EROS_API_URL et
+    EROS_REFRESH_TOKEN sont définis: la route est désactivée sans jeton)
+    """
+    api_url = os.getenv("EROS_API_URL")
+    if not api_url:
+        return False
+    if not os.getenv("EROS_REFRESH_TOKEN"):
+        print("ℹ️  EROS_REFRESH_TOKEN non défini: snapshot rafraîchi au prochain cycle de l'API")
+        return False
+    import requests
+    try:
+        headers = {'X-Refresh-Token': os.getenv("EROS_REFRESH_TOKEN")}
+        response = requests.post(f"{api_url.rstrip('/')}/api/predictions/refresh", headers=headers, timeout=120)
+        response.raise_for_status()
+        print("🔄 Snapshot des prédictions recalculé côté API")
+        return True
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️  Snapshot des prédictions non rafraîchi: {e}")
+        return False
+
+def run_live_loop():
+    """
+    Suivi des matchs en direct: n'écrit et ne re-prédit que les matchs dont le score,
+    le statut ou le score à la mi-temps a changé (Ctrl+C pour arrêter)
+    """
+    from backend.app.services.live_updates import LiveMatchLoop
+    from backend.app.ai_engine.predictor import ErosPredictor
+    
+    loop = LiveMatchLoop(FootballDataOrgConnector(), MatchService(), ErosPredictor())
+    
+    def log_event(event):
+        match = event['match']
+        print(f"   ⚽ [{event['event']}] {match.get('home_team')} {match.get('home_score')}-"
+              f"{match.get('away_score')} {match.get('away_team')} ({', '.join(event['changed'])})")
+    
+    loop.subscribe(log_event)
+    print("🔴 Suivi des matchs en direct...")
+    try:
+        loop.run()
+    finally:
+        print(f"📊 Live: {loop.stats()}")
 
 if __name__ == "__main__":
     try:
-        fetch_all_matches()
+        if '--live' in sys.argv:
+            run_live_loop()
+            sys.exit(0)
+        # --force: réécriture complète (après une restauration partielle de la base, par exemple)
+        fetch_all_matches(force='--force' in sys.argv)
+        notify_prediction_refresh()
     except KeyboardInterrupt:
         print("\n⚠️  Interruption par l'utilisateur")
     except Exception as e: